@@ -1,15 +1,27 @@
 from .player import Player, Pitcher
-from .team import Team
+from .team import Team, GameState
 from .game import simulate_game
-from .simulate import run_simulations
+from .matchup import compile_game
+from .simulate import run_simulations, iter_simulations
+from .batch import simulate_games_batch
+from .markov import markov_game
+from .series import simulate_series
+from .lineup import optimize_lineup
 from .load_data import load_hitters, load_pitchers 
 
 __all__ = [
     "Player",
     "Pitcher",
     "Team",
+    "GameState",
     "simulate_game",
+    "compile_game",
     "run_simulations",
+    "iter_simulations",
+    "simulate_games_batch",
+    "markov_game",
+    "simulate_series",
+    "optimize_lineup",
     "load_hitters",
     "load_pitchers",
 ]
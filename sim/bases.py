@@ -0,0 +1,49 @@
+import numpy as np
+
+from .matchup import OUTCOMES, OUTCOME_INDEX
+
+# -------------------------
+# Integer-coded base-out rules
+# -------------------------
+# Bases are a 3-bit occupancy mask: bit 0 = first, bit 1 = second, bit 2 = third.
+# Outcome codes index sim.matchup.OUTCOMES.
+
+SINGLE, DOUBLE, TRIPLE, HR, WALK, SO, OUT, ROE = (
+    OUTCOME_INDEX[o] for o in ("single", "double", "triple", "hr", "walk", "so", "out", "roe")
+)
+HIT_BASES = {SINGLE: 1, DOUBLE: 2, TRIPLE: 3, HR: 4}
+
+
+def advance(bases, code):
+    """Return (new_bases, runs, charged_runs) for one PA outcome.
+
+    Mirrors sim_half: walks and ROE only score a run with the bases
+    loaded, and every occupied base pushes the runner behind it up one
+    (so a walk with a man on second loads the bases). Runners advance
+    exactly as many bases as the hit. ROE runs are not charged to the
+    pitcher.
+    """
+    if code in (OUT, SO):
+        return bases, 0, 0
+    if code in (WALK, ROE):
+        runs = 1 if bases == 7 else 0
+        new = 1 | ((bases | (bases << 1)) & 6)
+        return new, runs, runs if code == WALK else 0
+    move = HIT_BASES[code]
+    shifted = bases << move
+    runs = bin(shifted >> 3).count("1")
+    if move == 4:
+        return 0, runs + 1, runs + 1
+    return (shifted & 7) | (1 << (move - 1)), runs, runs
+
+
+# Lookup tables indexed [code, bases]
+NEXT_BASES = np.zeros((len(OUTCOMES), 8), dtype=np.int64)
+RUNS = np.zeros((len(OUTCOMES), 8), dtype=np.int64)
+CHARGED = np.zeros((len(OUTCOMES), 8), dtype=np.int64)
+for _code in range(len(OUTCOMES)):
+    for _b in range(8):
+        NEXT_BASES[_code, _b], RUNS[_code, _b], CHARGED[_code, _b] = advance(_b, _code)
+
+OUTS = np.array([1 if c in (OUT, SO) else 0 for c in range(len(OUTCOMES))], dtype=np.int64)
+RUNNERS = np.array([bin(b).count("1") for b in range(8)], dtype=np.int64)
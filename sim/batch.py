@@ -0,0 +1,263 @@
+import numpy as np
+import pandas as pd
+
+from .bases import CHARGED, NEXT_BASES, OUTS, RUNNERS, RUNS
+from .matchup import compile_game, next_three_dra
+from .policy import DEFAULT_POLICY
+from .situation import available_mask, base_mask, validate
+
+# -------------------------
+# Compiled inputs
+# -------------------------
+
+class BatchTables:
+    """Array form of one matchup, indexed by team (0 = away, 1 = home).
+
+    cdf[t, b, p]   batting team t, lineup slot b, vs opposing staff slot p
+    next3[t, p, b] team t's staff slot p vs the three hitters after slot b
+    Staff slot 0 is the starter, then the bullpen, then reserves.
+    """
+
+    def __init__(self, team1, team2, hitter_probs, pitcher_probs, matchups=None):
+        if matchups is None:
+            matchups = compile_game(team1, team2, hitter_probs, pitcher_probs)
+        self.teams = (team1, team2)
+        self.names = (team1.name, team2.name)
+        staffs = [team1.staff, team2.staff]
+        tables = [matchups[team1.name], matchups[team2.name]]
+
+        n_lineup = max(len(t.lineup) for t in self.teams)
+        n_staff = max(len(s) for s in staffs)
+        if n_staff > 62:
+            raise ValueError("batch engine supports at most 62 pitchers per staff")
+
+        self.cdf = np.ones((2, n_lineup, n_staff, tables[0].cdf.shape[-1]))
+        self.next3 = np.full((2, n_staff, n_lineup), np.inf)
+        self.lineup_len = np.zeros(2, dtype=np.int64)
+        self.bullpen_mask = np.zeros(2, dtype=np.int64)
+        self.reserve_mask = np.zeros(2, dtype=np.int64)
+        for t, team in enumerate(self.teams):
+            opp = 1 - t
+            table = tables[t]
+            self.cdf[t, : len(table.batters), : len(table.pitchers)] = table.cdf
+            self.next3[t, : len(staffs[t]), : len(self.teams[opp].lineup)] = next_three_dra(
+                self.teams[opp].lineup, staffs[t], pitcher_probs
+            )
+            self.lineup_len[t] = len(team.lineup)
+            self.bullpen_mask[t] = ((1 << team.n_bullpen) - 1) << 1
+            self.reserve_mask[t] = ((1 << len(staffs[t])) - 1) & ~self.bullpen_mask[t] & ~1
+        self.slot_bits = np.int64(1) << np.arange(n_staff, dtype=np.int64)
+
+
+# -------------------------
+# Structure-of-arrays game state
+# -------------------------
+
+class BatchState:
+    """State of n games in lockstep. Per-team columns are [:, 0] away, [:, 1] home.
+
+    Optional per-game arrays for running many matchup variants at once:
+    `variant` picks game i's tables at team index 2 * variant[i] + (0, 1)
+    of a stacked BatchTables, and `stream` makes games with the same
+    stream id read the same uniforms at every step (common random numbers).
+    """
+
+    def __init__(self, n, tables, variant=None, stream=None):
+        self.n = n
+        self.variant = variant
+        self.stream = stream
+        self.n_streams = 0 if stream is None else int(stream.max()) + 1
+        self.active = np.ones(n, dtype=bool)
+        self.inning = np.ones(n, dtype=np.int64)
+        self.half = np.zeros(n, dtype=np.int64)  # 0 = top (away bats), 1 = bottom
+        self.outs = np.zeros(n, dtype=np.int64)
+        self.bases = np.zeros(n, dtype=np.int64)
+        self.score = np.zeros((n, 2), dtype=np.int64)
+        self.lineup = np.zeros((n, 2), dtype=np.int64)
+        self.pitcher = np.zeros((n, 2), dtype=np.int64)   # staff slot on the mound
+        self.bf = np.zeros((n, 2), dtype=np.int64)        # BF this appearance
+        self.runs_allowed = np.zeros((n, 2), dtype=np.int64)
+        self.cap = np.zeros((n, 2), dtype=np.int64)       # reliever BF cap
+        # Team's active pitcher. Differs from `pitcher` only after an emergency
+        # reserve call, which (as in sim_half) takes the mound next half.
+        self.queued = np.zeros((n, 2), dtype=np.int64)
+        self.queued_cap = np.zeros((n, 2), dtype=np.int64)
+        masks = tables.bullpen_mask | tables.reserve_mask
+        if variant is None:
+            self.available = np.tile(masks[:2], (n, 1))
+        else:
+            self.available = masks[2 * variant[:, None] + np.arange(2)]
+        self.emergency = np.zeros((n, 2), dtype=bool)
+
+    def resume(self, start, tables, caps):
+        """Put every game at GameSituation `start`.
+
+        `caps` (n, 2) are the reliever BF caps to use where the situation
+        leaves them unset.
+        """
+        validate(start, *tables.teams)
+        self.inning[:] = start.inning
+        self.half[:] = start.half
+        self.outs[:] = start.outs
+        self.bases[:] = base_mask(start.bases)
+        self.score[:] = start.score
+        self.lineup[:] = start.batter
+        self.pitcher[:] = start.pitcher
+        self.queued[:] = start.pitcher
+        self.bf[:] = start.bf
+        self.runs_allowed[:] = start.runs_allowed
+        for t in range(2):
+            self.cap[:, t] = caps[:, t] if start.cap[t] is None else start.cap[t]
+            self.available[:, t] = available_mask(start, t, len(tables.teams[t].staff))
+        self.queued_cap[:] = self.cap
+        self.emergency[:] = start.emergency
+        return self
+
+
+def run_batch(state, tables, rng, max_steps=100_000, policy=DEFAULT_POLICY, trace=None):
+    """Advance every active game in `state` one PA per step until all finish.
+
+    Hook thresholds and reliever caps come from `policy` (a BullpenPolicy).
+    `trace(state, idx)` is called before every step with the indexes of the
+    games still active, e.g. to record the states they pass through.
+    """
+    stamina_span = policy.stamina_max - policy.stamina_min + 1
+    extend_span = policy.extend_max - policy.extend_min + 1
+    entry_span = policy.entry_cap_max - policy.entry_cap_min + 1
+    for _ in range(max_steps):
+        idx = np.flatnonzero(state.active)
+        if idx.size == 0:
+            return state
+        if trace is not None:
+            trace(state, idx)
+        m = idx.size
+        off = state.half[idx]
+        dfn = 1 - off
+        # team indexes into `tables` (differ from off/dfn only for stacked variants)
+        if state.variant is None:
+            t_off, t_dfn = off, dfn
+        else:
+            t_off = 2 * state.variant[idx] + off
+            t_dfn = t_off + 1 - 2 * off
+        b = state.lineup[idx, off]
+        p = state.pitcher[idx, dfn]
+        if state.stream is None:
+            u = rng.random((m, 6))
+        else:
+            u = rng.random((state.n_streams, 6))[state.stream[idx]]
+
+        # --- PA outcome: inverse CDF on the compiled rows ---
+        code = (tables.cdf[t_off, b, p] <= u[:, :1]).sum(axis=1)
+        bases0 = state.bases[idx]
+        bases = NEXT_BASES[code, bases0]
+        outs = state.outs[idx] + OUTS[code]
+        state.score[idx, off] += RUNS[code, bases0]
+        state.runs_allowed[idx, dfn] += CHARGED[code, bases0]
+        state.bf[idx, dfn] += 1
+        state.lineup[idx, off] = (b + 1) % tables.lineup_len[t_off]
+
+        # --- Pull decision (should_pull_pitcher) ---
+        bf = state.bf[idx, dfn]
+        ra = state.runs_allowed[idx, dfn]
+        cap = policy.stamina_min + (u[:, 1] * stamina_span).astype(np.int64)
+        extend = (ra <= policy.extend_max_runs) & (bf >= cap) & (u[:, 2] < policy.extend_prob)
+        cap = np.where(extend, policy.extend_min + (u[:, 3] * extend_span).astype(np.int64), cap)
+        pull_starter = (
+            ((ra >= policy.early_hook_runs) & (bf < policy.early_hook_bf))
+            | ((bf >= policy.mid_hook_bf) & (ra >= policy.mid_hook_runs))
+            | (bf >= policy.starter_max_bf) | (bf >= cap)
+            | ((bf >= policy.fatigue_bf)
+               & (u[:, 4] < policy.fatigue_base + policy.fatigue_step * (bf - policy.fatigue_bf)))
+        )
+        emergency = state.emergency[idx, dfn]
+        pull_reliever = ~((bf < policy.reliever_min_bf) & ~emergency) & (
+            (ra >= policy.reliever_runs)
+            | ((RUNNERS[bases] >= policy.traffic_runners) & (bf >= policy.traffic_bf))
+            | (bf >= state.cap[idx, dfn])
+        )
+        pull = np.where(p == 0, pull_starter, pull_reliever)
+
+        # --- Reliever selection (pick_next_reliever) ---
+        if pull.any():
+            g, d, bb, td = idx[pull], dfn[pull], b[pull], t_dfn[pull]
+            avail = state.available[g, d]
+            scores = tables.next3[td, :, bb]
+            in_bullpen = (avail & tables.bullpen_mask[td])[:, None] & tables.slot_bits != 0
+            in_reserve = (avail & tables.reserve_mask[td])[:, None] & tables.slot_bits != 0
+            has_bullpen = in_bullpen.any(axis=1)
+            use_reserve = (
+                ~has_bullpen & in_reserve.any(axis=1)
+                & ((state.inning[g] >= 10) | state.emergency[g, d])
+            )
+            pool = np.where(has_bullpen[:, None], in_bullpen, in_reserve)
+            best = np.where(pool, scores, np.inf).argmin(axis=1)
+            cap = policy.entry_cap_min + (u[pull, 5] * entry_span).astype(np.int64)
+            change = has_bullpen | use_reserve
+            state.emergency[g[~change], d[~change]] = True
+            state.queued[g[change], d[change]] = best[change]
+            state.queued_cap[g[change], d[change]] = cap[change]
+            state.available[g[change], d[change]] &= ~tables.slot_bits[best[change]]
+            g, d = g[has_bullpen], d[has_bullpen]
+            state.pitcher[g, d] = best[has_bullpen]
+            state.bf[g, d] = 0
+            state.runs_allowed[g, d] = 0
+            state.cap[g, d] = cap[has_bullpen]
+
+        # --- Half-inning transitions ---
+        state.outs[idx] = outs
+        state.bases[idx] = bases
+        done = outs >= 3
+        if done.any():
+            g = idx[done]
+            inning, top = state.inning[g], state.half[g] == 0
+            away, home = state.score[g, 0], state.score[g, 1]
+            over = np.where(top, (inning >= 9) & (home > away), (inning >= 9) & (home != away))
+            state.active[g[over]] = False
+            state.inning[g[~top & ~over]] += 1
+            state.half[g] = np.where(top, 1, 0)
+            state.outs[g] = 0
+            state.bases[g] = 0
+
+            # Queued emergency reserves take the mound for the new half
+            g = g[~over]
+            d = 1 - state.half[g]
+            swap = state.pitcher[g, d] != state.queued[g, d]
+            g, d = g[swap], d[swap]
+            state.pitcher[g, d] = state.queued[g, d]
+            state.bf[g, d] = 0
+            state.runs_allowed[g, d] = 0
+            state.cap[g, d] = state.queued_cap[g, d]
+    raise RuntimeError(f"batch did not finish within {max_steps} steps")
+
+
+# -------------------------
+# Public entry point
+# -------------------------
+
+def simulate_games_batch(n, team1, team2, hitter_probs, pitcher_probs, rng=None, tables=None,
+                         policy=DEFAULT_POLICY, start=None):
+    """Simulate n independent games in lockstep and return final scores.
+
+    Same rules as simulate_game (60/40 blend, walk/ROE forcing, starter and
+    reliever hooks from `policy`, extra innings, home team skips the bottom
+    half when ahead), but every PA step is one vectorized draw across all
+    live games. With `start` (a sim.situation.GameSituation) every game
+    resumes from that mid-game state.
+    """
+    if rng is None or isinstance(rng, (int, np.integer)):
+        rng = np.random.default_rng(rng)
+    if tables is None:
+        tables = BatchTables(team1, team2, hitter_probs, pitcher_probs)
+    state = BatchState(n, tables)
+    if start is not None:
+        span = policy.entry_cap_max - policy.entry_cap_min + 1
+        state.resume(start, tables, policy.entry_cap_min + (rng.random((n, 2)) * span).astype(np.int64))
+    state = run_batch(state, tables, rng, policy=policy)
+
+    df = pd.DataFrame({
+        team1.name: state.score[:, 0],
+        team2.name: state.score[:, 1],
+        "innings": state.inning,
+    })
+    df["winner"] = np.where(state.score[:, 0] > state.score[:, 1], team1.name, team2.name)
+    return df
@@ -0,0 +1,285 @@
+"""Benchmarks for the simulator's hot paths.
+
+    python -m sim.bench run [--out bench.json] [--sizes 1000 5000] [--workers 4]
+    python -m sim.bench compare baseline.json bench.json [--threshold 0.10]
+
+Rosters are synthetic: stub probability rows (data/*_probs_stub.csv)
+jittered per player with a fixed seed, so runs are comparable across
+machines and commits without the full league tables.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from .game import H_PA, get_matchup_row, should_pull_pitcher, simulate_game, simulate_pa
+from .kernel import HAVE_NUMBA
+from .load_data import RATE_COLUMNS, load_registry
+from .matchup import compile_game
+from .rng import BlockRNG
+from .simulate import run_simulations
+from .team import Team
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
+
+# -------------------------
+# Synthetic rosters
+# -------------------------
+
+def synthetic_tables(out_dir, n_hitters=18, n_pitchers=24, seed=0):
+    """Write jittered hitter/pitcher CSVs built from the stubs; returns their paths."""
+    rng = np.random.default_rng(seed)
+    hitters = pd.read_csv(os.path.join(DATA_DIR, "hitter_probs_stub.csv"))
+    pitchers = pd.read_csv(os.path.join(DATA_DIR, "pitcher_probs_stub.csv"))
+
+    rows = []
+    for i in range(n_hitters):
+        for pit_hand in ("L", "R"):
+            row = hitters.iloc[i % len(hitters)].copy()
+            row["full_name"], row["bats"], row["pit_hand"] = f"Hitter {i}", "LRS"[i % 3], pit_hand
+            row[list(RATE_COLUMNS)] = row[list(RATE_COLUMNS)].astype(float) * rng.uniform(0.7, 1.3, len(RATE_COLUMNS))
+            rows.append(row)
+    hitters = pd.DataFrame(rows)
+
+    rows = []
+    for i in range(n_pitchers):
+        for bats in ("L", "R"):
+            row = pitchers.iloc[i % len(pitchers)].copy()
+            row["full_name"], row["pit_hand"], row["bats"] = f"Pitcher {i}", "RL"[i % 2], bats
+            row["team"] = "AAA" if i < n_pitchers // 2 else "BBB"
+            row["dra_minus"] = int(rng.integers(50, 130))
+            row[list(RATE_COLUMNS)] = row[list(RATE_COLUMNS)].astype(float) * rng.uniform(0.7, 1.3, len(RATE_COLUMNS))
+            rows.append(row)
+    pitchers = pd.DataFrame(rows)
+
+    paths = os.path.join(out_dir, "hitter_probs.csv"), os.path.join(out_dir, "pitcher_probs.csv")
+    hitters.to_csv(paths[0], index=False)
+    pitchers.to_csv(paths[1], index=False)
+    return paths
+
+
+def synthetic_teams(hitter_reg, pitcher_reg):
+    """Two 9-man lineups with an 8-man bullpen (starter first) and 4 reserves each."""
+    hitters = list({p.name: p for p in hitter_reg.players()}.values())
+    pitchers = list({p.name: p for p in pitcher_reg.players()}.values())
+    half = len(pitchers) // 2
+    teams = []
+    for t, (name, staff) in enumerate((("Away", pitchers[:half]), ("Home", pitchers[half:]))):
+        teams.append(Team(name, hitters[9 * t: 9 * t + 9], staff[:8], staff[8:12]))
+    return teams
+
+
+# -------------------------
+# Timing helpers
+# -------------------------
+
+def _per_call(fn, min_time=0.2, repeat=3):
+    """Best-of-`repeat` seconds per call, each repeat running for at least `min_time`."""
+    best = float("inf")
+    for _ in range(repeat):
+        n, start = 0, time.perf_counter()
+        while True:
+            fn()
+            n += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_time:
+                break
+        best = min(best, elapsed / n)
+    return best
+
+
+def _metric(value, unit, higher_is_better=True):
+    return {"value": float(value), "unit": unit, "higher_is_better": higher_is_better}
+
+
+# -------------------------
+# Suite
+# -------------------------
+
+def run_suite(sizes=(1000, 5000), workers=None, min_time=0.2, seed=0):
+    """Run every benchmark and return a JSON-ready dict of metrics."""
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        h_csv, p_csv = synthetic_tables(tmp, seed=seed)
+
+        start = time.perf_counter()
+        hitter_reg, pitcher_reg = load_registry(h_csv, "hitter"), load_registry(p_csv, "pitcher")
+        results["load_cold_s"] = _metric(time.perf_counter() - start, "s", False)
+        start = time.perf_counter()
+        load_registry(h_csv, "hitter"), load_registry(p_csv, "pitcher")
+        results["load_cached_s"] = _metric(time.perf_counter() - start, "s", False)
+
+    hitter_probs, pitcher_probs = hitter_reg.frame(), pitcher_reg.frame()
+    team1, team2 = synthetic_teams(hitter_reg, pitcher_reg)
+    batter, pitcher = team1.lineup[0], team2.starter
+    rng = BlockRNG(seed)
+
+    start = time.perf_counter()
+    matchups = compile_game(team1, team2, hitter_probs, pitcher_probs)
+    results["compile_game_s"] = _metric(time.perf_counter() - start, "s", False)
+
+    t = _per_call(lambda: get_matchup_row(pitcher_probs, batter.hand, pitcher.hand), min_time)
+    results["get_matchup_row"] = _metric(1 / t, "calls/s")
+    t = _per_call(lambda: simulate_pa(batter, pitcher, hitter_probs, pitcher_probs, rng=rng), min_time)
+    results["simulate_pa"] = _metric(1 / t, "PA/s")
+    table = matchups[team1.name]
+    t = _per_call(lambda: table.draw(0, 0, rng.random()), min_time)
+    results["compiled_pa_draw"] = _metric(1 / t, "PA/s")
+    t = _per_call(lambda: should_pull_pitcher(pitcher, 20, 2, [1, 0, 0], starter=True, rng=rng), min_time)
+    results["should_pull_pitcher"] = _metric(1 / t, "calls/s")
+
+    # Reliever ranking behind pick_next_reliever: cold (memo cleared) and warm lookups
+    masks = [m << 1 for m in range(1, 1 << 7)]
+    def cold():
+        table.clear_cache()
+        for m in masks:
+            table.best_reliever(m % 9, m)
+    def warm():
+        for m in masks:
+            table.best_reliever(m % 9, m)
+    results["best_reliever_cold"] = _metric(len(masks) / _per_call(cold, min_time), "calls/s")
+    results["best_reliever_warm"] = _metric(len(masks) / _per_call(warm, min_time), "calls/s")
+
+    # Full games: throughput per output tier, PA/s from the counters
+    for output in ("score", "counters", "full"):
+        t = _per_call(lambda: simulate_game(team1, team2, hitter_probs, pitcher_probs,
+                                            matchups=matchups, output=output, rng=rng), min_time)
+        results[f"simulate_game_{output}"] = _metric(1 / t, "games/s")
+    n, pas, start = 0, 0, time.perf_counter()
+    while time.perf_counter() - start < min_time or n < 50:
+        _, counters = simulate_game(team1, team2, hitter_probs, pitcher_probs,
+                                    matchups=matchups, output="counters", rng=rng)
+        pas += int(counters["hitting"][:, :, H_PA].sum())
+        n += 1
+    results["simulate_game_pa"] = _metric(pas / (time.perf_counter() - start), "PA/s")
+
+    # The same counters tier on the kernel backend (first call outside the timing: JIT compile)
+    def kernel():
+        simulate_game(team1, team2, hitter_probs, pitcher_probs, matchups=matchups,
+                      output="counters", rng=rng, backend="kernel")
+    kernel()
+    results["simulate_game_counters_kernel"] = _metric(1 / _per_call(kernel, min_time), "games/s")
+
+    # run_simulations at several sizes (and worker counts)
+    for size in sizes:
+        for w in sorted({1, workers or 1}):
+            start = time.perf_counter()
+            run_simulations(size, team1, team2, hitter_probs, pitcher_probs, workers=w, seed=seed)
+            elapsed = time.perf_counter() - start
+            results[f"run_simulations_{size}_w{w}"] = _metric(size / elapsed, "games/s")
+        start = time.perf_counter()
+        run_simulations(size, team1, team2, hitter_probs, pitcher_probs, seed=seed, backend="kernel")
+        results[f"run_simulations_{size}_kernel"] = _metric(size / (time.perf_counter() - start), "games/s")
+
+    # Peak traced memory per 1k games (counters tier, in-process)
+    size = min(sizes)
+    tracemalloc.start()
+    run_simulations(size, team1, team2, hitter_probs, pitcher_probs, seed=seed, output="counters")
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    results["peak_mb_per_1k_games"] = _metric(peak / 2**20 * 1000 / size, "MB", False)
+
+    return {"meta": _meta(sizes, workers), "results": results}
+
+
+def startup_time():
+    """Seconds to import the sim package in a fresh interpreter."""
+    root = os.path.dirname(DATA_DIR)
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "import sim"], cwd=root, check=True)
+    return time.perf_counter() - start
+
+
+def _meta(sizes, workers):
+    try:
+        rev = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                             cwd=os.path.dirname(DATA_DIR)).stdout.strip()
+    except OSError:
+        rev = ""
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "git_rev": rev,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "numba": HAVE_NUMBA,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "sizes": list(sizes),
+        "workers": workers,
+    }
+
+
+# -------------------------
+# Comparison
+# -------------------------
+
+def compare(baseline, current, threshold=0.10):
+    """Per-metric change between two result dicts; a worse-by-more-than-threshold change is a regression."""
+    rows = []
+    for name, new in current["results"].items():
+        old = baseline["results"].get(name)
+        if old is None:
+            continue
+        # change > 0 is an improvement for either kind of metric
+        if new["higher_is_better"]:
+            change = new["value"] / old["value"] - 1 if old["value"] else 0.0
+        else:
+            change = old["value"] / new["value"] - 1 if new["value"] else 0.0
+        rows.append({
+            "metric": name, "unit": new["unit"], "baseline": old["value"], "current": new["value"],
+            "change": change, "regression": change < -threshold,
+        })
+    return pd.DataFrame(rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m sim.bench", description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    run = sub.add_parser("run", help="run the suite and write JSON")
+    run.add_argument("--out", default="bench.json")
+    run.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000])
+    run.add_argument("--workers", type=int, default=None)
+    run.add_argument("--min-time", type=float, default=0.2)
+    cmp = sub.add_parser("compare", help="compare two result files")
+    cmp.add_argument("baseline")
+    cmp.add_argument("current")
+    cmp.add_argument("--threshold", type=float, default=0.10)
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        report = run_suite(args.sizes, args.workers, args.min_time)
+        report["results"]["startup_s"] = _metric(startup_time(), "s", False)
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+        for name, m in report["results"].items():
+            print(f"{name:32s} {m['value']:>14,.3f} {m['unit']}")
+        print(f"wrote {args.out}")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    table = compare(baseline, current, args.threshold)
+    with pd.option_context("display.width", 120, "display.float_format", "{:,.4g}".format):
+        print(table.to_string(index=False))
+    regressions = table[table["regression"]]["metric"].tolist() if len(table) else []
+    if regressions:
+        print(f"REGRESSION (> {args.threshold:.0%} worse): {', '.join(regressions)}")
+        return 1
+    print("no regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,200 @@
+import numpy as np
+import pandas as pd
+
+from .game import HIT_STATS, PIT_STATS
+
+
+class BoxscoreCollector:
+    """Preallocated columnar counters for many games of one matchup.
+
+    Fill with `add(score, counters)` from simulate_game(output="counters")
+    and convert to DataFrames once with `to_frames()`. Arrays are indexed
+    [game, team, roster slot, stat] with team 0 = away.
+    """
+
+    def __init__(self, n, team1, team2, start=0, max_innings=12):
+        self.names = (team1.name, team2.name)
+        self.lineups = tuple(tuple(p.name for p in t.lineup) for t in (team1, team2))
+        self.staffs = tuple(tuple(p.name for p in t.staff) for t in (team1, team2))
+        n_lineup = max(len(t.lineup) for t in (team1, team2))
+        n_staff = max(len(t.staff) for t in (team1, team2))
+
+        self.start = start  # game_id offset
+        self.numbers = None  # explicit game numbers (set by take)
+        self.count = 0
+        self.score = np.zeros((n, 2), dtype=np.int64)
+        self.errors = np.zeros((n, 2), dtype=np.int64)
+        self.hitting = np.zeros((n, 2, n_lineup, len(HIT_STATS)), dtype=np.int32)
+        self.pitching = np.zeros((n, 2, n_staff, len(PIT_STATS)), dtype=np.int32)
+        self.linescore = np.full((n, 2, max_innings), -1, dtype=np.int16)
+
+    def _fit_innings(self, innings):
+        if innings > self.linescore.shape[2]:
+            grown = np.full(self.linescore.shape[:2] + (2 * innings,), -1, dtype=np.int16)
+            grown[:, :, :self.linescore.shape[2]] = self.linescore
+            self.linescore = grown
+
+    def add(self, score, counters):
+        i = self.count
+        innings = counters["linescore"].shape[1]
+        self._fit_innings(innings)
+        self.score[i] = [score[self.names[0]], score[self.names[1]]]
+        self.errors[i] = counters["errors"]
+        self.hitting[i] = counters["hitting"]
+        self.pitching[i] = counters["pitching"]
+        self.linescore[i, :, :innings] = counters["linescore"]
+        self.count += 1
+
+    def add_games(self, score, counters):
+        """Add many games at once: (n, 2) scores and counters stacked over games (sim.kernel.play_games)."""
+        i, n = self.count, len(score)
+        innings = counters["linescore"].shape[2]
+        self._fit_innings(innings)
+        self.score[i:i + n] = score
+        self.errors[i:i + n] = counters["errors"]
+        self.hitting[i:i + n] = counters["hitting"]
+        self.pitching[i:i + n] = counters["pitching"]
+        self.linescore[i:i + n, :, :innings] = counters["linescore"]
+        self.count += n
+
+    @classmethod
+    def concat(cls, parts):
+        """Join collectors for consecutive game ranges into one."""
+        out = parts[0]
+        if len(parts) == 1:
+            return out
+        width = max(p.linescore.shape[2] for p in parts)
+        merged = cls.__new__(cls)
+        merged.names, merged.lineups, merged.staffs = out.names, out.lineups, out.staffs
+        merged.start = out.start
+        merged.count = sum(p.count for p in parts)
+        merged.numbers = (None if all(p.numbers is None for p in parts)
+                          else np.concatenate([p.game_numbers() for p in parts]))
+        for attr in ("score", "errors", "hitting", "pitching"):
+            setattr(merged, attr, np.concatenate([getattr(p, attr)[:p.count] for p in parts]))
+        merged.linescore = np.concatenate([
+            np.pad(p.linescore[:p.count], ((0, 0), (0, 0), (0, width - p.linescore.shape[2])),
+                   constant_values=-1)
+            for p in parts
+        ])
+        return merged
+
+    def take(self, rows):
+        """Collector holding just the games at positions `rows`, keeping their game ids."""
+        rows = np.asarray(rows, dtype=np.int64)
+        out = self.__class__.__new__(self.__class__)
+        out.names, out.lineups, out.staffs = self.names, self.lineups, self.staffs
+        out.start = self.start
+        out.numbers = self.game_numbers()[rows]
+        out.count = len(rows)
+        for attr in ("score", "errors", "hitting", "pitching", "linescore"):
+            setattr(out, attr, getattr(self, attr)[rows])
+        return out
+
+    # -------------
+    # Columnar views
+    # -------------
+    def game_numbers(self):
+        if self.numbers is not None:
+            return self.numbers[:self.count]
+        return np.arange(self.start + 1, self.start + self.count + 1)
+
+    def game_ids(self):
+        return np.array([f"Game_{g}" for g in self.game_numbers()])
+
+    def _long(self, counts, names, label, stats, keep):
+        slots = counts.shape[2]
+        g, t, s = np.nonzero(keep)
+        names = np.array([list(row) + [""] * (slots - len(row)) for row in names])
+        cols = {
+            "game": self.game_numbers()[g],
+            "team": np.array(self.names)[t],
+            label: names[t, s],
+            "slot": s,
+        }
+        cols.update(zip(stats, counts[g, t, s].T))
+        return cols
+
+    def tables(self):
+        """Long-format columns (dict of arrays) for games, batting, pitching and innings."""
+        n = self.count
+        score, line = self.score[:n], self.linescore[:n]
+        g, t, i = np.nonzero(line >= 0)
+        hitting, pitching = self.hitting[:n], self.pitching[:n]
+        return {
+            "games": {
+                "game": self.game_numbers(),
+                "away": np.full(n, self.names[0]),
+                "home": np.full(n, self.names[1]),
+                "away_runs": score[:, 0],
+                "home_runs": score[:, 1],
+                "innings": (line[:, 0] >= 0).sum(axis=1),
+                "away_hits": hitting[:, 0, :, HIT_STATS.index("H")].sum(axis=1),
+                "home_hits": hitting[:, 1, :, HIT_STATS.index("H")].sum(axis=1),
+                "away_errors": self.errors[:n, 0],  # committed by each defense
+                "home_errors": self.errors[:n, 1],
+            },
+            "batting": self._long(hitting, self.lineups, "player", HIT_STATS,
+                                  hitting[..., HIT_STATS.index("PA")] > 0),
+            "pitching": self._long(pitching, self.staffs, "pitcher", PIT_STATS,
+                                   pitching[..., PIT_STATS.index("G")] > 0),
+            "innings": {
+                "game": self.game_numbers()[g],
+                "team": np.array(self.names)[t],
+                "inning": i + 1,
+                "runs": line[g, t, i].astype(np.int64),
+            },
+        }
+
+    # -------------
+    # DataFrame views
+    # -------------
+    def results_frame(self):
+        away, home = self.names
+        score = self.score[:self.count]
+        df = pd.DataFrame({"game_id": self.game_ids(), away: score[:, 0], home: score[:, 1]})
+        df["winner"] = np.where(score[:, 0] > score[:, 1], away, home)
+        return df
+
+    def _frame(self, cols, label):
+        df = pd.DataFrame(cols).drop(columns="slot")
+        df.insert(0, "game_id", "Game_" + df.pop("game").astype(str))
+        return df.rename(columns={"team": "Team", label: label.title()})
+
+    def hitting_frame(self):
+        """One row per batter per game (same columns as simulate_game's hit_df)."""
+        df = self._frame(self.tables()["batting"], "player")
+        return df[["game_id", "Team", "Player", "PA", "AB", "H", "2B", "3B", "HR", "BB", "RBI", "R"]]
+
+    def pitching_frame(self):
+        """One row per pitcher appearance (same columns as simulate_game's pit_df)."""
+        df = self._frame(self.tables()["pitching"], "pitcher")
+        df["IP"] = df["OUTS"] / 3.0
+        return df[["game_id", "Team", "Pitcher", "IP", "R", "ER", "K", "BB", "HR"]]
+
+    def inning_frame(self):
+        """Inning-by-inning boxscores (same layout as all_inning_boxscores.csv)."""
+        line = self.linescore[:self.count]
+        played = (line >= 0).any(axis=(0, 1))
+        width = int(np.flatnonzero(played).max()) + 1 if played.any() else 0
+        n = self.count
+        hits = self.hitting[:n, :, :, HIT_STATS.index("H")].sum(axis=2)
+        df = pd.DataFrame({
+            "game_id": np.repeat(self.game_ids(), 2),
+            "team": np.tile(self.names, n),
+        })
+        for i in range(width):
+            runs = line[:, :, i].reshape(-1).astype(np.int64)
+            df[f"inning_{i + 1}"] = pd.arrays.IntegerArray(runs, mask=runs < 0)
+        df["r"] = self.score[:n].reshape(-1)
+        df["h"] = hits.reshape(-1)
+        df["e"] = self.errors[:n, ::-1].reshape(-1)  # a team's E = the other defense's errors
+        return df
+
+    def to_frames(self):
+        return {
+            "results": self.results_frame(),
+            "hitting": self.hitting_frame(),
+            "pitching": self.pitching_frame(),
+            "innings": self.inning_frame(),
+        }
@@ -0,0 +1,234 @@
+import json
+
+import numpy as np
+
+from .bases import DOUBLE, HIT_BASES, HR, OUT, ROE, SINGLE, SO, TRIPLE, WALK
+from .boxscore import BoxscoreCollector
+from .game import (
+    H_2B, H_3B, H_AB, H_BB, H_H, H_HR, H_PA, H_R, H_RBI, HIT_STATS,
+    P_BB, P_BF, P_ER, P_G, P_HR, P_K, P_OUTS, P_R, PIT_STATS,
+)
+
+# One packed record per PA (14 bytes). Base-out states are outs * 8 + bases
+# bitmask (1B = 1, 2B = 2, 3B = 4); `state_after` can have 3 outs (24..31).
+# `scored` holds up to four 4-bit entries, lineup slot + 1 of each runner who
+# crossed the plate (0 = none). A pitcher's first appearance in a game is
+# logged as an extra record with outcome ENTRY, so G is exact even for a
+# reliever who enters after the game's last out.
+EVENT_DTYPE = np.dtype([
+    ("game", "<u4"),
+    ("inning", "u1"),
+    ("half", "u1"),          # 0 = top (away bats), 1 = bottom
+    ("batter", "u1"),        # lineup slot
+    ("pitcher", "u1"),       # Team.staff slot of the defense
+    ("outcome", "u1"),       # OUTCOMES index (sim.bases codes)
+    ("state_before", "u1"),
+    ("state_after", "u1"),
+    ("runs", "u1"),
+    ("scored", "<u2"),
+])
+ENTRY = 255
+_VERSION = 1
+_HITS = np.array([SINGLE, DOUBLE, TRIPLE, HR])
+
+
+def base_out_state(outs, bases):
+    """Pack outs and a [1B, 2B, 3B] runner list (None = empty) into one code."""
+    return outs * 8 + (bases[0] is not None) + 2 * (bases[1] is not None) + 4 * (bases[2] is not None)
+
+
+def scorers(code, bases, batter):
+    """Pack the lineup slots that score on outcome `code` from runner list `bases`.
+
+    A slot can appear twice: sim_half's walk/ROE rule can leave one
+    runner on two bases.
+    """
+    if code in (OUT, SO):
+        return 0
+    if code in (WALK, ROE):
+        return bases[2] + 1 if None not in bases else 0
+    move = HIT_BASES[code]
+    packed, shift = 0, 0
+    for i in (2, 1, 0):
+        if bases[i] is not None and i + move >= 3:
+            packed |= (bases[i] + 1) << shift
+            shift += 4
+    if move == 4:
+        packed |= (batter + 1) << shift
+    return packed
+
+
+class EventWriter:
+    """Append-only play-by-play log for games between one pair of teams.
+
+    Pass to simulate_game(..., events=writer); records are buffered as
+    tuples and written to `path` in blocks, with team/roster metadata in
+    `path + ".json"`. Read it back with EventLog(path).
+    """
+
+    def __init__(self, path, team1, team2, block_size=65536):
+        self.path = path
+        self.block_size = block_size
+        self.n_games = 0
+        self.n_events = 0
+        self._buf = []
+        self._meta = {
+            "version": _VERSION,
+            "teams": [team1.name, team2.name],
+            "lineups": [[p.name for p in t.lineup] for t in (team1, team2)],
+            "staffs": [[p.name for p in t.staff] for t in (team1, team2)],
+        }
+        if max(len(t.lineup) for t in (team1, team2)) > 15:
+            raise ValueError("the event log supports lineups of up to 15")
+        self._file = open(path, "wb")
+
+    def begin_game(self):
+        """Number the next game (0-based)."""
+        self.n_games += 1
+        return self.n_games - 1
+
+    def record(self, game, inning, half, batter, pitcher, code, outs, bases, outs_after, bases_after, runs):
+        """Buffer one PA; `bases` / `bases_after` are [1B, 2B, 3B] runner slot lists."""
+        self._buf.append((
+            game, inning, half, batter, pitcher, code,
+            base_out_state(outs, bases), base_out_state(outs_after, bases_after),
+            runs, scorers(code, bases, batter),
+        ))
+        if len(self._buf) >= self.block_size:
+            self.flush()
+
+    def entry(self, game, inning, half, pitcher, outs, bases):
+        """Buffer a first-appearance marker for staff slot `pitcher`."""
+        state = base_out_state(outs, bases)
+        self._buf.append((game, inning, half, 0, pitcher, ENTRY, state, state, 0, 0))
+
+    def flush(self):
+        if self._buf:
+            self._file.write(np.array(self._buf, dtype=EVENT_DTYPE).tobytes())
+            self.n_events += len(self._buf)
+            self._buf = []
+        self._file.flush()
+        with open(self.path + ".json", "w") as f:
+            json.dump({**self._meta, "games": self.n_games, "events": self.n_events}, f)
+
+    def close(self):
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class EventLog:
+    """Memory-mapped reader for an EventWriter file, with vectorized boxscore rebuilds."""
+
+    def __init__(self, path):
+        with open(path + ".json") as f:
+            self.meta = json.load(f)
+        if self.meta["version"] != _VERSION:
+            raise ValueError(f"unsupported event log version {self.meta['version']}")
+        self.names = tuple(self.meta["teams"])
+        self.n_games = self.meta["games"]
+        n = self.meta["events"]
+        self.events = np.memmap(path, dtype=EVENT_DTYPE, mode="r", shape=(n,)) if n else \
+            np.zeros(0, dtype=EVENT_DTYPE)
+
+    def __len__(self):
+        return len(self.events)
+
+    def games(self, start=0, stop=None):
+        """Events of games start..stop-1 (games are numbered in log order, so this is a slice)."""
+        stop = self.n_games if stop is None else stop
+        lo, hi = np.searchsorted(self.events["game"], (start, stop))
+        return self.events[lo:hi]
+
+    def collector(self, start=0, stop=None):
+        """Rebuild per-slot hitting/pitching counters, linescores and errors as a BoxscoreCollector.
+
+        Covers games start..stop-1; work through a large log in ranges to
+        bound memory. Counters match simulate_game(output="counters").
+        """
+        stop = self.n_games if stop is None else stop
+        ev = self.games(start, stop)
+        n = stop - start
+        # Appearances come from every record; the rest from PAs only
+        entries = ev[ev["outcome"] == ENTRY]
+        ev = ev[ev["outcome"] != ENTRY]
+        game_idx = ev["game"].astype(np.int64) - start
+        lineups, staffs = self.meta["lineups"], self.meta["staffs"]
+        n_lineup = max(len(x) for x in lineups)
+        n_staff = max(len(x) for x in staffs)
+
+        half = ev["half"].astype(np.int64)
+        code = ev["outcome"].astype(np.int64)
+        runs = ev["runs"].astype(np.int64)
+        outs = (ev["state_after"] >> 3).astype(np.int64) - (ev["state_before"] >> 3)
+        is_hit = np.isin(code, _HITS)
+        ones = np.ones(len(ev), dtype=np.int64)
+
+        def count(key, size, weights):
+            return np.bincount(key, weights=weights, minlength=size).astype(np.int64)
+
+        # Hitting: key (game, batting team, lineup slot)
+        size = n * 2 * n_lineup
+        key = (game_idx * 2 + half) * n_lineup + ev["batter"]
+        hit = np.zeros((size, len(HIT_STATS)), dtype=np.int64)
+        hit[:, H_PA] = count(key, size, ones)
+        hit[:, H_AB] = count(key, size, ~np.isin(code, (WALK, ROE)))
+        hit[:, H_H] = count(key, size, is_hit)
+        hit[:, H_2B] = count(key, size, code == DOUBLE)
+        hit[:, H_3B] = count(key, size, code == TRIPLE)
+        hit[:, H_HR] = count(key, size, code == HR)
+        hit[:, H_BB] = count(key, size, code == WALK)
+        hit[:, H_RBI] = count(key, size, np.where(is_hit, runs, 0))
+        scored = ev["scored"].astype(np.int64)
+        base = (game_idx * 2 + half) * n_lineup
+        for shift in (0, 4, 8, 12):
+            slot = (scored >> shift) & 15
+            hit[:, H_R] += count(base[slot > 0] + slot[slot > 0] - 1, size, None)
+
+        # Pitching: key (game, defending team, staff slot); ROE runs are not charged
+        size = n * 2 * n_staff
+        key = (game_idx * 2 + (1 - half)) * n_staff + ev["pitcher"]
+        charged = np.where(code == ROE, 0, runs)
+        pit = np.zeros((size, len(PIT_STATS)), dtype=np.int64)
+        pit[:, P_BF] = count(key, size, ones)
+        key_entry = ((entries["game"].astype(np.int64) - start) * 2 + 1 - entries["half"]) * n_staff \
+            + entries["pitcher"]
+        pit[:, P_G] = (pit[:, P_BF] + count(key_entry, size, None)) > 0
+        pit[:, P_OUTS] = count(key, size, outs)
+        pit[:, P_R] = count(key, size, charged)
+        pit[:, P_ER] = pit[:, P_R]
+        pit[:, P_K] = count(key, size, code == SO)
+        pit[:, P_BB] = count(key, size, code == WALK)
+        pit[:, P_HR] = count(key, size, code == HR)
+
+        # Linescore: runs per (game, team, inning); halves never played stay -1
+        inning = ev["inning"].astype(np.int64) - 1
+        width = int(inning.max()) + 1 if len(ev) else 0
+        key = (game_idx * 2 + half) * width + inning
+        played = count(key, n * 2 * width, ones) > 0
+        line = np.where(played, count(key, n * 2 * width, runs), -1).reshape(n, 2, width)
+
+        box = BoxscoreCollector.__new__(BoxscoreCollector)
+        box.names = self.names
+        box.lineups = tuple(tuple(x) for x in lineups)
+        box.staffs = tuple(tuple(x) for x in staffs)
+        box.start = start
+        box.numbers = None
+        box.count = n
+        box.hitting = hit.reshape(n, 2, n_lineup, len(HIT_STATS)).astype(np.int32)
+        box.pitching = pit.reshape(n, 2, n_staff, len(PIT_STATS)).astype(np.int32)
+        box.linescore = line.astype(np.int16)
+        box.score = np.where(line >= 0, line, 0).sum(axis=2)
+        # errors are charged to the defense: ROE in the top half is a home error
+        box.errors = count(game_idx * 2 + (1 - half), n * 2, code == ROE).reshape(n, 2)
+        return box
+
+    def to_frames(self, start=0, stop=None):
+        """results / hitting / pitching / innings DataFrames rebuilt from the log."""
+        return self.collector(start, stop).to_frames()
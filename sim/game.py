@@ -1,6 +1,12 @@
 import numpy as np
 import pandas as pd
-import random
+
+from .matchup import OUTCOMES, compile_game, matchup_cdf, resolve_hand
+from .instrument import PAEvent, PitchingChangeEvent
+from .policy import DEFAULT_POLICY
+from .rng import as_block_rng, default_block_rng
+from .situation import available_mask, runner_slots, validate
+from .team import GameState
 
 # -------------------------
 # Probability + baserunning
@@ -8,8 +14,7 @@ import random
 
 def get_matchup_row(df, batter_hand, pitcher_hand):
     """Return the correct row for a given batter/pitcher handedness matchup."""
-    if batter_hand == "S":
-        batter_hand = "L" if pitcher_hand == "R" else "R"
+    batter_hand = resolve_hand(batter_hand, pitcher_hand)
     subset = df.loc[(df["bats"] == batter_hand) & (df["pit_hand"] == pitcher_hand)]
     if subset.empty:
         subset = df.loc[df["bats"] == batter_hand]
@@ -18,162 +23,233 @@ def get_matchup_row(df, batter_hand, pitcher_hand):
     return subset.iloc[0]
 
 
-def simulate_pa(batter, pitcher, hitter_probs, pitcher_probs):
+def simulate_pa(batter, pitcher, hitter_probs, pitcher_probs, rng=None):
     """Simulate one PA with a 60/40 hitter/pitcher weighting."""
     h_row = get_matchup_row(hitter_probs, batter.hand, pitcher.hand)
     p_row = get_matchup_row(pitcher_probs, batter.hand, pitcher.hand)
-
-    outcomes = ["single", "double", "triple", "hr", "walk", "so", "out", "roe"]
-    valid_outcomes = [o for o in outcomes if o in h_row and o in p_row]
-    probs = np.array([0.6 * h_row[o] + 0.4 * p_row[o] for o in valid_outcomes], dtype=float)
-    probs /= probs.sum()
-    return np.random.choice(valid_outcomes, p=probs)
+    cdf = matchup_cdf(h_row, p_row)
+    return OUTCOMES[int(np.searchsorted(cdf, as_block_rng(rng).random(), side="right"))]
 
 # -------------------------
 # Pitcher usage rules
 # -------------------------
 
 def should_pull_pitcher(pitcher, bf, runs_allowed, runners_on,
-                        starter=True, bf_cap=None, emergency=False, outs_this_inning=0):
+                        starter=True, bf_cap=None, emergency=False, outs_this_inning=0, rng=None,
+                        policy=DEFAULT_POLICY):
+    """Pull decision for the pitcher on the mound.
+
+    Thresholds come from `policy` (a sim.policy.BullpenPolicy); random
+    rolls come from `rng` (a BlockRNG).
+    """
+    if rng is None:
+        rng = default_block_rng()
     # --- Starters ---
     if starter:
-        if runs_allowed >= 4 and bf < 12:
+        if runs_allowed >= policy.early_hook_runs and bf < policy.early_hook_bf:
             return True
-        if bf >= 15 and runs_allowed >= 3:
+        if bf >= policy.mid_hook_bf and runs_allowed >= policy.mid_hook_runs:
             return True
-        cap = getattr(pitcher, "stamina_cap", random.randint(18, 23))
-        if runs_allowed <= 2 and bf >= cap and random.random() < 0.15:
-            cap = random.randint(24, 27)
-        if bf >= 27:
+        cap = getattr(pitcher, "stamina_cap", None)
+        if cap is None:
+            cap = rng.randint(policy.stamina_min, policy.stamina_max)
+        if runs_allowed <= policy.extend_max_runs and bf >= cap and rng.random() < policy.extend_prob:
+            cap = rng.randint(policy.extend_min, policy.extend_max)
+        if bf >= policy.starter_max_bf:
             return True
         if bf >= cap:
             return True
-        if bf >= 19:
-            fatigue_chance = 0.04 + 0.01 * (bf - 19)
-            if random.random() < fatigue_chance:
+        if bf >= policy.fatigue_bf:
+            fatigue_chance = policy.fatigue_base + policy.fatigue_step * (bf - policy.fatigue_bf)
+            if rng.random() < fatigue_chance:
                 return True
         return False
 
     # --- Relievers ---
     if not starter:
-        if bf < 3 and not emergency:
+        if bf < policy.reliever_min_bf and not emergency:
             return False
         if bf_cap is None:
-            bf_cap = random.randint(4, 9)
-        if runs_allowed >= 2:
+            bf_cap = rng.randint(policy.reliever_cap_min, policy.reliever_cap_max)
+        if runs_allowed >= policy.reliever_runs:
             return True
-        if sum(runners_on) >= 2 and bf >= 3:
+        if sum(runners_on) >= policy.traffic_runners and bf >= policy.traffic_bf:
             return True
         if bf >= bf_cap:
             return True
-        if bf >= bf_cap - 1 and random.random() < 0.2:
-            return False
         return False
 
 
+# -------------------------
+# Boxscore counters
+# -------------------------
+
+OUTPUT_MODES = ("score", "counters", "full")
+# "python" = the reference loop below, "kernel" = sim.kernel's integer-coded game
+BACKENDS = ("python", "kernel")
+
+# Counter columns, indexed by roster slot (lineup slot / Team.staff slot)
+HIT_STATS = ("PA", "AB", "H", "2B", "3B", "HR", "BB", "RBI", "R")
+PIT_STATS = ("G", "BF", "OUTS", "R", "ER", "K", "BB", "HR")
+H_PA, H_AB, H_H, H_2B, H_3B, H_HR, H_BB, H_RBI, H_R = range(len(HIT_STATS))
+P_G, P_BF, P_OUTS, P_R, P_ER, P_K, P_BB, P_HR = range(len(PIT_STATS))
+
+
 # -------------------------
 # Main simulation
 # -------------------------
 
-def simulate_game(team1, team2, hitter_probs, pitcher_probs, verbose=False):
-    """Simulate a 9-inning game with inning boxscore output."""
+def simulate_game(team1, team2, hitter_probs, pitcher_probs, verbose=False, matchups=None,
+                  output="full", rng=None, unavailable=None, instrument=None, events=None,
+                  policy=DEFAULT_POLICY, start=None, backend="python"):
+    """Simulate a 9-inning game with inning boxscore output.
+
+    `matchups` is the output of `sim.matchup.compile_game` for these two
+    teams; pass it in to reuse the compiled tables across many games.
+
+    All randomness (PA outcomes, pull rolls, reliever caps, game id) comes
+    from `rng`: a seed, numpy Generator or sim.rng.BlockRNG. Pass one
+    BlockRNG to a run of games to share its buffered stream; a given seed
+    reproduces the game exactly.
+
+    `policy` (a sim.policy.BullpenPolicy) sets the hook thresholds and
+    reliever caps; by default the original rules.
+
+    `start` (a sim.situation.GameSituation) resumes from a mid-game state
+    instead of the first pitch. Innings before it show as -1 in the
+    counters linescore (blank in box_df); the pitchers on the mound start
+    from the situation's batters faced and runs allowed.
+
+    `unavailable` maps a team name to a bitmask of `team.staff` slots that
+    may not pitch today (e.g. relievers resting after heavy use).
+
+    `instrument` (a sim.instrument.Instrumentation) collects phase timers
+    and counters and fires per-PA / per-pitching-change hooks.
+
+    `events` (a sim.events.EventWriter) appends one packed record per PA
+    to a play-by-play log that boxscores can be rebuilt from later.
+
+    `backend="kernel"` plays the game on sim.kernel instead (JIT-compiled
+    when numba is installed): same rules, same draws, so the same seed
+    gives the same game. It supports output="score" / "counters" only,
+    without verbose, instrument or events.
+
+    `output` picks how much is returned:
+      "score"    -> score dict
+      "counters" -> (score, counters): integer arrays indexed [team, roster slot,
+                    stat] (team 0 = away) for HIT_STATS / PIT_STATS, plus the
+                    linescore and errors committed by each defense
+      "full"     -> (score, hit_df, pit_df, log_df, box_df)
+    """
+    if output not in OUTPUT_MODES:
+        raise ValueError(f"output must be one of {OUTPUT_MODES}, got {output!r}")
+    if backend not in BACKENDS:
+        raise ValueError(f"backend must be one of {BACKENDS}, got {backend!r}")
+    full = output == "full"
+    rng = as_block_rng(rng)
+    if backend == "kernel":
+        if full or verbose or instrument is not None or events is not None:
+            raise ValueError("backend='kernel' supports output='score' or 'counters' only, "
+                             "without verbose, instrument or events")
+        from .kernel import kernel_tables, play_game
+
+        if matchups is None:
+            matchups = compile_game(team1, team2, hitter_probs, pitcher_probs)
+        score, counters = play_game(team1, team2, kernel_tables(team1, team2, matchups), rng,
+                                    policy, start=start, unavailable=unavailable)
+        return score if output == "score" else (score, counters)
+    entry_cap = policy.entry_cap_min, policy.entry_cap_max
+    # Instrumentation: everything below is skipped when these are falsy
+    timing = instrument is not None and instrument.timing
+    clock = instrument.clock if timing else None
+    times = instrument.times if instrument is not None else None
+    on_pa = instrument.on_pa if instrument is not None else None
+    on_change = instrument.on_pitching_change if instrument is not None else None
+    game_no = instrument.counts["games"] if instrument is not None else None
+    record = events.record if events is not None else None
+    event_game = events.begin_game() if events is not None else None
     away, home = team1, team2
+    if matchups is None:
+        matchups = compile_game(away, home, hitter_probs, pitcher_probs)
     score = {away.name: 0, home.name: 0}
-    starters = {away.name: away.get_pitcher().name, home.name: home.get_pitcher().name}
-
-    for t in [away, home]:
-        if t.starter in t.bullpen:
-            t.bullpen.remove(t.starter)
-
-    # Box + bullpen state
-    hit_box, pit_box, outs_map, bf_map, runs_map = (
-        {away.name: {}, home.name: {}},
-        {away.name: {}, home.name: {}},
-        {away.name: {}, home.name: {}},
-        {away.name: {}, home.name: {}},
-        {away.name: {}, home.name: {}},
-    )
+    state = {away.name: GameState(away), home.name: GameState(home)}
+    reliever_cap = {t.name: [None] * len(t.staff) for t in (away, home)}
+    emergency_mode = {away.name: False, home.name: False}
+    inning_log = {away.name: [], home.name: []}
+    if start is not None:
+        validate(start, away, home)
+        score[away.name], score[home.name] = start.score
+        for t, team in enumerate((away, home)):
+            gs, slot = state[team.name], start.pitcher[t]
+            gs.lineup_index = start.batter[t]
+            gs.pitcher_slot = slot
+            gs.available = available_mask(start, t, len(team.staff))
+            if slot:
+                cap = start.cap[t]
+                reliever_cap[team.name][slot] = rng.randint(*entry_cap) if cap is None else cap
+            emergency_mode[team.name] = start.emergency[t]
+            # halves before the resume point were not simulated
+            inning_log[team.name] = [None] * (start.inning - 1 + (start.half if t == 0 else 0))
+    for name, mask in (unavailable or {}).items():
+        state[name].rest(mask)
+
+    # Box + bullpen state, indexed by roster slot
+    hit_box = {t.name: [[0] * len(HIT_STATS) for _ in t.lineup] for t in (away, home)}
+    pit_box = {t.name: [[0] * len(PIT_STATS) for _ in t.staff] for t in (away, home)}
     pitch_log = []
-    reliever_cap = {away.name: {}, home.name: {}}
-    appearance_bf = {away.name: {}, home.name: {}}
+    open_log = {}
     used_pitchers = {away.name: [], home.name: []}
-    emergency_mode = {away.name: False, home.name: False}
+    if start is not None:
+        for t, team in enumerate((away, home)):
+            pb = pit_box[team.name][start.pitcher[t]]
+            pb[P_BF] = start.bf[t]
+            pb[P_R] = pb[P_ER] = start.runs_allowed[t]
 
-    # NEW — inning-by-inning log + errors tracker
-    inning_log = {away.name: [], home.name: []}
+    on_mound = {}  # staff slot that finished each team's last defensive half (instrument only)
+
+    # NEW — errors tracker
     team_errors = {away.name: 0, home.name: 0}
 
     # ------------------
     # Helper functions
     # ------------------
-    def ensure_pitcher(team, name):
-        pit_box[team].setdefault(name, {"IP": 0, "R": 0, "ER": 0, "K": 0, "BB": 0, "HR": 0})
-        outs_map[team].setdefault(name, 0)
-        bf_map[team].setdefault(name, 0)
-        runs_map[team].setdefault(name, 0)
-        appearance_bf[team].setdefault(name, 0)
-        if name not in used_pitchers[team]:
-            used_pitchers[team].append(name)
+    def ensure_pitcher(team, slot):
+        if not pit_box[team][slot][P_G]:
+            pit_box[team][slot][P_G] = 1
+            used_pitchers[team].append(slot)
 
     def start_log(team, name, half, inn):
-        pitch_log.append({"Team": team, "Pitcher": name, "Half": half, "Inning_Start": inn, "Inning_End": None})
+        if full:
+            open_log[team] = {"Team": team, "Pitcher": name, "Half": half, "Inning_Start": inn, "Inning_End": None}
+            pitch_log.append(open_log[team])
 
     def end_log(team, name, half, inn):
-        for row in reversed(pitch_log):
-            if row["Team"] == team and row["Pitcher"] == name and row["Half"] == half and row["Inning_End"] is None:
-                row["Inning_End"] = inn
-                break
-
-    def record_run(player_name, team):
-        hit_box[team].setdefault(player_name,
-                                 {"PA": 0, "AB": 0, "H": 0, "2B": 0, "3B": 0, "HR": 0, "BB": 0, "R": 0, "RBI": 0})
-        hit_box[team][player_name]["R"] += 1
-
-    def avg_dra_vs_next_three(def_team, off_team, cur_idx, candidate):
-        n = len(off_team.lineup)
-        next3 = [off_team.lineup[(cur_idx + i) % n] for i in (1, 2, 3)]
-        vals = []
-        for nb in next3:
-            h_hand = nb.hand
-            match = pitcher_probs[
-                (pitcher_probs["full_name"] == candidate.name)
-                & (pitcher_probs["bats"] == h_hand)
-            ]
-            if not match.empty and "dra_minus" in match.columns:
-                vals.append(float(match.iloc[0]["dra_minus"]))
-            else:
-                vals.append(getattr(candidate, "dra_minus", 100.0))
-        return float(np.mean(vals)) if vals else 100.0
-
-    def pick_next_reliever(def_team, off_team, cur_batter, inning=1):
-        try:
-            cur_idx = off_team.lineup.index(cur_batter)
-        except ValueError:
-            cur_idx = 0
-        cur_pitcher = def_team.get_pitcher()
-        bullpen_candidates = [p for p in def_team.bullpen if p is not cur_pitcher]
-        if bullpen_candidates:
-            scores = {c: avg_dra_vs_next_three(def_team, off_team, cur_idx, c) for c in bullpen_candidates}
-            best = min(scores, key=scores.get)
-            def_team.bullpen.remove(best)
-            def_team.set_pitcher(best)
-            reliever_cap[def_team.name][best.name] = random.randint(3, 5)
-            appearance_bf[def_team.name][best.name] = 0
-            return best, scores[best], False
-        reserves = getattr(def_team, "reserves", [])
-        if reserves and (inning >= 10 or emergency_mode[def_team.name]):
-            reserve_candidates = [p for p in reserves if p not in def_team.bullpen]
-            if reserve_candidates:
-                scores = {c: avg_dra_vs_next_three(def_team, off_team, cur_idx, c) for c in reserve_candidates}
-                best = min(scores, key=scores.get)
-                def_team.reserves.remove(best)
-                def_team.set_pitcher(best)
-                reliever_cap[def_team.name][best.name] = random.randint(3, 5)
-                appearance_bf[def_team.name][best.name] = 0
+        if full:
+            open_log.pop(team)["Inning_End"] = inn
+
+    def pick_next_reliever(def_team, off_team, cur_idx, inning=1):
+        # Ranking by avg DRA- vs the next three hitters is precompiled per matchup
+        gs = state[def_team.name]
+        cur_pitcher = gs.pitcher
+        table = matchups[off_team.name]
+        best, dra = table.best_reliever(cur_idx, gs.bullpen_available())
+        if best is not None:
+            gs.set_pitcher(best)
+            reliever_cap[def_team.name][best] = rng.randint(*entry_cap)
+            return gs.pitcher, dra, False
+        if inning >= 10 or emergency_mode[def_team.name]:
+            best, dra = table.best_reliever(cur_idx, gs.reserves_available())
+            if best is not None:
+                gs.set_pitcher(best)
+                reliever_cap[def_team.name][best] = rng.randint(*entry_cap)
                 if verbose:
-                    print(f"🚨 Emergency reserve activation for {def_team.name}: {best.name}")
-                return best, scores[best], True
+                    print(f"🚨 Emergency reserve activation for {def_team.name}: {gs.pitcher.name}")
+                if instrument is not None:
+                    instrument.counts["emergency_activations"] += 1
+                return gs.pitcher, dra, True
         emergency_mode[def_team.name] = True
+        if instrument is not None:
+            instrument.counts["bullpen_exhausted"] += 1
         if verbose:
             print(f"⚠️ No pitchers available for {def_team.name}, keeping {cur_pitcher.name}.")
         return cur_pitcher, None, True
@@ -181,63 +257,83 @@ def simulate_game(team1, team2, hitter_probs, pitcher_probs, verbose=False):
     # ------------------
     # Half-inning simulation
     # ------------------
-    def sim_half(offense, defense, half, inn):
+    def sim_half(offense, defense, half, inn, resume=None):
         outs, runs = 0, 0
-        bases = [None, None, None]
-        p = defense.get_pitcher()
-        ensure_pitcher(defense.name, p.name)
+        bases = [None, None, None]  # lineup slots of the runners
+        if resume is not None:
+            outs, bases = resume
+        off_state, def_state = state[offense.name], state[defense.name]
+        off_box = hit_box[offense.name]
+        table = matchups[offense.name]
+        p_slot = def_state.pitcher_slot
+        p = def_state.pitcher
+        pb = pit_box[defense.name][p_slot]
+        if record is not None and not pb[P_G]:
+            events.entry(event_game, inn, half == "Bottom", p_slot, outs, bases)
+        ensure_pitcher(defense.name, p_slot)
         start_log(defense.name, p.name, half, inn)
         if verbose: print(f"\n{half} {inn}: {offense.name} batting vs {defense.name}")
+        if instrument is not None:
+            prev = on_mound.get(defense.name)
+            if prev is not None and prev != p_slot:
+                # an emergency reserve picked last half takes the mound now
+                instrument.counts["pitching_changes"] += 1
+                if on_change is not None:
+                    old = pit_box[defense.name][prev]
+                    on_change(PitchingChangeEvent(game_no, inn, half, defense.name,
+                                                  defense.staff[prev].name, p.name,
+                                                  old[P_BF], old[P_R], True))
 
         while outs < 3:
-            batter = offense.next_batter()
-            result = simulate_pa(batter, p, hitter_probs, pitcher_probs)
-            ensure_pitcher(defense.name, p.name)
-            h = hit_box[offense.name].setdefault(
-                batter.name, {"PA": 0, "AB": 0, "H": 0, "2B": 0, "3B": 0, "HR": 0, "BB": 0, "R": 0, "RBI": 0})
-            h["PA"] += 1
-            bf_map[defense.name][p.name] += 1
-            appearance_bf[defense.name][p.name] += 1
+            if timing:
+                t0 = clock()
+            b_slot, batter = off_state.next_batter()
+            code = table.draw(b_slot, p_slot, rng.random())
+            result = OUTCOMES[code]
+            if record is not None:
+                outs_before, bases_before = outs, bases[:]
+            if timing:
+                t1 = clock()
+                times["pa_sampling"] += t1 - t0
+            runs_before = runs
+            h = off_box[b_slot]
+            h[H_PA] += 1
+            pb[P_BF] += 1
 
             if result in ["out", "so"]:
                 outs += 1
-                h["AB"] += 1
-                outs_map[defense.name][p.name] += 1
+                h[H_AB] += 1
+                pb[P_OUTS] += 1
                 if result == "so":
-                    pit_box[defense.name][p.name]["K"] += 1
+                    pb[P_K] += 1
 
             elif result == "walk":
-                h["BB"] += 1
-                pit_box[defense.name][p.name]["BB"] += 1
-                if all(bases):
-                    scorer = bases[2]
-                    if scorer:
-                        record_run(scorer.name, offense.name)
+                h[H_BB] += 1
+                pb[P_BB] += 1
+                if None not in bases:
+                    off_box[bases[2]][H_R] += 1
                     runs += 1
-                    pit_box[defense.name][p.name]["R"] += 1
-                    pit_box[defense.name][p.name]["ER"] += 1
-                    runs_map[defense.name][p.name] = runs_map[defense.name].get(p.name, 0) + 1
-                bases = [batter if not bases[0] else bases[0],
-                         bases[0] if not bases[1] else bases[1],
-                         bases[1] if not bases[2] else bases[2]]
+                    pb[P_R] += 1
+                    pb[P_ER] += 1
+                bases = [b_slot if bases[0] is None else bases[0],
+                         bases[0] if bases[1] is None else bases[1],
+                         bases[1] if bases[2] is None else bases[2]]
 
             elif result == "roe":
                 # Reached on error
                 team_errors[defense.name] += 1
-                if all(bases):
-                    scorer = bases[2]
-                    if scorer:
-                        record_run(scorer.name, offense.name)
+                if None not in bases:
+                    off_box[bases[2]][H_R] += 1
                     runs += 1
-                bases = [batter if not bases[0] else bases[0],
-                         bases[0] if not bases[1] else bases[1],
-                         bases[1] if not bases[2] else bases[2]]
+                bases = [b_slot if bases[0] is None else bases[0],
+                         bases[0] if bases[1] is None else bases[1],
+                         bases[1] if bases[2] is None else bases[2]]
 
             else:
                 move = {"single": 1, "double": 2, "triple": 3, "hr": 4}[result]
                 scoring = []
                 for i in reversed(range(3)):
-                    if bases[i]:
+                    if bases[i] is not None:
                         target = i + move
                         if target >= 3:
                             scoring.append(bases[i])
@@ -246,74 +342,101 @@ def simulate_game(team1, team2, hitter_probs, pitcher_probs, verbose=False):
                             bases[target] = bases[i]
                             bases[i] = None
                 if move < 4:
-                    bases[move - 1] = batter
+                    bases[move - 1] = b_slot
                 else:
-                    scoring.append(batter)
+                    scoring.append(b_slot)
                 for r in scoring:
-                    record_run(r.name, offense.name)
+                    off_box[r][H_R] += 1
                     runs += 1
-                    h["RBI"] += 1
-                    pit_box[defense.name][p.name]["R"] += 1
-                    pit_box[defense.name][p.name]["ER"] += 1
-                    runs_map[defense.name][p.name] = runs_map[defense.name].get(p.name, 0) + 1
-                if result != "hr":
-                    h["AB"] += 1
-                    h["H"] += 1
+                    h[H_RBI] += 1
+                    pb[P_R] += 1
+                    pb[P_ER] += 1
+                h[H_AB] += 1
+                h[H_H] += 1
                 if result == "double":
-                    h["2B"] += 1
+                    h[H_2B] += 1
                 if result == "triple":
-                    h["3B"] += 1
+                    h[H_3B] += 1
                 if result == "hr":
-                    h["AB"] += 1
-                    h["H"] += 1
-                    h["HR"] += 1
-                    pit_box[defense.name][p.name]["HR"] += 1
-
-            starter = (p.name == starters[defense.name])
-            bf_cur = appearance_bf[defense.name][p.name]
-            cap = reliever_cap[defense.name].get(p.name, None)
-            runner_flags = [1 if b else 0 for b in bases]
-
-            if should_pull_pitcher(
-                p, bf_cur, runs_map[defense.name].get(p.name, 0),
+                    h[H_HR] += 1
+                    pb[P_HR] += 1
+
+            if timing:
+                t2 = clock()
+                times["baserunning"] += t2 - t1
+            if record is not None:
+                record(event_game, inn, half == "Bottom", b_slot, p_slot, code,
+                       outs_before, bases_before, outs, bases, runs - runs_before)
+            if on_pa is not None:
+                on_pa(PAEvent(game_no, inn, half, offense.name, defense.name, batter.name, p.name,
+                              result, outs, tuple(bases), runs - runs_before))
+
+            starter = p_slot == 0
+            cap = reliever_cap[defense.name][p_slot]
+            runner_flags = [0 if b is None else 1 for b in bases]
+
+            pull = should_pull_pitcher(
+                p, pb[P_BF], pb[P_R],
                 runner_flags, starter, cap,
                 emergency_mode[defense.name],
                 outs_this_inning=outs,
-            ):
-                outs_for_p = outs_map[defense.name][p.name]
-                pit_box[defense.name][p.name]["IP"] += outs_for_p / 3.0
-                outs_map[defense.name][p.name] = 0
+                rng=rng,
+                policy=policy,
+            )
+            if timing:
+                t3 = clock()
+                times["pull_decision"] += t3 - t2
+            if pull:
                 end_log(defense.name, p.name, half, inn)
-                newp, dra, emerg = pick_next_reliever(defense, offense, batter, inning=inn)
+                newp, dra, emerg = pick_next_reliever(defense, offense, b_slot, inning=inn)
+                if instrument is not None:
+                    if timing:
+                        times["reliever_selection"] += clock() - t3
+                    # an emergency reserve only takes over next half (counted there)
+                    if newp is not p and not emerg:
+                        instrument.counts["pitching_changes"] += 1
+                        if on_change is not None:
+                            on_change(PitchingChangeEvent(game_no, inn, half, defense.name, p.name,
+                                                          newp.name, pb[P_BF], pb[P_R], emerg))
                 if emerg:
                     start_log(defense.name, p.name, half, inn)
                     continue
-                p = defense.get_pitcher()
+                p_slot = def_state.pitcher_slot
+                p = def_state.pitcher
+                pb = pit_box[defense.name][p_slot]
                 if verbose:
                     print(f"🧮 Manager selects {p.name} (Avg DRA-: {dra:.1f})")
-                ensure_pitcher(defense.name, p.name)
+                if record is not None and not pb[P_G]:
+                    events.entry(event_game, inn, half == "Bottom", p_slot, outs, bases)
+                ensure_pitcher(defense.name, p_slot)
                 start_log(defense.name, p.name, half, inn)
 
-        outs_for_final = outs_map[defense.name][p.name]
-        pit_box[defense.name][p.name]["IP"] += outs_for_final / 3.0
-        outs_map[defense.name][p.name] = 0
         end_log(defense.name, p.name, half, inn)
+        if instrument is not None:
+            on_mound[defense.name] = p_slot
         return runs
 
     # ------------------
     # Inning loop
     # ------------------
-    inn = 1
+    inn, top, resume = 1, True, None
+    if start is not None:
+        inn, top = start.inning, start.half == 0
+        batting = home if start.half else away
+        resume = start.outs, runner_slots(start.bases, start.batter[start.half], len(batting.lineup))
     while True:
-        away_runs = sim_half(away, home, "Top", inn)
-        inning_log[away.name].append(away_runs)
-        score[away.name] += away_runs
-        if verbose: print(f"End of Top {inn}: {score}")
+        if top:
+            away_runs = sim_half(away, home, "Top", inn, resume)
+            resume = None
+            inning_log[away.name].append(away_runs)
+            score[away.name] += away_runs
+            if verbose: print(f"End of Top {inn}: {score}")
 
         if inn >= 9 and score[home.name] > score[away.name]:
             break
 
-        home_runs = sim_half(home, away, "Bottom", inn)
+        home_runs = sim_half(home, away, "Bottom", inn, resume)
+        resume = None
         inning_log[home.name].append(home_runs)
         score[home.name] += home_runs
         if verbose: print(f"End of {inn}: {score}")
@@ -321,12 +444,54 @@ def simulate_game(team1, team2, hitter_probs, pitcher_probs, verbose=False):
         if inn >= 9 and score[home.name] != score[away.name]:
             break
         inn += 1
+        top = True
+
+    game_id = f"game_{rng.randint(1000, 9999)}"
+    if instrument is not None:
+        counts = instrument.counts
+        counts["games"] += 1
+        counts["pa"] += sum(h[H_PA] for t in hit_box.values() for h in t)
+        if inn > 9:
+            counts["extra_inning_games"] += 1
+            counts["extra_innings"] += inn - 9
+        if timing:
+            box_start = clock()
+    if output == "score":
+        return score
 
     # ------------------
     # Summary output + boxscore
     # ------------------
-    hit_rows = [{"Team": t, "Player": p, **s} for t, team in hit_box.items() for p, s in team.items()]
-    pit_rows = [{"Team": t, "Pitcher": p, **s} for t, team in pit_box.items() for p, s in team.items()]
+    if output == "counters":
+        n_lineup = max(len(away.lineup), len(home.lineup))
+        n_staff = max(len(away.staff), len(home.staff))
+        hitting = np.zeros((2, n_lineup, len(HIT_STATS)), dtype=np.int64)
+        pitching = np.zeros((2, n_staff, len(PIT_STATS)), dtype=np.int64)
+        linescore = np.full((2, len(inning_log[away.name])), -1, dtype=np.int64)
+        for i, t in enumerate((away, home)):
+            hitting[i, :len(t.lineup)] = hit_box[t.name]
+            pitching[i, :len(t.staff)] = pit_box[t.name]
+            linescore[i, :len(inning_log[t.name])] = [-1 if r is None else r for r in inning_log[t.name]]
+        counters = {
+            "hitting": hitting,
+            "pitching": pitching,
+            "linescore": linescore,
+            "errors": np.array([team_errors[away.name], team_errors[home.name]]),  # by defense
+        }
+        if timing:
+            times["boxscore"] += clock() - box_start
+        return score, counters
+
+    hit_rows = [
+        {"Team": t.name, "Player": t.lineup[i].name, **dict(zip(HIT_STATS, s))}
+        for t in (away, home) for i, s in enumerate(hit_box[t.name]) if s[H_PA]
+    ]
+    pit_rows = [
+        {"Team": t.name, "Pitcher": t.staff[i].name, "IP": pit_box[t.name][i][P_OUTS] / 3.0,
+         **dict(zip(PIT_STATS, pit_box[t.name][i]))}
+        for t in (away, home) for i in used_pitchers[t.name]
+    ]
+    hits = {t: sum(h[H_H] for h in hit_box[t]) for t in hit_box}
     log_df = pd.DataFrame(pitch_log)
     hit_df = pd.DataFrame(hit_rows)[["Team", "Player", "PA", "AB", "H", "2B", "3B", "HR", "BB", "RBI", "R"]] if hit_rows else pd.DataFrame()
     pit_df = pd.DataFrame(pit_rows)[["Team", "Pitcher", "IP", "R", "ER", "K", "BB", "HR"]] if pit_rows else pd.DataFrame()
@@ -336,16 +501,17 @@ def simulate_game(team1, team2, hitter_probs, pitcher_probs, verbose=False):
     columns = [f"inning_{i}" for i in range(1, max_innings + 1)]
 
     def pad_innings(runs_list):
+        runs_list = ["" if r is None else r for r in runs_list]
         return runs_list + [""] * (max_innings - len(runs_list))
 
     away_row = pad_innings(inning_log[away.name]) + [
         score[away.name],
-        int(hit_df[hit_df["Team"] == away.name]["H"].sum()) if not hit_df.empty else 0,
+        hits[away.name],
         team_errors[home.name]  # away team’s errors = home defense
     ]
     home_row = pad_innings(inning_log[home.name]) + [
         score[home.name],
-        int(hit_df[hit_df["Team"] == home.name]["H"].sum()) if not hit_df.empty else 0,
+        hits[home.name],
         team_errors[away.name]  # home team’s errors = away defense
     ]
 
@@ -354,10 +520,12 @@ def simulate_game(team1, team2, hitter_probs, pitcher_probs, verbose=False):
         columns=columns + ["r", "h", "e"]
     )
     box_df.insert(0, "team", [away.name, home.name])
-    box_df.insert(0, "game_id", [f"game_{random.randint(1000,9999)}"] * 2)
+    box_df.insert(0, "game_id", [game_id] * 2)
 
     if verbose:
         print("\n📊 Inning Boxscore:")
         print(box_df)
 
+    if timing:
+        times["boxscore"] += clock() - box_start
     return score, hit_df, pit_df, log_df, box_df
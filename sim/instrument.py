@@ -0,0 +1,69 @@
+import time
+from collections import namedtuple
+
+import pandas as pd
+
+# Timed phases of simulate_game
+PHASES = ("pa_sampling", "baserunning", "pull_decision", "reliever_selection", "boxscore")
+COUNTERS = (
+    "games", "pa", "pitching_changes", "emergency_activations", "bullpen_exhausted",
+    "extra_inning_games", "extra_innings",
+)
+
+# Hook payloads. `game` is the 0-based index of the game within this Instrumentation.
+PAEvent = namedtuple(
+    "PAEvent", "game inning half offense defense batter pitcher result outs bases runs"
+)
+PitchingChangeEvent = namedtuple(
+    "PitchingChangeEvent",
+    "game inning half team old_pitcher new_pitcher batters_faced runs_allowed emergency",
+)
+
+
+class Instrumentation:
+    """Optional timers, counters and hooks for simulate_game(..., instrument=...).
+
+    Pass the same object to many games to accumulate. With `timers=False`
+    only counters and hooks run; with no Instrumentation at all the game
+    pays a few local truthiness checks per PA.
+
+    on_pa(PAEvent) fires after every PA; on_pitching_change(PitchingChangeEvent)
+    fires whenever a new pitcher takes the mound. An emergency reserve picked
+    mid-half takes over at the start of his team's next defensive half, so
+    that is when his change is counted and fired (with emergency=True).
+    `bases` in PAEvent is the (1B, 2B, 3B) runners' lineup slots (None = empty).
+    """
+
+    def __init__(self, timers=True, on_pa=None, on_pitching_change=None):
+        self.timing = timers
+        self.clock = time.perf_counter
+        self.on_pa = on_pa
+        self.on_pitching_change = on_pitching_change
+        self.reset()
+
+    def reset(self):
+        self.times = dict.fromkeys(PHASES, 0.0)
+        self.counts = dict.fromkeys(COUNTERS, 0)
+
+    def merge(self, other):
+        """Add another Instrumentation's timers and counters into this one."""
+        for k, v in other.times.items():
+            self.times[k] += v
+        for k, v in other.counts.items():
+            self.counts[k] += v
+        return self
+
+    def summary(self):
+        """Seconds, share of timed total and microseconds per PA for each phase."""
+        total = sum(self.times.values())
+        pa = self.counts["pa"]
+        return pd.DataFrame({
+            "phase": PHASES,
+            "seconds": [self.times[p] for p in PHASES],
+            "share": [self.times[p] / total if total else 0.0 for p in PHASES],
+            "us_per_pa": [self.times[p] / pa * 1e6 if pa else 0.0 for p in PHASES],
+        })
+
+    def __repr__(self):
+        counts = ", ".join(f"{k}={v}" for k, v in self.counts.items())
+        return f"Instrumentation({counts}, timed={sum(self.times.values()):.3f}s)"
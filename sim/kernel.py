@@ -0,0 +1,507 @@
+"""Integer-coded single-game kernel: simulate_game's rules on flat arrays.
+
+simulate_game(..., backend="kernel") runs here. Rosters are addressed by
+slot, box scores are flat counter arrays and runners are three lineup
+slots (-1 = empty; not a bitmask, because the legacy walk / ROE advance can
+leave one runner on two bases). Uniforms are read straight from the
+BlockRNG buffer in the same order simulate_game draws them, so a seed
+gives the same game on either backend.
+
+With numba installed the kernel is JIT-compiled (HAVE_NUMBA); otherwise
+the same functions run as plain Python over lists.
+"""
+import numpy as np
+
+from .game import (
+    H_2B, H_3B, H_AB, H_BB, H_H, H_HR, H_PA, H_R, H_RBI, HIT_STATS,
+    P_BB, P_BF, P_ER, P_G, P_HR, P_K, P_OUTS, P_R, PIT_STATS,
+)
+from .matchup import OUTCOMES
+from .policy import BullpenPolicy
+from .situation import available_mask, runner_slots, validate
+
+try:
+    import numba
+except ImportError:  # optional: the kernel then runs as plain Python
+    numba = None
+
+HAVE_NUMBA = numba is not None
+
+N_HIT, N_PIT, N_OUT = len(HIT_STATS), len(PIT_STATS), len(OUTCOMES)
+SO, OUT, WALK, ROE = (OUTCOMES.index(o) for o in ("so", "out", "walk", "roe"))
+
+# Positions of BullpenPolicy fields in the policy vector the kernel reads
+(EARLY_RUNS, EARLY_BF, MID_RUNS, MID_BF, STAMINA_MIN, STAMINA_MAX, EXTEND_RUNS, EXTEND_PROB,
+ EXTEND_MIN, EXTEND_MAX, STARTER_MAX_BF, FATIGUE_BF, FATIGUE_BASE, FATIGUE_STEP, RELIEVER_MIN_BF,
+ RELIEVER_RUNS, TRAFFIC_RUNNERS, TRAFFIC_BF, ENTRY_MIN, ENTRY_MAX, RCAP_MIN, RCAP_MAX) = (
+    BullpenPolicy._fields.index(f) for f in (
+        "early_hook_runs", "early_hook_bf", "mid_hook_runs", "mid_hook_bf", "stamina_min",
+        "stamina_max", "extend_max_runs", "extend_prob", "extend_min", "extend_max",
+        "starter_max_bf", "fatigue_bf", "fatigue_base", "fatigue_step", "reliever_min_bf",
+        "reliever_runs", "traffic_runners", "traffic_bf", "entry_cap_min", "entry_cap_max",
+        "reliever_cap_min", "reliever_cap_max",
+    )
+)
+# Per-team start state read by _games: init[team, field]
+INIT_FIELDS = ("lineup_index", "pitcher_slot", "available", "emergency", "cap", "score",
+               "skipped_halves", "bf", "runs_allowed")
+LIDX, PSLOT, AVAIL, EMERG, CAP, SCORE, SKIPPED, BF, RA = range(len(INIT_FIELDS))
+NO_CAP, DRAW_CAP = -1, -2  # no reliever cap yet / draw one on entry, as simulate_game does
+# Most uniforms one PA can use (outcome, four starter rolls, a reliever's cap),
+# plus the game id drawn after the last one
+PA_DRAWS = 8
+
+
+def _randint(x, a, b):
+    """BlockRNG.randint(a, b) for the uniform x."""
+    return int(a) + int(x * (int(b) - int(a) + 1))
+
+
+def _best_slot(next3, mask, n_staff, base, n_lineup):
+    """Lowest-slot minimum of next3[base + slot * n_lineup] over the slots in `mask` (-1 if none)."""
+    best, best_v = -1, 0.0
+    for s in range(n_staff):
+        if mask >> s & 1:
+            v = next3[base + s * n_lineup]
+            if best < 0 or v < best_v:
+                best, best_v = s, v
+    return best
+
+
+def _half(off, inn, outs, r0, r1, r2, cdf, next3, lineup_len, staff_len, bullpen_mask, stamina,
+          pol, NL, NS, u, pos, lidx, pslot, avail, emerg, rcap, hit, pit, errors):
+    """One half-inning for batting team `off`; returns (runs, pos), pos = -1 if u ran out."""
+    dfn = 1 - off
+    runs = 0
+    p_slot = pslot[dfn]
+    pb = (dfn * NS + p_slot) * N_PIT
+    pit[pb + P_G] = 1
+    n_u = len(u)
+    while outs < 3:
+        if pos + PA_DRAWS > n_u:
+            return runs, -1
+        b = lidx[off]
+        lidx[off] = (b + 1) % lineup_len[off]
+        x = u[pos]
+        pos += 1
+        row = ((off * NL + b) * NS + p_slot) * N_OUT
+        code = 0
+        while code < N_OUT and cdf[row + code] <= x:
+            code += 1
+        h = (off * NL + b) * N_HIT
+        hit[h + H_PA] += 1
+        pit[pb + P_BF] += 1
+
+        if code == OUT or code == SO:
+            outs += 1
+            hit[h + H_AB] += 1
+            pit[pb + P_OUTS] += 1
+            if code == SO:
+                pit[pb + P_K] += 1
+        elif code == WALK or code == ROE:
+            if code == WALK:
+                hit[h + H_BB] += 1
+                pit[pb + P_BB] += 1
+            else:
+                errors[dfn] += 1
+            if r0 >= 0 and r1 >= 0 and r2 >= 0:
+                hit[(off * NL + r2) * N_HIT + H_R] += 1
+                runs += 1
+                if code == WALK:
+                    pit[pb + P_R] += 1
+                    pit[pb + P_ER] += 1
+            n0 = b if r0 < 0 else r0
+            n1 = r0 if r1 < 0 else r1
+            n2 = r1 if r2 < 0 else r2
+            r0, r1, r2 = n0, n1, n2
+        else:
+            move = code + 1  # single, double, triple, hr
+            scored = 0
+            if r2 >= 0:
+                hit[(off * NL + r2) * N_HIT + H_R] += 1
+                scored += 1
+                r2 = -1
+            if r1 >= 0:
+                if move >= 2:
+                    hit[(off * NL + r1) * N_HIT + H_R] += 1
+                    scored += 1
+                else:
+                    r2 = r1
+                r1 = -1
+            if r0 >= 0:
+                if move >= 3:
+                    hit[(off * NL + r0) * N_HIT + H_R] += 1
+                    scored += 1
+                elif move == 2:
+                    r2 = r0
+                else:
+                    r1 = r0
+                r0 = -1
+            if move == 1:
+                r0 = b
+            elif move == 2:
+                r1 = b
+            elif move == 3:
+                r2 = b
+            else:
+                hit[h + H_R] += 1
+                scored += 1
+            runs += scored
+            hit[h + H_RBI] += scored
+            pit[pb + P_R] += scored
+            pit[pb + P_ER] += scored
+            hit[h + H_AB] += 1
+            hit[h + H_H] += 1
+            if move == 2:
+                hit[h + H_2B] += 1
+            elif move == 3:
+                hit[h + H_3B] += 1
+            elif move == 4:
+                hit[h + H_HR] += 1
+                pit[pb + P_HR] += 1
+
+        # Pull decision (should_pull_pitcher)
+        bf = pit[pb + P_BF]
+        ra = pit[pb + P_R]
+        pull = False
+        if p_slot == 0:
+            if ra >= pol[EARLY_RUNS] and bf < pol[EARLY_BF]:
+                pull = True
+            elif bf >= pol[MID_BF] and ra >= pol[MID_RUNS]:
+                pull = True
+            else:
+                cap = stamina[dfn * NS + p_slot]
+                if cap < 0:
+                    cap = _randint(u[pos], pol[STAMINA_MIN], pol[STAMINA_MAX])
+                    pos += 1
+                if ra <= pol[EXTEND_RUNS] and bf >= cap:
+                    x = u[pos]
+                    pos += 1
+                    if x < pol[EXTEND_PROB]:
+                        cap = _randint(u[pos], pol[EXTEND_MIN], pol[EXTEND_MAX])
+                        pos += 1
+                if bf >= pol[STARTER_MAX_BF] or bf >= cap:
+                    pull = True
+                elif bf >= pol[FATIGUE_BF]:
+                    x = u[pos]
+                    pos += 1
+                    if x < pol[FATIGUE_BASE] + pol[FATIGUE_STEP] * (bf - pol[FATIGUE_BF]):
+                        pull = True
+        elif bf >= pol[RELIEVER_MIN_BF] or emerg[dfn]:
+            cap = rcap[dfn * NS + p_slot]
+            if cap < 0:
+                cap = _randint(u[pos], pol[RCAP_MIN], pol[RCAP_MAX])
+                pos += 1
+            n_on = (r0 >= 0) + (r1 >= 0) + (r2 >= 0)
+            if ra >= pol[RELIEVER_RUNS]:
+                pull = True
+            elif n_on >= pol[TRAFFIC_RUNNERS] and bf >= pol[TRAFFIC_BF]:
+                pull = True
+            elif bf >= cap:
+                pull = True
+        if not pull:
+            continue
+
+        # Next pitcher (pick_next_reliever), ranked vs the three hitters after b
+        base = dfn * NS * NL + b
+        best = _best_slot(next3, avail[dfn] & bullpen_mask[dfn], staff_len[dfn], base, NL)
+        if best >= 0:
+            pslot[dfn] = best
+            avail[dfn] &= ~(1 << best)
+            rcap[dfn * NS + best] = _randint(u[pos], pol[ENTRY_MIN], pol[ENTRY_MAX])
+            pos += 1
+            p_slot = best
+            pb = (dfn * NS + p_slot) * N_PIT
+            pit[pb + P_G] = 1
+            continue
+        if inn >= 10 or emerg[dfn]:
+            best = _best_slot(next3, avail[dfn] & ~bullpen_mask[dfn], staff_len[dfn], base, NL)
+            if best >= 0:
+                # The reserve takes over from the next half; this one stays on
+                pslot[dfn] = best
+                avail[dfn] &= ~(1 << best)
+                rcap[dfn * NS + best] = _randint(u[pos], pol[ENTRY_MIN], pol[ENTRY_MAX])
+                pos += 1
+                continue
+        emerg[dfn] = 1
+    return runs, pos
+
+
+def _play(cdf, next3, lineup_len, staff_len, bullpen_mask, stamina, pol, NL, NS, u, pos,
+          inn, top, outs, r0, r1, r2, lidx, pslot, avail, emerg, rcap, hit, pit, line, n_line,
+          errors, score):
+    """Play to the final out; returns the next stream position, -1 if u ran out, -2 if `line` is full."""
+    width = len(line) // 2
+    while True:
+        if top:
+            if n_line[0] >= width:
+                return -2
+            runs, pos = _half(0, inn, outs, r0, r1, r2, cdf, next3, lineup_len, staff_len,
+                              bullpen_mask, stamina, pol, NL, NS, u, pos, lidx, pslot, avail,
+                              emerg, rcap, hit, pit, errors)
+            if pos < 0:
+                return -1
+            outs, r0, r1, r2 = 0, -1, -1, -1
+            line[n_line[0]] = runs
+            n_line[0] += 1
+            score[0] += runs
+        if inn >= 9 and score[1] > score[0]:
+            break
+        if n_line[1] >= width:
+            return -2
+        runs, pos = _half(1, inn, outs, r0, r1, r2, cdf, next3, lineup_len, staff_len,
+                          bullpen_mask, stamina, pol, NL, NS, u, pos, lidx, pslot, avail,
+                          emerg, rcap, hit, pit, errors)
+        if pos < 0:
+            return -1
+        outs, r0, r1, r2 = 0, -1, -1, -1
+        line[width + n_line[1]] = runs
+        n_line[1] += 1
+        score[1] += runs
+        if inn >= 9 and score[1] != score[0]:
+            break
+        inn += 1
+        top = True
+    return pos + 1  # game id draw
+
+
+def _full(n, value):
+    """A length-n int vector of `value`: a list in plain Python, an int64 array under numba."""
+    return [value] * n
+
+
+def _fill(buf, value):
+    """Reset every entry of a _full vector to `value`."""
+    buf[:] = [value] * len(buf)
+
+
+def _games(cdf, next3, lineup_len, staff_len, bullpen_mask, stamina, pol, NL, NS, u, pos, g,
+           where, init, hit, pit, line, n_line, errors, score):
+    """Play games g, g + 1, ... from the same start, writing row g onwards of the outputs.
+
+    `where` is the start (inning, top, outs, 1B, 2B, 3B runner) and
+    init[t] team t's starting INIT_FIELDS. Returns (status, next game,
+    pos) with status 0 once every row is played, -1 when u runs out and
+    -2 when `line` is too narrow; the game in progress is then replayed
+    from `pos` on the next call.
+    """
+    n_u = len(u)
+    width = len(line[0]) // 2
+    # Work buffers, reset for each game and copied into its output rows
+    lidx, pslot, avail, emerg = _full(2, 0), _full(2, 0), _full(2, 0), _full(2, 0)
+    sc, nl, err = _full(2, 0), _full(2, 0), _full(2, 0)
+    rcap = _full(2 * NS, -1)
+    h, pt, ln = _full(2 * NL * N_HIT, 0), _full(2 * NS * N_PIT, 0), _full(2 * width, -1)
+    while g < len(score):
+        if pos + PA_DRAWS + 2 > n_u:
+            return -1, g, pos
+        p = pos
+        _fill(err, 0)
+        _fill(rcap, -1)
+        _fill(h, 0)
+        _fill(pt, 0)
+        _fill(ln, -1)
+        for t in range(2):
+            row = init[t]
+            slot = row[PSLOT]
+            lidx[t], pslot[t], avail[t], emerg[t] = row[LIDX], slot, row[AVAIL], row[EMERG]
+            sc[t], nl[t] = row[SCORE], row[SKIPPED]
+            if row[CAP] == DRAW_CAP:
+                rcap[t * NS + slot] = _randint(u[p], pol[ENTRY_MIN], pol[ENTRY_MAX])
+                p += 1
+            elif row[CAP] >= 0:
+                rcap[t * NS + slot] = row[CAP]
+            pb = (t * NS + slot) * N_PIT
+            pt[pb + P_BF] = row[BF]
+            pt[pb + P_R] = row[RA]
+            pt[pb + P_ER] = row[RA]
+        end = _play(cdf, next3, lineup_len, staff_len, bullpen_mask, stamina, pol, NL, NS, u, p,
+                    where[0], where[1] == 1, where[2], where[3], where[4], where[5],
+                    lidx, pslot, avail, emerg, rcap, h, pt, ln, nl, err, sc)
+        if end < 0:
+            return end, g, pos
+        hit[g, :] = h
+        pit[g, :] = pt
+        line[g, :] = ln
+        for t in range(2):
+            n_line[g, t] = nl[t]
+            errors[g, t] = err[t]
+            score[g, t] = sc[t]
+        pos = end
+        g += 1
+    return 0, g, pos
+
+
+if HAVE_NUMBA:
+    # numpy's error model: no ZeroDivisionError checks on the per-PA `%`
+    _jit = numba.njit(cache=True, error_model="numpy")
+
+    @_jit
+    def _full(n, value):
+        return np.full(n, value, dtype=np.int64)
+
+    @_jit
+    def _fill(buf, value):
+        buf[:] = value
+
+    _best_slot = numba.njit(cache=True, error_model="numpy", inline="always")(_best_slot)
+    _randint = numba.njit(cache=True, error_model="numpy", inline="always")(_randint)
+    _half = _jit(_half)
+    _play = _jit(_play)
+    _games = _jit(_games)
+
+
+# -------------------------
+# Compiled inputs
+# -------------------------
+
+class KernelTables:
+    """One compiled matchup as the flat arrays the kernel reads (team 0 = away).
+
+    cdf[t, b, p, k]  team t's lineup slot b vs the opposing staff slot p
+    next3[t, p, b]   team t's staff slot p vs the three hitters after slot b
+    Built from a compile_game dict, so both backends draw from the same tables.
+    """
+
+    def __init__(self, away, home, matchups):
+        teams = (away, home)
+        self.names = (away.name, home.name)
+        self.n_lineup = NL = max(len(t.lineup) for t in teams)
+        self.n_staff = NS = max(len(t.staff) for t in teams)
+        cdf = np.ones((2, NL, NS, N_OUT))
+        next3 = np.full((2, NS, NL), np.inf)
+        stamina = np.full((2, NS), -1, dtype=np.int64)
+        for t, team in enumerate(teams):
+            bat = matchups[team.name]
+            cdf[t, :len(bat.batters), :len(bat.pitchers)] = bat.cdf
+            ranked = matchups[teams[1 - t].name].next3  # (team t's staff, opponent's lineup)
+            next3[t, :ranked.shape[0], :ranked.shape[1]] = ranked
+            for s, p in enumerate(team.staff):
+                cap = getattr(p, "stamina_cap", None)
+                if cap is not None:
+                    stamina[t, s] = cap
+        self.arrays = (
+            cdf.ravel(), next3.ravel(),
+            np.array([len(t.lineup) for t in teams], dtype=np.int64),
+            np.array([len(t.staff) for t in teams], dtype=np.int64),
+            np.array([((1 << t.n_bullpen) - 1) << 1 for t in teams], dtype=np.int64),
+            stamina.ravel(),
+        )
+        # Plain lists index much faster than arrays in the pure-Python kernel
+        self.lists = tuple(a.tolist() for a in self.arrays)
+
+
+def kernel_tables(away, home, matchups):
+    """KernelTables for a compile_game dict, memoized on its away-side MatchupTable."""
+    table = matchups[away.name]
+    cached = table._kernel
+    if cached is not None and cached[0] is matchups[home.name]:
+        return cached[1]
+    tables = KernelTables(away, home, matchups)
+    table._kernel = (matchups[home.name], tables)
+    return tables
+
+
+# -------------------------
+# Game wrapper
+# -------------------------
+
+_POLICY_VECTORS = {}
+
+
+def _policy_vector(policy):
+    """The policy as the float vector the kernel indexes (memoized per policy)."""
+    vec = _POLICY_VECTORS.get(policy)
+    if vec is None:
+        vec = [float(v) for v in policy]
+        if HAVE_NUMBA:
+            vec = np.array(vec)
+        vec = _POLICY_VECTORS[policy] = vec
+    return vec
+
+
+def _start_state(away, home, policy, start, unavailable):
+    """(where, init) for _games: simulate_game's setup for `start` and `unavailable`."""
+    teams = (away, home)
+    init = np.zeros((2, len(INIT_FIELDS)), dtype=np.int64)
+    init[:, CAP] = NO_CAP
+    where = [1, 1, 0, -1, -1, -1]
+    for t, team in enumerate(teams):
+        init[t, AVAIL] = ((1 << len(team.staff)) - 1) & ~1
+    if start is not None:
+        validate(start, away, home)
+        for t, team in enumerate(teams):
+            slot = start.pitcher[t]
+            init[t, LIDX] = start.batter[t]
+            init[t, PSLOT] = slot
+            init[t, AVAIL] = available_mask(start, t, len(team.staff))
+            if slot:
+                init[t, CAP] = DRAW_CAP if start.cap[t] is None else start.cap[t]
+            init[t, EMERG] = bool(start.emergency[t])
+            init[t, SCORE] = start.score[t]
+            init[t, SKIPPED] = start.inning - 1 + (start.half if t == 0 else 0)
+            init[t, BF] = start.bf[t]
+            init[t, RA] = start.runs_allowed[t]
+        runners = runner_slots(start.bases, start.batter[start.half], len(teams[start.half].lineup))
+        where = [start.inning, int(start.half == 0), start.outs,
+                 *(-1 if r is None else r for r in runners)]
+    for t, team in enumerate(teams):
+        init[t, AVAIL] &= ~(unavailable or {}).get(team.name, 0)
+    if HAVE_NUMBA:
+        return np.array(where, dtype=np.int64), init
+    return where, init.tolist()
+
+
+def play_games(away, home, tables, rng, policy, n_games, start=None, unavailable=None):
+    """Play `n_games` games on the kernel, one after another from `rng`.
+
+    The same games as n_games calls of simulate_game(output="counters")
+    on that BlockRNG, which is advanced past exactly the uniforms they
+    would have used. Returns (score, counters) stacked over games: score
+    (n_games, 2) and counters "hitting" (game, team, lineup slot, stat),
+    "pitching", "errors" and "linescore" (game, team, inning), -1 past
+    each game's last half inning.
+    """
+    NL, NS = tables.n_lineup, tables.n_staff
+    where, init = _start_state(away, home, policy, start, unavailable)
+    data = tables.arrays if HAVE_NUMBA else tables.lists
+    pol = _policy_vector(policy)
+
+    width = 16
+    hit = np.zeros((n_games, 2 * NL * N_HIT), dtype=np.int64)
+    pit = np.zeros((n_games, 2 * NS * N_PIT), dtype=np.int64)
+    line = np.full((n_games, 2 * width), -1, dtype=np.int64)
+    n_line, errors, score = (np.zeros((n_games, 2), dtype=np.int64) for _ in range(3))
+    g, n_u = 0, 64 * PA_DRAWS
+    while True:
+        # Enough uniforms for most of the remaining games; a shortfall just means another window
+        u, pos = rng.window(max(n_u, min(n_games - g, 1024) * 16 * PA_DRAWS), array=HAVE_NUMBA)
+        status, done, pos = _games(*data, pol, NL, NS, u, pos, g, where, init,
+                                   hit, pit, line, n_line, errors, score)
+        rng.advance(pos)
+        if status == 0:
+            break
+        if status == -2:
+            width *= 2
+            wider = np.full((n_games, 2, width), -1, dtype=np.int64)
+            wider[:, :, :width // 2] = line.reshape(n_games, 2, width // 2)
+            line = wider.reshape(n_games, 2 * width)
+        elif done == g:
+            n_u *= 2  # one game needs a longer window
+        g = done
+
+    n_inn = int(n_line[:, 0].max()) if n_games else 0
+    counters = {
+        "hitting": hit.reshape(n_games, 2, NL, N_HIT),
+        "pitching": pit.reshape(n_games, 2, NS, N_PIT),
+        "linescore": line.reshape(n_games, 2, width)[:, :, :n_inn].copy(),
+        "errors": errors,
+    }
+    return score, counters
+
+
+def play_game(away, home, tables, rng, policy, start=None, unavailable=None):
+    """Play one game on the kernel; returns (score, counters) like simulate_game(output="counters")."""
+    score, counters = play_games(away, home, tables, rng, policy, 1, start, unavailable)
+    return ({away.name: int(score[0, 0]), home.name: int(score[0, 1])},
+            {k: v[0] for k, v in counters.items()})
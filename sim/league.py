@@ -0,0 +1,243 @@
+import numpy as np
+import pandas as pd
+
+from .batch import BatchState, BatchTables, run_batch
+from .game import get_matchup_row
+from .matchup import OUTCOMES, dra_lookup, matchup_cdf, resolve_hand
+from .policy import DEFAULT_POLICY
+from .simulate import _iter_chunks
+from .team import Team
+
+HANDS = ("L", "R")
+BAT_HANDS = ("L", "R", "S")
+# Linear weights (per Player.probs key) used to pick and order default lineups
+LINEUP_WEIGHTS = {"bb": 0.69, "hbp": 0.72, "single": 0.89, "double": 1.27, "triple": 1.62, "hr": 2.10}
+
+
+# -------------------------
+# Default rosters
+# -------------------------
+
+def league_teams(hitter_reg, pitcher_reg, n_bullpen=7, n_reserves=4, rosters=None):
+    """A default Team for every club in the probability tables, keyed by team abbreviation.
+
+    Pitchers are grouped by the pitcher table's `team` column. Hitters are
+    grouped by the hitter table's `team` column or, when it has none (as
+    in data/hitter_probs_stub.csv), by `rosters`: {club: [hitter names]}.
+    The lineup is the club's nine best hitters by linear-weights value,
+    best first. The staff is ordered by dra_minus: the best arm starts,
+    the next `n_bullpen` form the bullpen and the next `n_reserves` are
+    reserves. Clubs without nine hitters or a pitcher are left out.
+    """
+    if not pitcher_reg.has_team:
+        raise ValueError("league_teams needs a team column in the pitcher probability table")
+    if rosters is None and not hitter_reg.has_team:
+        raise ValueError("the hitter probability table has no team column; "
+                         "pass rosters={club: [hitter names]} to league_teams")
+    hitters, pitchers = {}, {}
+    for p in hitter_reg.players():
+        hitters.setdefault(p.name, p)
+    for p in pitcher_reg.players():
+        pitchers.setdefault(p.name, p)
+    frame = pitcher_reg.frame()
+    dra = (frame.groupby("full_name", sort=False)["dra_minus"].mean()
+           if "dra_minus" in frame.columns else pd.Series(dtype=float))
+
+    clubs = {}
+    if rosters is None:
+        for p in hitters.values():
+            if isinstance(p.team, str) and p.team:
+                clubs.setdefault(p.team, ([], []))[0].append(p)
+    else:
+        for club, names in rosters.items():
+            missing = [n for n in names if n not in hitters]
+            if missing:
+                raise ValueError(f"{club} roster: no hitter rows for {', '.join(missing)}")
+            clubs[club] = ([hitters[n] for n in names], [])
+    for p in pitchers.values():
+        if isinstance(p.team, str) and p.team in clubs:
+            clubs[p.team][1].append(p)
+
+    teams = {}
+    for club in sorted(clubs):
+        bats, arms = clubs[club]
+        if len(bats) < 9 or not arms:
+            continue
+        value = [sum(w * b.probs.get(k, 0.0) for k, w in LINEUP_WEIGHTS.items()) for b in bats]
+        lineup = [bats[i] for i in np.argsort(value, kind="stable")[::-1][:9]]
+        arms = sorted(arms, key=lambda p: np.nan_to_num(dra.get(p.name, np.nan), nan=100.0))
+        teams[club] = Team(club, lineup, arms[:1 + n_bullpen],
+                           arms[1 + n_bullpen:1 + n_bullpen + n_reserves])
+    return teams
+
+
+# -------------------------
+# Shared compiled tables
+# -------------------------
+
+def _hand_cdf(hitter_probs, pitcher_probs):
+    """[batting side, pitcher hand] -> outcome cdf, as compile_matchups builds it."""
+    out = np.empty((len(HANDS), len(HANDS), len(OUTCOMES)))
+    for i, bh in enumerate(HANDS):
+        for j, ph in enumerate(HANDS):
+            out[i, j] = matchup_cdf(get_matchup_row(hitter_probs, bh, ph),
+                                    get_matchup_row(pitcher_probs, bh, ph))
+    return out
+
+
+def _hand_index(hands, player, team):
+    """Position of player.hand in `hands`, with an error naming the player if it is not there."""
+    if player.hand not in hands:
+        raise ValueError(f"{team.name}: {player.name} has hand {player.hand!r}, "
+                         f"expected one of {', '.join(hands)}")
+    return hands.index(player.hand)
+
+
+def _team_parts(team, dra):
+    """One club's share of every pairing's BatchTables, compiled once."""
+    staff = team.staff
+    bats = np.array([_hand_index(BAT_HANDS, b, team) for b in team.lineup])
+    return {
+        # batting side of each hitter vs a LHP / RHP
+        "side": np.array([[HANDS.index(resolve_hand(b.hand, ph)) for ph in HANDS]
+                          for b in team.lineup]),
+        "bats": bats,
+        "throws": np.array([_hand_index(HANDS, p, team) for p in staff]),
+        # dra_minus vs L / R / S hitters, as dra_matrix looks it up
+        "dra": np.array([[dra.get((p.name, h), getattr(p, "dra_minus", 100.0)) for h in BAT_HANDS]
+                         for p in staff]),
+        "bullpen_mask": ((1 << team.n_bullpen) - 1) << 1,
+        "n_staff": len(staff),
+    }
+
+
+def _stack_pairs(parts, pairs, hand_cdf, shape):
+    """BatchTables holding (away, home) pairing k at team indexes (2k, 2k + 1).
+
+    Equal to BatchTables(away, home, ...) for each pairing, padded to
+    `shape` = (lineup slots, staff slots).
+    """
+    n_lineup, n_staff = shape
+    k = len(pairs)
+    cdf = np.ones((2 * k, n_lineup, n_staff, len(OUTCOMES)))
+    next3 = np.full((2 * k, n_staff, n_lineup), np.inf)
+    lineup_len = np.zeros(2 * k, dtype=np.int64)
+    bullpen_mask = np.zeros(2 * k, dtype=np.int64)
+    reserve_mask = np.zeros(2 * k, dtype=np.int64)
+    for v, pair in enumerate(pairs):
+        for t in (0, 1):
+            own, opp = parts[pair[t]], parts[pair[1 - t]]
+            i = 2 * v + t
+            n = len(own["bats"])
+            # team t bats against the opponent's staff ...
+            cdf[i, :n, :opp["n_staff"]] = hand_cdf[own["side"][:, opp["throws"]], opp["throws"]]
+            # ... and its own staff is ranked against the opponent's lineup
+            d = own["dra"][:, opp["bats"]]
+            m = d.shape[1]
+            nxt = np.arange(m)
+            next3[i, :own["n_staff"], :m] = (d[:, (nxt + 1) % m] + d[:, (nxt + 2) % m]
+                                             + d[:, (nxt + 3) % m]) / 3.0
+            lineup_len[i] = n
+            bullpen_mask[i] = own["bullpen_mask"]
+            reserve_mask[i] = ((1 << own["n_staff"]) - 1) & ~own["bullpen_mask"] & ~1
+    tables = BatchTables.__new__(BatchTables)
+    tables.teams = tables.names = None
+    tables.cdf, tables.next3 = cdf, next3
+    tables.lineup_len, tables.bullpen_mask, tables.reserve_mask = lineup_len, bullpen_mask, reserve_mask
+    tables.slot_bits = np.int64(1) << np.arange(n_staff, dtype=np.int64)
+    return tables
+
+
+# -------------------------
+# Round robin
+# -------------------------
+
+def _run_league_chunk(ctx, pairs, counts, seed_seq, verbose=False):
+    """Play counts[k] games of each (away, home) pairing in one stacked batch run.
+
+    Returns per-pairing home wins, away runs and home runs.
+    """
+    parts, hand_cdf, shape, policy = ctx
+    tables = _stack_pairs(parts, pairs, hand_cdf, shape)
+    variant = np.repeat(np.arange(len(pairs)), counts)
+    state = run_batch(BatchState(len(variant), tables, variant=variant), tables,
+                      np.random.default_rng(seed_seq), policy=policy)
+    k = len(pairs)
+    score = state.score
+    return (np.bincount(variant, weights=score[:, 1] > score[:, 0], minlength=k),
+            np.bincount(variant, weights=score[:, 0], minlength=k),
+            np.bincount(variant, weights=score[:, 1], minlength=k))
+
+
+def round_robin(teams, hitter_probs, pitcher_probs, target_se=0.01, min_games=500,
+                max_games=20_000, seed=0, chunk_games=50_000, workers=None,
+                policy=DEFAULT_POLICY, verbose=False):
+    """Home win probability for every ordered (away, home) pairing of `teams`.
+
+    `teams` is a dict of Team (e.g. from league_teams) or a list. Each
+    club's tables are compiled once and every pairing is assembled from
+    them. Pairings are played on the batch engine, many per stacked run,
+    in units of about `chunk_games` games spread over `workers` processes.
+
+    Game counts adapt per pairing: every pairing plays min_games, then
+    pairings whose win-probability standard error is still above
+    `target_se` play more, at least doubling each round, up to
+    max_games. Units are seeded from SeedSequence(seed) by round and
+    position, so results do not depend on `workers`.
+
+    Returns one row per pairing: away, home, games, home_win_prob, se and
+    mean runs per side. win_matrix() pivots it to home x away.
+    """
+    if isinstance(teams, dict):
+        teams = list(teams.values())
+    dra = dra_lookup(pitcher_probs)
+    parts = [_team_parts(t, dra) for t in teams]
+    hand_cdf = _hand_cdf(hitter_probs, pitcher_probs)
+    shape = (max(len(t.lineup) for t in teams), max(len(t.staff) for t in teams))
+    if shape[1] > 62:
+        raise ValueError("batch engine supports at most 62 pitchers per staff")
+    ctx = (parts, hand_cdf, shape, policy)
+
+    n = len(teams)
+    pairs = np.array([(a, h) for h in range(n) for a in range(n) if a != h])
+    games = np.zeros(len(pairs), dtype=np.int64)
+    home_wins, away_runs, home_runs = np.zeros(len(pairs)), np.zeros(len(pairs)), np.zeros(len(pairs))
+    need = np.full(len(pairs), min_games, dtype=np.int64)
+    rnd = 0
+    while need.any():
+        todo = np.flatnonzero(need)
+        # Cut the pending pairings into units of about chunk_games games
+        cuts = np.searchsorted(np.cumsum(need[todo]), np.arange(chunk_games, need.sum(), chunk_games))
+        units = [u for u in np.split(todo, np.unique(cuts + 1)) if len(u)]
+        plan = [(pairs[u].tolist(), need[u], np.random.SeedSequence(seed, spawn_key=(rnd, j)))
+                for j, u in enumerate(units)]
+        for u, (w, ra, rh) in zip(units, _iter_chunks(ctx, plan, workers, runner=_run_league_chunk)):
+            games[u] += need[u]
+            home_wins[u] += w
+            away_runs[u] += ra
+            home_runs[u] += rh
+
+        p = home_wins / games
+        want = np.ceil(p * (1 - p) / target_se ** 2).astype(np.int64)
+        need = np.where(want > games, np.maximum(want - games, games), 0)
+        need = np.minimum(need, max_games - games)
+        rnd += 1
+        if verbose:
+            print(f"🏟️ round {rnd}: {games.sum():,} games, {np.count_nonzero(need)} pairings need more")
+
+    p = home_wins / games
+    names = np.array([t.name for t in teams])
+    return pd.DataFrame({
+        "away": names[pairs[:, 0]],
+        "home": names[pairs[:, 1]],
+        "games": games,
+        "home_win_prob": p,
+        "se": np.sqrt(p * (1 - p) / games),
+        "away_runs": away_runs / games,
+        "home_runs": home_runs / games,
+    })
+
+
+def win_matrix(cells):
+    """round_robin output as a home (rows) x away (columns) home-win-probability matrix."""
+    return cells.pivot(index="home", columns="away", values="home_win_prob")
@@ -1,74 +1,198 @@
+import glob
+import hashlib
+import os
+import re
+
+import numpy as np
 import pandas as pd
 from sim.player import Player, Pitcher
 
+# CSV rate column -> outcome key used by the probability DataFrames (simulate_game)
+RENAME_MAP = {
+    "out_rate_pred": "out",
+    "so_rate_pred": "so",
+    "bb_rate_pred": "walk",
+    "hbp_rate_pred": "hbp",
+    "roe_rate_pred": "roe",
+    "single_rate_pred": "single",
+    "double_rate_pred": "double",
+    "triple_rate_pred": "triple",
+    "hr_rate_pred": "hr",
+}
+RATE_COLUMNS = tuple(RENAME_MAP)
+# Keys of Player.probs / Pitcher.probs (same order as RATE_COLUMNS)
+PROB_KEYS = ("out", "so", "bb", "hbp", "roe", "single", "double", "triple", "hr")
+
+CACHE_DIR = ".sim_cache"
+_CACHE_VERSION = 1
+
+
+class ProbRegistry:
+    """Structure-of-arrays view of one probability table (hitters or pitchers).
+
+    One entry per CSV row, in file order:
+      names, bats, pit_hand  str arrays
+      team                   str array ("" where missing; see `has_team`)
+      dra_minus              float array (NaN where missing)
+      raw                    (n, 9) rates as read, columns in RATE_COLUMNS order
+      rates                  raw normalized to sum to 1 per row
+    """
+
+    def __init__(self, kind, names, bats, pit_hand, team, team_missing, dra_minus, raw,
+                 has_team=True, has_dra=True):
+        if kind not in ("hitter", "pitcher"):
+            raise ValueError(f"kind must be 'hitter' or 'pitcher', got {kind!r}")
+        self.kind = kind
+        self.names = names
+        self.bats = bats
+        self.pit_hand = pit_hand
+        self.team = team
+        self.team_missing = team_missing
+        self.dra_minus = dra_minus
+        self.raw = raw
+        self.has_team = has_team
+        self.has_dra = has_dra
+
+        # Column-by-column sum matches the row-wise Python sum() of the old loader exactly
+        total = raw[:, 0].copy()
+        for j in range(1, raw.shape[1]):
+            total += raw[:, j]
+        self.rates = raw / total[:, None]
+
+    def __len__(self):
+        return len(self.names)
+
+    # -------------
+    # Construction
+    # -------------
+    @classmethod
+    def from_frame(cls, df, kind):
+        """Build from a raw CSV DataFrame (original *_rate_pred column names)."""
+        def text(col):
+            if col not in df.columns:
+                return np.full(len(df), "", dtype=str), np.ones(len(df), dtype=bool)
+            missing = df[col].isna().to_numpy()
+            return df[col].fillna("").astype(str).to_numpy(dtype=str), missing
+
+        team, team_missing = text("team")
+        has_dra = "dra_minus" in df.columns
+        dra = df["dra_minus"].to_numpy(dtype=float) if has_dra else np.full(len(df), np.nan)
+        return cls(
+            kind,
+            names=text("full_name")[0],
+            bats=text("bats")[0],
+            pit_hand=text("pit_hand")[0],
+            team=team,
+            team_missing=team_missing,
+            dra_minus=dra,
+            raw=df[list(RATE_COLUMNS)].to_numpy(dtype=float),
+            has_team="team" in df.columns,
+            has_dra=has_dra,
+        )
 
-def load_hitters(csv_path: str):
-    """Load hitter probabilities from CSV and return Player objects."""
-    df = pd.read_csv(csv_path)
-    players = []
-
-    for _, row in df.iterrows():
-        probs = {
-            "out": row["out_rate_pred"],
-            "so": row["so_rate_pred"],
-            "bb": row["bb_rate_pred"],
-            "hbp": row["hbp_rate_pred"],
-            "roe": row["roe_rate_pred"],
-            "single": row["single_rate_pred"],
-            "double": row["double_rate_pred"],
-            "triple": row["triple_rate_pred"],
-            "hr": row["hr_rate_pred"],
-        }
-
-        # normalize to ensure they sum to 1.0
-        total = sum(probs.values())
-        probs = {k: v / total for k, v in probs.items()}
-
-        player = Player(
-            name=row["full_name"],
-            hand=row["bats"],   # hitter batting hand
-            probs=probs,
+    def save(self, path):
+        np.savez(
+            path, version=_CACHE_VERSION, kind=self.kind, names=self.names, bats=self.bats,
+            pit_hand=self.pit_hand, team=self.team, team_missing=self.team_missing,
+            dra_minus=self.dra_minus, raw=self.raw, has_team=self.has_team, has_dra=self.has_dra,
         )
 
-        # NEW: add team info for later filtering
-        player.team = row.get("team", None)
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as z:
+            if int(z["version"]) != _CACHE_VERSION:
+                raise ValueError(f"stale registry cache {path}")
+            return cls(
+                str(z["kind"]), z["names"], z["bats"], z["pit_hand"], z["team"],
+                z["team_missing"], z["dra_minus"], z["raw"],
+                has_team=bool(z["has_team"]), has_dra=bool(z["has_dra"]),
+            )
+
+    # -------------
+    # Views
+    # -------------
+    def _teams(self):
+        if not self.has_team:
+            return [None] * len(self)
+        return [np.nan if miss else t for t, miss in zip(self.team.tolist(), self.team_missing.tolist())]
+
+    def frame(self):
+        """Probability DataFrame in the layout simulate_game reads (outcome-named rate columns)."""
+        cols = {"full_name": self.names, "pit_hand": self.pit_hand, "bats": self.bats}
+        if self.has_team:
+            cols["team"] = self._teams()
+        cols.update(zip(RENAME_MAP.values(), self.raw.T))
+        if self.has_dra:
+            cols["dra_minus"] = self.dra_minus
+        return pd.DataFrame(cols)
+
+    def players(self):
+        """Player (hitters) or Pitcher objects, one per row, with normalized probs."""
+        rates = self.rates.tolist()
+        teams = self._teams()
+        if self.kind == "hitter":
+            return [
+                Player(name=name, hand=hand, probs=dict(zip(PROB_KEYS, r)), team=team)
+                for name, hand, r, team in zip(self.names.tolist(), self.bats.tolist(), rates, teams)
+            ]
+        return [
+            Pitcher(name=name, hand=hand, probs=dict(zip(PROB_KEYS, r)), team=team)
+            for name, hand, r, team in zip(self.names.tolist(), self.pit_hand.tolist(), rates, teams)
+        ]
+
+
+def _file_hash(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()[:16]
+
+
+def load_registry(csv_path: str, kind: str, cache=True):
+    """Load a probability CSV into a ProbRegistry, via a binary cache.
+
+    The cache is an .npz in <csv dir>/.sim_cache named after the CSV and
+    the hash of its contents, so an edited file is parsed again and an
+    unchanged one skips CSV parsing. Writing a new cache removes the ones
+    for the file's earlier contents. Pass cache=False to always parse.
+    """
+    if not cache:
+        return ProbRegistry.from_frame(pd.read_csv(csv_path), kind)
+    base = os.path.splitext(os.path.basename(csv_path))[0]
+    cache_dir = os.path.join(os.path.dirname(os.path.abspath(csv_path)), CACHE_DIR)
+    path = os.path.join(cache_dir, f"{base}.{kind}.{_file_hash(csv_path)}.npz")
+    if os.path.exists(path):
+        try:
+            return ProbRegistry.load(path)
+        except (OSError, ValueError, KeyError):
+            pass  # unreadable or stale: rebuild below
+    registry = ProbRegistry.from_frame(pd.read_csv(csv_path), kind)
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp = path + ".tmp.npz"
+    registry.save(tmp)
+    os.replace(tmp, path)
+    _drop_stale_caches(cache_dir, base, kind, path)
+    return registry
+
+
+def _drop_stale_caches(cache_dir, base, kind, keep):
+    """Remove <base>.<kind>.<hash>.npz caches other than `keep`."""
+    pattern = os.path.join(glob.escape(cache_dir), f"{glob.escape(base)}.{kind}.*.npz")
+    for old in glob.glob(pattern):
+        digest = os.path.basename(old)[len(base) + len(kind) + 2:-len(".npz")]
+        if old != keep and re.fullmatch(r"[0-9a-f]{16}", digest):
+            try:
+                os.remove(old)
+            except OSError:
+                pass  # already gone (another process cleaning up)
 
-        players.append(player)
 
-    return players
+def load_hitters(csv_path: str):
+    """Load hitter probabilities from CSV and return Player objects."""
+    return load_registry(csv_path, "hitter").players()
 
 
 def load_pitchers(csv_path: str):
     """Load pitcher probabilities from CSV and return Pitcher objects."""
-    df = pd.read_csv(csv_path)
-    pitchers = []
-
-    for _, row in df.iterrows():
-        probs = {
-            "out": row["out_rate_pred"],
-            "so": row["so_rate_pred"],
-            "bb": row["bb_rate_pred"],
-            "hbp": row["hbp_rate_pred"],
-            "roe": row["roe_rate_pred"],
-            "single": row["single_rate_pred"],
-            "double": row["double_rate_pred"],
-            "triple": row["triple_rate_pred"],
-            "hr": row["hr_rate_pred"],
-        }
-
-        # normalize
-        total = sum(probs.values())
-        probs = {k: v / total for k, v in probs.items()}
-
-        pitcher = Pitcher(
-            name=row["full_name"],
-            hand=row["pit_hand"],  # pitcher throwing hand
-            probs=probs,
-        )
-
-        # NEW: attach team abbreviation (e.g., TOR / LAD)
-        pitcher.team = row.get("team", None)
-
-        pitchers.append(pitcher)
-
-    return pitchers
+    return load_registry(csv_path, "pitcher").players()
@@ -0,0 +1,227 @@
+import numpy as np
+
+from .bases import NEXT_BASES, OUTS, RUNS
+from .batch import BatchTables
+
+# -------------------------
+# Exact base-out Markov chain
+# -------------------------
+# Each offense is a chain over (cumulative PA, runs). The lineup slot is
+# PA % lineup length and the opposing pitcher comes from a fixed schedule
+# indexed by batters faced, so the two offenses are independent and can
+# be combined exactly into win probability and score distributions.
+
+MAX_RUNS = 40      # per-team run cap (mass above is lumped into the last bin)
+MAX_HALF_PA = 30   # PAs per half inning tracked before truncation
+EPS = 1e-13
+
+# Base-out transitions over the 24 live states (outs * 8 + bases); row 24 = three outs.
+# _STEP[code, r] maps live states to next states for outcomes scoring r runs.
+_STEP = np.zeros((8, 5, 25, 24))
+for _code in range(8):
+    for _s in range(24):
+        _o, _b = divmod(_s, 8)
+        _no = _o + OUTS[_code]
+        _dest = 24 if _no >= 3 else _no * 8 + NEXT_BASES[_code, _b]
+        _STEP[_code, RUNS[_code, _b], _dest, _s] = 1.0
+
+
+def pitcher_schedule(tables, team, max_bf=None, starter_bf=21, reliever_bf=4):
+    """Expected staff slot on the mound for each batter `team` faces.
+
+    The starter faces `starter_bf` batters, then each reliever faces
+    `reliever_bf`. Relievers come in the order pick_next_reliever would
+    choose them: best average DRA- against the next three hitters at the
+    change. Reserves are left out. Returns an int array with one entry per
+    batters-faced count; the last entry holds for every later batter.
+    """
+    t, opp = team, 1 - team
+    n = int(tables.lineup_len[opp])
+    bullpen = [s for s in range(tables.next3.shape[1]) if tables.bullpen_mask[t] >> s & 1]
+    changes, bf = [], starter_bf
+    while bullpen:
+        cur = (bf - 1) % n
+        slot = min(bullpen, key=lambda c: tables.next3[t, c, cur])
+        bullpen.remove(slot)
+        changes.append((bf, slot))
+        bf += reliever_bf
+    length = max_bf or (changes[-1][0] + 1 if changes else 1)
+    sched = np.zeros(length, dtype=np.int64)
+    for start, slot in changes:
+        sched[start:] = slot
+    return sched
+
+
+def _shift(dist, r):
+    """Add r runs to a distribution over runs (last axis), lumping overflow."""
+    if not r:
+        return dist
+    out = np.zeros_like(dist)
+    out[..., r:] = dist[..., : MAX_RUNS - r]
+    out[..., MAX_RUNS - 1] += dist[..., MAX_RUNS - r:].sum(axis=-1)
+    return out
+
+
+def _half_inning(probs, start):
+    """Distribution over (runs, PAs) for a half inning starting at cumulative PA `start`.
+
+    `probs[q]` is the outcome distribution for the q-th PA of the game.
+    """
+    out = np.zeros((MAX_RUNS, MAX_HALF_PA + 1))
+    live = np.zeros((24, MAX_RUNS))
+    live[0, 0] = 1.0
+    for k in range(MAX_HALF_PA):
+        step = np.tensordot(probs[min(start + k, len(probs) - 1)], _STEP, axes=1)
+        new = sum(_shift(step[r] @ live, r) for r in range(5))
+        out[:, k + 1] = new[24]
+        live = new[:24]
+        if live.sum() < EPS:
+            break
+    return out
+
+
+class _Offense:
+    """Half-inning transition kernels for one batting team.
+
+    PA counts are folded back by the lineup length once the pitcher
+    schedule is constant, so states stay within `size` PAs. `U[r]` is the
+    (start PA, end PA) transfer matrix for half innings scoring r runs.
+    """
+
+    def __init__(self, tables, team, schedule):
+        n = int(tables.lineup_len[team])
+        changes = np.flatnonzero(np.diff(schedule)) + 1
+        stable = int(changes[-1]) if len(changes) else 0
+        self.size = stable + n  # T(s) == T(s - n) for s >= size
+        q = np.arange(self.size + MAX_HALF_PA + 1)
+        pitchers = schedule[np.minimum(q, len(schedule) - 1)]
+        cdf = tables.cdf[team, q % n, pitchers]
+        probs = np.diff(cdf, prepend=0.0, axis=1)
+        T = np.array([_half_inning(probs, s) for s in range(self.size)])
+        self.runs = T.sum(axis=2)  # (start, runs)
+
+        end = np.arange(self.size)[:, None] + np.arange(MAX_HALF_PA + 1)[None, :]
+        end = np.where(end >= self.size, stable + (end - stable) % n, end)
+        self.U = np.zeros((MAX_RUNS, self.size, self.size))
+        for s in range(self.size):
+            for k in range(MAX_HALF_PA + 1):
+                self.U[:, s, end[s, k]] += T[s, :, k]
+        self.max_runs = int(np.flatnonzero(self.runs.max(axis=0) > EPS).max()) + 1
+
+    def start(self):
+        D = np.zeros((self.size, MAX_RUNS))
+        D[0, 0] = 1.0
+        return D
+
+    def inning(self, D):
+        """Advance a (PA, runs) distribution by one half inning."""
+        return sum(_shift(self.U[r].T @ D, r) for r in range(self.max_runs))
+
+
+class MarkovResult:
+    """Exact win probability and score distributions for one matchup."""
+
+    def __init__(self, names, away_win, home_win, p_extra, away_runs, home_runs, run_diff, unresolved):
+        self.names = names
+        self.away_win = away_win
+        self.home_win = home_win
+        self.p_extra = p_extra
+        self.away_runs = away_runs    # final score distribution, index = runs
+        self.home_runs = home_runs
+        self.run_diff = run_diff      # {away - home: probability}
+        self.unresolved = unresolved  # mass still tied after the last inning or truncated
+
+    @property
+    def win_prob(self):
+        """Away team's win probability (same convention as RunningSummary)."""
+        return self.away_win
+
+    def expected_runs(self):
+        r = np.arange(MAX_RUNS)
+        return {
+            self.names[0]: float(r @ self.away_runs / self.away_runs.sum()),
+            self.names[1]: float(r @ self.home_runs / self.home_runs.sum()),
+        }
+
+    def __repr__(self):
+        return (
+            f"MarkovResult({self.names[0]} @ {self.names[1]}: "
+            f"{self.names[0]} win={self.away_win:.4f}, P(extras)={self.p_extra:.4f})"
+        )
+
+
+def markov_game(team1, team2, hitter_probs, pitcher_probs, tables=None, schedules=None,
+                max_innings=30):
+    """Exact win probability and score distributions without sampling.
+
+    Uses the 24 base-out states and the same outcome transitions as
+    sim_half (sim.bases). Pitcher changes follow a fixed schedule per
+    defense (`pitcher_schedule` by default, or `schedules=(team1 staff,
+    team2 staff)` arrays of staff slots by batters faced). The home team skips the
+    bottom of the 9th when ahead, and extra innings run until a team
+    leads after a full inning.
+
+    With one-pitcher staffs the rules match simulate_game exactly, so
+    the result is a correctness oracle for the Monte Carlo engines.
+    """
+    if tables is None:
+        tables = BatchTables(team1, team2, hitter_probs, pitcher_probs)
+    if schedules is None:
+        schedules = (pitcher_schedule(tables, 0), pitcher_schedule(tables, 1))
+    # team t bats against the other team's schedule
+    away, home = _Offense(tables, 0, schedules[1]), _Offense(tables, 1, schedules[0])
+
+    A, Hm = away.start(), home.start()
+    for _ in range(8):
+        A, Hm = away.inning(A), home.inning(Hm)
+    A9, H9 = away.inning(A), home.inning(Hm)
+
+    # --- Regulation: joint final score (away, home) of games decided in 9 ---
+    a9, h8 = A9.sum(axis=0), Hm.sum(axis=0)
+    h9_joint = np.zeros((MAX_RUNS, MAX_RUNS))  # (home after 8, home after 9)
+    rows = np.arange(MAX_RUNS)
+    for r in range(home.max_runs):
+        np.add.at(h9_joint, (rows, np.minimum(rows + r, MAX_RUNS - 1)), Hm.T @ home.runs[:, r])
+    # home ahead after the top of the 9th skips its half; otherwise it bats (h8 <= a)
+    final = np.triu(a9[:, None] * h8[None, :], 1)
+    batted = a9[:, None] * np.cumsum(h9_joint, axis=0)
+    np.fill_diagonal(batted, 0.0)
+    final += batted
+
+    away_runs, home_runs = final.sum(axis=1), final.sum(axis=0)
+    diff = _diff_dist(final)
+
+    # --- Extra innings: tie state over (away PA, home PA, tied score) ---
+    M = A9[:, None, :] * H9[None, :, :]
+    p_extra = float(M.sum())
+    for _ in range(max_innings - 9):
+        if M.sum() < EPS:
+            break
+        X = away.runs.T @ M.sum(axis=2) @ home.runs  # (away runs, home runs) this inning
+        final += X * (1 - np.eye(MAX_RUNS))  # decided this inning
+        diff += _diff_dist(X) * (np.arange(-MAX_RUNS + 1, MAX_RUNS) != 0)
+        va = np.einsum("ijx,ir,jr->rx", M, away.runs, 1 - home.runs)
+        vh = np.einsum("ijx,jr,ir->rx", M, home.runs, 1 - away.runs)
+        for r in range(max(away.max_runs, home.max_runs)):
+            away_runs += _shift(va[r], r)
+            home_runs += _shift(vh[r], r)
+        new = np.zeros_like(M)
+        for r in range(min(away.max_runs, home.max_runs)):
+            tied = np.tensordot(np.tensordot(away.U[r], M, axes=([0], [0])), home.U[r], axes=([1], [0]))
+            new += _shift(tied.transpose(0, 2, 1), r)
+        M = new
+
+    away_win, home_win = float(np.tril(final, -1).sum()), float(np.triu(final, 1).sum())
+    run_diff = {int(d): float(p) for d, p in zip(range(-MAX_RUNS + 1, MAX_RUNS), diff) if p > 0}
+    return MarkovResult(
+        (team1.name, team2.name), away_win, home_win, p_extra, away_runs, home_runs,
+        run_diff, max(0.0, 1.0 - away_win - home_win),
+    )
+
+
+def _diff_dist(joint):
+    """Distribution of away - home (index d + MAX_RUNS - 1) from a joint (away, home) table."""
+    out = np.zeros(2 * MAX_RUNS - 1)
+    for d in range(-MAX_RUNS + 1, MAX_RUNS):
+        out[d + MAX_RUNS - 1] = np.trace(joint, offset=-d)
+    return out
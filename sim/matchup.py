@@ -0,0 +1,150 @@
+import bisect
+
+import numpy as np
+
+from .rng import as_block_rng
+
+# Outcome order used by every compiled table (same order simulate_pa draws from)
+OUTCOMES = ("single", "double", "triple", "hr", "walk", "so", "out", "roe")
+OUTCOME_INDEX = {o: i for i, o in enumerate(OUTCOMES)}
+
+
+# -------------------------
+# Handedness
+# -------------------------
+
+def resolve_hand(batter_hand, pitcher_hand):
+    """Switch hitters bat from the side opposite the pitcher."""
+    if batter_hand == "S":
+        return "L" if pitcher_hand == "R" else "R"
+    return batter_hand
+
+
+def matchup_cdf(h_row, p_row, blend=0.6):
+    """Cumulative hitter/pitcher distribution over OUTCOMES (`blend` = hitter weight, 60/40 by default).
+
+    Outcomes missing from either row get zero width, so a right-sided
+    search over the result picks exactly what np.random.choice would.
+    """
+    valid = [o in h_row and o in p_row for o in OUTCOMES]
+    probs = np.array(
+        [blend * h_row[o] + (1 - blend) * p_row[o] if ok else 0.0 for o, ok in zip(OUTCOMES, valid)],
+        dtype=float,
+    )
+    probs /= probs.sum()
+    cdf = probs.cumsum()
+    cdf /= cdf[-1]
+    return cdf
+
+
+# -------------------------
+# Compiled tables
+# -------------------------
+
+class MatchupTable:
+    """Dense (batter slot, pitcher slot) -> cumulative outcome distribution.
+
+    With `next3` (from next_three_dra) it also ranks relievers for
+    pick_next_reliever, memoized on (current batter slot, candidate bitmask).
+    """
+
+    def __init__(self, batters, pitchers, cdf, next3=None):
+        self.batters = list(batters)
+        self.pitchers = list(pitchers)
+        self.cdf = cdf  # shape (n_batters, n_pitchers, len(OUTCOMES))
+        self._rows = cdf.tolist()  # nested lists for fast scalar bisect
+        self.next3 = next3  # shape (n_pitchers, n_batters)
+        self._next3_rows = None if next3 is None else next3.T.tolist()
+        self._best = {}
+        self._kernel = None  # (home table, sim.kernel.KernelTables), built on first use
+
+    def draw(self, b_slot, p_slot, u):
+        """Map a uniform draw u in [0, 1) to an outcome code."""
+        return bisect.bisect_right(self._rows[b_slot][p_slot], u)
+
+    def sample(self, b_slot, p_slot, rng=None):
+        """Draw one outcome name for the given roster slots (rng: seed, Generator or BlockRNG)."""
+        return OUTCOMES[self.draw(b_slot, p_slot, as_block_rng(rng).random())]
+
+    def best_reliever(self, cur_idx, mask):
+        """(slot, avg DRA-) of the best pitcher in `mask` vs the three hitters after `cur_idx`.
+
+        Ties go to the lowest slot, as min() over the candidates in slot
+        order does. Returns (None, None) for an empty mask.
+        """
+        key = (cur_idx, mask)
+        best = self._best.get(key)
+        if best is None:
+            row = self._next3_rows[cur_idx]
+            slots = [i for i in range(len(row)) if mask >> i & 1]
+            if not slots:
+                return None, None
+            slot = min(slots, key=row.__getitem__)
+            best = self._best[key] = (slot, row[slot])
+        return best
+
+    def clear_cache(self):
+        """Forget memoized best_reliever rankings (they are rebuilt on demand)."""
+        self._best.clear()
+
+
+def compile_matchups(batters, pitchers, hitter_probs, pitcher_probs, blend=0.6):
+    """Build the MatchupTable for one lineup against one pitching staff."""
+    from .game import get_matchup_row
+
+    by_hand = {}
+    cdf = np.empty((len(batters), len(pitchers), len(OUTCOMES)), dtype=float)
+    for i, b in enumerate(batters):
+        for j, p in enumerate(pitchers):
+            key = (resolve_hand(b.hand, p.hand), p.hand)
+            if key not in by_hand:
+                h_row = get_matchup_row(hitter_probs, key[0], key[1])
+                p_row = get_matchup_row(pitcher_probs, key[0], key[1])
+                by_hand[key] = matchup_cdf(h_row, p_row, blend)
+            cdf[i, j] = by_hand[key]
+    return MatchupTable(batters, pitchers, cdf, next_three_dra(batters, pitchers, pitcher_probs))
+
+
+def compile_game(team1, team2, hitter_probs, pitcher_probs, blend=0.6):
+    """Compile both sides of a matchup once, keyed by the batting team's name.
+
+    Pitcher slots follow `Team.staff`, the same slots GameState uses.
+    """
+    return {
+        team1.name: compile_matchups(team1.lineup, team2.staff, hitter_probs, pitcher_probs, blend),
+        team2.name: compile_matchups(team2.lineup, team1.staff, hitter_probs, pitcher_probs, blend),
+    }
+
+
+# -------------------------
+# Reliever ranking inputs
+# -------------------------
+
+def dra_lookup(pitcher_probs):
+    """First dra_minus per (full_name, bats) row, as pick_next_reliever reads it."""
+    if "dra_minus" not in pitcher_probs.columns:
+        return {}
+    first = pitcher_probs.drop_duplicates(["full_name", "bats"])
+    return {
+        (name, hand): float(dra)
+        for name, hand, dra in zip(first["full_name"], first["bats"], first["dra_minus"])
+    }
+
+
+def dra_matrix(batters, pitchers, pitcher_probs):
+    """(pitcher slot, batter slot) -> pitcher's dra_minus vs that batter's hand."""
+    lookup = dra_lookup(pitcher_probs)
+    out = np.empty((len(pitchers), len(batters)), dtype=float)
+    for i, p in enumerate(pitchers):
+        default = getattr(p, "dra_minus", 100.0)
+        for j, b in enumerate(batters):
+            out[i, j] = lookup.get((p.name, b.hand), default)
+    return out
+
+
+def next_three_dra(batters, pitchers, pitcher_probs):
+    """(pitcher slot, current batter slot) -> avg dra_minus vs the next three hitters."""
+    d = dra_matrix(batters, pitchers, pitcher_probs)
+    n = len(batters)
+    idx = np.arange(n)
+    return (d[:, (idx + 1) % n] + d[:, (idx + 2) % n] + d[:, (idx + 3) % n]) / 3.0
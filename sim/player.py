@@ -1,10 +1,13 @@
 class Player:
     """Generic player class for hitters (batter data)."""
 
-    def __init__(self, name, hand, probs=None, contact=0.0, power=0.0, speed=0.0):
+    __slots__ = ("name", "hand", "probs", "contact", "power", "speed", "team")
+
+    def __init__(self, name, hand, probs=None, contact=0.0, power=0.0, speed=0.0, team=None):
         self.name = name          # full_name from DB/CSV
         self.hand = hand          # 'L', 'R', or 'S'
         self.probs = probs or {}  # dict of outcome probabilities
+        self.team = team          # team abbreviation (e.g., TOR / LAD)
 
         # Optional advanced attributes
         self.contact = contact
@@ -19,9 +22,16 @@ class Player:
 
 
 class Pitcher:
-    def __init__(self, name, hand, dra_minus=100, dra_minus_L=None, dra_minus_R=None, probs=None):
+    __slots__ = (
+        "name", "hand", "probs", "team", "dra_minus", "dra_minus_L", "dra_minus_R",
+        "ip", "er", "r", "k", "bb", "hr", "batters_faced",
+        "stamina_cap",  # optional fixed starter cap read by should_pull_pitcher
+    )
+
+    def __init__(self, name, hand, dra_minus=100, dra_minus_L=None, dra_minus_R=None, probs=None, team=None):
         self.name = name
         self.hand = hand
+        self.team = team
 
         # Probabilities (optional, e.g., for matchup-based simulation)
         self.probs = probs or {}
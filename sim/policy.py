@@ -0,0 +1,70 @@
+import hashlib
+import itertools
+import json
+from collections import namedtuple
+
+# Pitcher hook thresholds read by should_pull_pitcher, pick_next_reliever and
+# the batch engine. Ranges are inclusive; the defaults are the original rules.
+_FIELDS = {
+    # Starters
+    "early_hook_runs": 4,      # pulled with this many runs allowed ...
+    "early_hook_bf": 12,       # ... before this many batters faced
+    "mid_hook_runs": 3,        # pulled with this many runs allowed ...
+    "mid_hook_bf": 15,         # ... from this many batters faced on
+    "stamina_min": 18,         # stamina cap drawn from stamina_min..stamina_max
+    "stamina_max": 23,
+    "extend_max_runs": 2,      # at the cap with <= this many runs allowed ...
+    "extend_prob": 0.15,       # ... extend with this probability ...
+    "extend_min": 24,          # ... to a cap drawn from extend_min..extend_max
+    "extend_max": 27,
+    "starter_max_bf": 27,      # always pulled from here
+    "fatigue_bf": 19,          # per-PA pull chance from here on:
+    "fatigue_base": 0.04,      #   fatigue_base + fatigue_step * (bf - fatigue_bf)
+    "fatigue_step": 0.01,
+    # Relievers
+    "reliever_min_bf": 3,      # faces at least this many unless in emergency mode
+    "reliever_runs": 2,        # pulled with this many runs allowed
+    "traffic_runners": 2,      # pulled with this many runners on ...
+    "traffic_bf": 3,           # ... once he has faced this many
+    "entry_cap_min": 3,        # BF cap set on entry, drawn from entry_cap_min..entry_cap_max
+    "entry_cap_max": 5,
+    "reliever_cap_min": 4,     # cap drawn when should_pull_pitcher gets none
+    "reliever_cap_max": 9,
+}
+
+BullpenPolicy = namedtuple("BullpenPolicy", list(_FIELDS), defaults=list(_FIELDS.values()))
+BullpenPolicy.__doc__ = """Thresholds for pulling starters and relievers (defaults = the original rules).
+
+Immutable and hashable; derive variants with `_replace`, e.g.
+DEFAULT_POLICY._replace(stamina_min=15, stamina_max=19) for a quicker hook.
+"""
+
+DEFAULT_POLICY = BullpenPolicy()
+
+
+def policy_hash(policy):
+    """Stable short hash of a policy's values (the sweep cache key)."""
+    blob = json.dumps(policy._asdict(), sort_keys=True).encode()
+    return hashlib.sha1(blob).hexdigest()[:16]
+
+
+def policy_grid(base=DEFAULT_POLICY, **axes):
+    """Every combination of the given field values applied to `base`.
+
+    policy_grid(stamina_max=[19, 21, 23], reliever_runs=[1, 2]) -> 6 policies.
+    A comma-joined string of field names as the key varies those fields
+    together, with one tuple of values per entry:
+    policy_grid(**{"stamina_min,stamina_max": [(15, 19), (18, 23)]}).
+    """
+    keys = [k.split(",") for k in axes]
+    for name in itertools.chain.from_iterable(keys):
+        if name not in BullpenPolicy._fields:
+            raise ValueError(f"unknown policy field {name!r}")
+    grid = []
+    for combo in itertools.product(*axes.values()):
+        changes = {}
+        for names, value in zip(keys, combo):
+            values = value if len(names) > 1 else (value,)
+            changes.update(zip(names, values))
+        grid.append(base._replace(**changes))
+    return grid
@@ -0,0 +1,159 @@
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+from .boxscore import BoxscoreCollector
+from .game import HIT_STATS, PIT_STATS, simulate_game
+from .matchup import compile_game
+from .policy import DEFAULT_POLICY
+from .reweight import _PARecorder, matchups_from_probs, outcome_probs, scale_outcome
+from .rng import BlockRNG
+from .simulate import _chunk_plan, _iter_chunks
+
+# -------------------------
+# Predicates
+# -------------------------
+# A predicate takes a BoxscoreCollector and returns one bool per game. The
+# builders below return picklable partials, so they also run on workers.
+
+
+def _batting_at_least(stat, n, box):
+    return (box.hitting[:box.count, :, :, HIT_STATS.index(stat)] >= n).any(axis=(1, 2))
+
+
+def _pitching_at_least(stat, n, box):
+    return (box.pitching[:box.count, :, :, PIT_STATS.index(stat)] >= n).any(axis=(1, 2))
+
+
+def _margin_at_least(n, box):
+    score = box.score[:box.count]
+    return np.abs(score[:, 0] - score[:, 1]) >= n
+
+
+def batting_at_least(stat, n):
+    """Some batter reaches `n` of a HIT_STATS column (e.g. "HR", 4)."""
+    return partial(_batting_at_least, stat, n)
+
+
+def pitching_at_least(stat, n):
+    """Some pitcher reaches `n` of a PIT_STATS column (e.g. "K", 18)."""
+    return partial(_pitching_at_least, stat, n)
+
+
+def margin_at_least(n):
+    """Final margin of `n` runs or more."""
+    return partial(_margin_at_least, n)
+
+
+# -------------------------
+# Importance sampling
+# -------------------------
+
+def tilted_probs(team1, team2, matchups, tilt, per_batter=False):
+    """Proposal distributions for rare_event: a list of outcome_probs arrays.
+
+    `tilt` maps outcomes to rate multipliers ({"hr": 4.0}). By default one
+    proposal tilts every PA; with per_batter=True there is one proposal per
+    lineup slot of either team, tilting only that batter's PAs. The
+    per-batter mixture suits events about any single player.
+    """
+    base = outcome_probs(matchups, (team1.name, team2.name))
+
+    def apply(side=None, batter=None):
+        probs = base
+        for outcome, factor in tilt.items():
+            for s in (0, 1) if side is None else (side,):
+                probs = scale_outcome(probs, s, outcome, factor, batter)
+        return probs
+
+    if not per_batter:
+        return [apply()]
+    return [apply(side, b) for side, team in enumerate((team1, team2))
+            for b in range(len(team.lineup))]
+
+
+def _run_rare_chunk(ctx, start, count, seed_seq, output="counters", verbose=False):
+    """Play games under randomly chosen proposals; log-likelihoods per game, hits and hit boxscores."""
+    team1, team2, hitter_probs, pitcher_probs, predicate, base, proposals, policy = ctx
+    rng = BlockRNG(np.random.default_rng(seed_seq))
+    rec = _PARecorder()
+    box = BoxscoreCollector(count, team1, team2, start=start)
+    names = (team1.name, team2.name)
+    for _ in range(count):
+        k = min(int(rng.random() * len(proposals)), len(proposals) - 1)
+        box.add(*simulate_game(team1, team2, hitter_probs, pitcher_probs, verbose=verbose,
+                               matchups=proposals[k], output="counters", rng=rng, events=rec,
+                               policy=policy))
+
+    pa = np.array(rec.rows, dtype=np.int64).reshape(-1, 5)
+    probs = [outcome_probs(m, names) for m in (base, *proposals)]
+    key = np.ravel_multi_index((pa[:, 1], pa[:, 2], pa[:, 3], pa[:, 4]), probs[0].shape)
+    with np.errstate(divide="ignore"):
+        log_lik = np.stack([np.bincount(pa[:, 0], weights=np.log(p.ravel()[key]), minlength=count)
+                            for p in probs])
+    hits = np.asarray(predicate(box), dtype=bool)
+    return log_lik, hits, box.take(np.flatnonzero(hits))
+
+
+def rare_event(predicate, team1, team2, hitter_probs, pitcher_probs, tilt, per_batter=False,
+               n_games=20_000, seed=0, chunk_size=1000, workers=None, n_examples=5,
+               policy=DEFAULT_POLICY, verbose=False):
+    """Estimate P(predicate) for team1 (away) at team2 by importance sampling.
+
+    Games are played under tilted PA probabilities (see tilted_probs; or
+    pass `tilt` as a list of outcome_probs arrays) that make the event
+    common. Each game picks one proposal at random and is weighted by
+    p(game) / mean_k q_k(game) over its PAs. Hook rolls and reliever
+    choices do not depend on PA probabilities, so they cancel and the
+    estimate is unbiased for the untilted model.
+
+    `predicate(box)` gets a chunk's BoxscoreCollector and returns one bool
+    per game (see batting_at_least, pitching_at_least, margin_at_least;
+    pass module-level functions when using workers).
+
+    Returns a dict with probability, se, rel_error, games, hits (games
+    meeting the event under the proposal), ess (effective sample size of
+    the hits' weights) and `examples`: to_frames() of up to n_examples hit
+    games, highest weight (most typical of the real model) first, with the
+    weights in examples["weights"].
+    """
+    matchups = compile_game(team1, team2, hitter_probs, pitcher_probs)
+    names = (team1.name, team2.name)
+    if isinstance(tilt, dict):
+        tilt = tilted_probs(team1, team2, matchups, tilt, per_batter)
+    proposals = [matchups_from_probs(matchups, names, p) for p in tilt]
+    ctx = (team1, team2, hitter_probs, pitcher_probs, predicate, matchups, proposals, policy)
+
+    log_w, hits, boxes = [], [], []
+    plan = _chunk_plan(seed, chunk_size, n_games, output="counters")
+    for k, (log_lik, hit, box) in enumerate(_iter_chunks(ctx, plan, workers, runner=_run_rare_chunk)):
+        log_q = np.logaddexp.reduce(log_lik[1:], axis=0) - np.log(len(proposals))
+        log_w.append(log_lik[0] - log_q)
+        hits.append(hit)
+        boxes.append(box)
+        if verbose:
+            print(f"🎲 rare event: {min((k + 1) * chunk_size, n_games):,}/{n_games:,} games, "
+                  f"{sum(h.sum() for h in hits):,} hits")
+
+    hit = np.concatenate(hits)
+    w = np.exp(np.concatenate(log_w)) * hit
+    n = len(w)
+    p = w.mean()
+    se = w.std(ddof=1) / np.sqrt(n) if n > 1 else np.nan
+    hit_w = w[hit]
+    examples = {}
+    if hit.any():
+        top = np.argsort(-hit_w, kind="stable")[:n_examples]
+        box = BoxscoreCollector.concat([b for b in boxes if b.count]).take(top)
+        examples = box.to_frames()
+        examples["weights"] = pd.DataFrame({"game_id": box.game_ids(), "weight": hit_w[top]})
+    return {
+        "probability": p,
+        "se": se,
+        "rel_error": se / p if p > 0 else np.inf,
+        "games": n,
+        "hits": int(hit.sum()),
+        "ess": hit_w.sum() ** 2 / np.square(hit_w).sum() if hit_w.sum() > 0 else 0.0,
+        "examples": examples,
+    }
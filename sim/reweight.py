@@ -0,0 +1,253 @@
+import numpy as np
+import pandas as pd
+
+from .game import get_matchup_row, simulate_game
+from .matchup import OUTCOME_INDEX, OUTCOMES, MatchupTable, compile_game, matchup_cdf, resolve_hand
+from .policy import DEFAULT_POLICY
+from .rng import BlockRNG
+from .simulate import _chunk_plan, _iter_chunks
+
+
+class _PARecorder:
+    """simulate_game `events` sink keeping (game, half, batter, pitcher, outcome) per PA."""
+
+    def __init__(self):
+        self.rows = []
+        self.n_games = 0
+
+    def begin_game(self):
+        self.n_games += 1
+        return self.n_games - 1
+
+    def record(self, game, inning, half, batter, pitcher, code, *state):
+        self.rows.append((game, half, batter, pitcher, code))
+
+    def entry(self, *args):
+        pass
+
+
+def outcome_probs(matchups, names):
+    """Per-PA outcome probabilities as one array [batting side, batter slot, pitcher slot, outcome].
+
+    `matchups` is a compile_game dict; side 0 is names[0] batting. Teams
+    with shorter lineups or staffs are zero-padded.
+    """
+    tables = [matchups[name] for name in names]
+    shape = (2, max(len(t.batters) for t in tables), max(len(t.pitchers) for t in tables),
+             len(OUTCOMES))
+    probs = np.zeros(shape)
+    for side, t in enumerate(tables):
+        probs[side, :len(t.batters), :len(t.pitchers)] = np.diff(t.cdf, axis=-1, prepend=0.0)
+    return probs
+
+
+def matchups_from_probs(matchups, names, probs):
+    """compile_game-style tables drawing from `probs`, keeping `matchups`' reliever ranking."""
+    out = {}
+    for side, name in enumerate(names):
+        t = matchups[name]
+        cdf = probs[side, :len(t.batters), :len(t.pitchers)].cumsum(axis=-1)
+        cdf /= cdf[..., -1:]
+        out[name] = MatchupTable(t.batters, t.pitchers, cdf, t.next3)
+    return out
+
+
+def scale_outcome(probs, side, outcome, factor, batter=None, pitcher=None):
+    """Copy of `probs` with one outcome scaled by `factor` when `side` bats, renormalized.
+
+    `batter` / `pitcher` (slots) limit it to one hitter or one arm.
+    """
+    probs = probs.copy()
+    b = slice(None) if batter is None else batter
+    p = slice(None) if pitcher is None else pitcher
+    block = probs[side, b, p]
+    block[..., OUTCOME_INDEX[outcome]] *= factor
+    total = block.sum(axis=-1, keepdims=True)
+    probs[side, b, p] = np.divide(block, total, out=np.zeros_like(block), where=total > 0)
+    return probs
+
+
+def _run_baseline_chunk(ctx, start, count, seed_seq, output="score", verbose=False):
+    """Play games start..start+count, keeping final scores and every PA's draw."""
+    team1, team2, hitter_probs, pitcher_probs, matchups, policy = ctx
+    rng = BlockRNG(np.random.default_rng(seed_seq))
+    rec = _PARecorder()
+    scores = np.empty((count, 2), dtype=np.int32)
+    for g in range(count):
+        score = simulate_game(team1, team2, hitter_probs, pitcher_probs, verbose=verbose,
+                              matchups=matchups, output="score", rng=rng, events=rec, policy=policy)
+        scores[g] = score[team1.name], score[team2.name]
+    pa = np.array(rec.rows, dtype=np.int32).reshape(-1, 5)
+    pa[:, 0] += start
+    return scores, pa
+
+
+def _slot(players, who):
+    """Index of `who` (a slot number or a player name) in a lineup or staff."""
+    if isinstance(who, (int, np.integer)):
+        if not 0 <= who < len(players):
+            raise ValueError(f"slot {who} out of range")
+        return int(who)
+    for i, p in enumerate(players):
+        if p.name == who:
+            return i
+    raise ValueError(f"{who!r} not found")
+
+
+class Baseline:
+    """One recorded baseline run that can be reweighted toward perturbed PA probabilities.
+
+    Holds each game's final score and every PA's (game, batting side,
+    batter slot, pitcher slot, outcome) with the probability the baseline
+    drew it at. A perturbed model that only changes PA outcome
+    probabilities gives every recorded game a likelihood ratio of
+    prod(p_new / p_base) over its PAs: hook rolls and reliever choices
+    depend on the game state alone, so they cancel. Weighted by those
+    ratios, the baseline games estimate win probability and run
+    distributions under the new model without simulating it.
+    """
+
+    def __init__(self, team1, team2, hitter_probs, pitcher_probs, matchups, scores, pa):
+        self.teams = (team1, team2)
+        self.names = (team1.name, team2.name)
+        self.hitter_probs = hitter_probs
+        self.pitcher_probs = pitcher_probs
+        self.matchups = matchups
+        self.scores = scores
+        self.pa = pa
+        self.probs = outcome_probs(matchups, self.names)
+        self._key = np.ravel_multi_index((pa[:, 1], pa[:, 2], pa[:, 3], pa[:, 4]), self.probs.shape)
+        self._log_p = np.log(self.probs.ravel()[self._key])
+
+    @property
+    def n_games(self):
+        return len(self.scores)
+
+    # -------------------------
+    # Perturbed probabilities
+    # -------------------------
+
+    def blended(self, blend):
+        """Outcome probabilities with hitter weight `blend` instead of 0.6."""
+        return outcome_probs(compile_game(*self.teams, self.hitter_probs, self.pitcher_probs, blend),
+                             self.names)
+
+    def scaled(self, team, outcome, factor, batter=None, pitcher=None, probs=None):
+        """Scale one outcome's rate by `factor` when `team` bats, then renormalize.
+
+        `batter` (lineup slot or name) limits it to one hitter, `pitcher`
+        (opposing staff slot or name) to one arm. Starts from `probs`
+        (default: the baseline), so perturbations can be chained.
+        """
+        side = self.names.index(team)
+        if batter is not None:
+            batter = _slot(self.teams[side].lineup, batter)
+        if pitcher is not None:
+            pitcher = _slot(self.teams[1 - side].staff, pitcher)
+        return scale_outcome(self.probs if probs is None else probs, side, outcome, factor,
+                             batter, pitcher)
+
+    def with_pitcher_rates(self, team, pitcher, rates, blend=0.6, probs=None):
+        """Give `team`'s staff slot `pitcher` new per-outcome rates (a pitcher_probs-style row).
+
+        Models a different arm in that bullpen role. The reliever ranking
+        (dra_minus) is unchanged, so he is used exactly when the original
+        arm was.
+        """
+        side = 1 - self.names.index(team)
+        probs = (self.probs if probs is None else probs).copy()
+        staff = self.teams[1 - side].staff
+        j = _slot(staff, pitcher)
+        arm = staff[j]
+        for i, b in enumerate(self.teams[side].lineup):
+            hand = resolve_hand(b.hand, arm.hand)
+            h_row = get_matchup_row(self.hitter_probs, hand, arm.hand)
+            probs[side, i, j] = np.diff(matchup_cdf(h_row, rates, blend), prepend=0.0)
+        return probs
+
+    # -------------------------
+    # Estimates
+    # -------------------------
+
+    def _as_probs(self, target):
+        if isinstance(target, dict):
+            for name in self.names:
+                new, old = target[name].next3, self.matchups[name].next3
+                if (new is None) != (old is None) or (old is not None and not np.array_equal(new, old)):
+                    raise ValueError(f"{name} reliever ranking differs from the baseline; "
+                                     "reweighting needs identical pitching decisions")
+            target = outcome_probs(target, self.names)
+        if target.shape != self.probs.shape:
+            raise ValueError(f"expected probabilities of shape {self.probs.shape}, got {target.shape}")
+        return target
+
+    def weights(self, target):
+        """Self-normalized likelihood-ratio weight per game (sums to 1).
+
+        `target` is an outcome_probs-shaped array (from blended, scaled,
+        with_pitcher_rates) or a compile_game dict.
+        """
+        probs = self._as_probs(target)
+        with np.errstate(divide="ignore"):
+            log_ratio = np.log(probs.ravel()[self._key]) - self._log_p
+        log_w = np.bincount(self.pa[:, 0], weights=log_ratio, minlength=self.n_games)
+        if np.isneginf(log_w).all():
+            raise ValueError("every baseline game is impossible under the target probabilities")
+        w = np.exp(log_w - log_w.max())
+        return w / w.sum()
+
+    def estimate(self, target=None, max_runs=15):
+        """Win probability, runs and run distributions under `target` (None = the baseline itself).
+
+        Returns a dict with win_prob (names[0] winning) and its standard
+        error, mean runs per team, `run_dist` (P(runs) per team, the last
+        row being max_runs or more) and the effective sample size
+        ess = 1 / sum(w^2). Estimates resting on an ess of a few hundred
+        games or less are noisy; perturb less or record more games.
+        """
+        w = np.full(self.n_games, 1 / self.n_games) if target is None else self.weights(target)
+        ess = 1 / np.square(w).sum()
+        won = (self.scores[:, 0] > self.scores[:, 1]).astype(float)
+        win = w @ won
+        runs = np.minimum(self.scores, max_runs)
+        return {
+            "win_prob": win,
+            "win_prob_se": np.sqrt(np.square(w) @ np.square(won - win)),
+            f"{self.names[0]}_runs": w @ self.scores[:, 0],
+            f"{self.names[1]}_runs": w @ self.scores[:, 1],
+            "run_dist": pd.DataFrame(
+                {name: np.bincount(runs[:, t], weights=w, minlength=max_runs + 1)
+                 for t, name in enumerate(self.names)},
+                index=pd.Index(range(max_runs + 1), name="runs"),
+            ),
+            "ess": ess,
+            "ess_share": ess / self.n_games,
+        }
+
+    def compare(self, scenarios):
+        """One row per scenario (name -> target), plus the baseline, without the run distributions."""
+        rows = {"baseline": self.estimate()}
+        rows.update((name, self.estimate(target)) for name, target in scenarios.items())
+        df = pd.DataFrame([{k: v for k, v in est.items() if k != "run_dist"} for est in rows.values()],
+                          index=pd.Index(list(rows), name="scenario"))
+        return df
+
+
+def record_baseline(team1, team2, hitter_probs, pitcher_probs, n_games=20_000, seed=0,
+                    chunk_size=1000, workers=None, policy=DEFAULT_POLICY, verbose=False):
+    """Play n_games of team1 (away) at team2 once, recording every PA draw, for reweighting.
+
+    Games are the ones run_simulations plays with the same seed and
+    chunk_size, spread over `workers` processes.
+    """
+    matchups = compile_game(team1, team2, hitter_probs, pitcher_probs)
+    ctx = (team1, team2, hitter_probs, pitcher_probs, matchups, policy)
+    scores, pa = [], []
+    plan = _chunk_plan(seed, chunk_size, n_games)
+    for s, p in _iter_chunks(ctx, plan, workers, runner=_run_baseline_chunk):
+        scores.append(s)
+        pa.append(p)
+        if verbose:
+            print(f"🎯 baseline: {sum(map(len, scores)):,}/{n_games:,} games recorded")
+    return Baseline(team1, team2, hitter_probs, pitcher_probs, matchups,
+                    np.concatenate(scores), np.concatenate(pa))
@@ -0,0 +1,111 @@
+import os
+
+import numpy as np
+
+
+class BlockRNG:
+    """Scalar uniforms from a numpy Generator, served from prefilled blocks.
+
+    simulate_game draws a handful of scalars per PA (outcome, pull
+    decisions); pulling them one at a time from a Generator costs far
+    more than the draw itself, so uniforms are generated `block_size` at
+    a time and handed out from a list. The stream is a pure function of
+    the Generator's seed.
+    """
+
+    __slots__ = ("generator", "block_size", "_buf", "_pos", "_arr")
+
+    def __init__(self, generator=None, block_size=4096):
+        if not isinstance(generator, np.random.Generator):
+            generator = np.random.default_rng(generator)
+        self.generator = generator
+        self.block_size = block_size
+        self._buf = []
+        self._pos = 0
+        self._arr = None  # unread uniforms while a kernel reads the stream as an array
+
+    def random(self):
+        """One uniform in [0, 1)."""
+        if self._pos >= len(self._buf):
+            if self._arr is not None:
+                self._leave_array()
+            if self._pos >= len(self._buf):
+                self._buf = self.generator.random(self.block_size).tolist()
+                self._pos = 0
+        u = self._buf[self._pos]
+        self._pos += 1
+        return u
+
+    def randint(self, a, b):
+        """Integer in [a, b], both inclusive (like random.randint)."""
+        return a + int(self.random() * (b - a + 1))
+
+    def window(self, n, array=False):
+        """(buffer, start) holding at least the next `n` uniforms, without consuming them.
+
+        For kernels that read the stream directly: they draw buffer[start],
+        buffer[start + 1], ... and hand the position they stopped at to
+        advance(). A list by default, a numpy array with array=True; the
+        array stays the buffer until the next list or scalar draw, so
+        back-to-back array windows never round-trip through a list.
+        """
+        if not array:
+            if self._arr is not None:
+                self._leave_array()
+            if len(self._buf) - self._pos < n:
+                rest = self._buf[self._pos:]
+                self._buf = rest + self.generator.random(max(self.block_size, n - len(rest))).tolist()
+                self._pos = 0
+            return self._buf, self._pos
+        if self._arr is None:
+            self._arr = np.array(self._buf[self._pos:], dtype=float)
+            self._buf = []
+            self._pos = 0
+        if len(self._arr) - self._pos < n:
+            rest = self._arr[self._pos:]
+            fresh = self.generator.random(max(self.block_size, n - len(rest)))
+            self._arr = np.concatenate([rest, fresh])
+            self._pos = 0
+        return self._arr, self._pos
+
+    def _leave_array(self):
+        """Back to list draws: the unread part of the array becomes the buffer."""
+        self._buf = self._arr[self._pos:].tolist()
+        self._pos = 0
+        self._arr = None
+
+    def advance(self, pos):
+        """Consume the window up to buffer position `pos`."""
+        self._pos = pos
+
+
+_DEFAULT = None
+
+
+def default_block_rng():
+    """Process-wide unseeded BlockRNG, created on first use (what rng=None draws from)."""
+    global _DEFAULT
+    if _DEFAULT is None:
+        _DEFAULT = BlockRNG()
+    return _DEFAULT
+
+
+def _reset_default():
+    global _DEFAULT
+    _DEFAULT = None
+
+
+# A forked child must not replay its parent's unseeded stream
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_default)
+
+
+def as_block_rng(rng=None):
+    """Accept a BlockRNG, numpy Generator, SeedSequence, int seed or None.
+
+    None shares default_block_rng(), so one-off draws don't each build a
+    Generator and a fresh block.
+    """
+    if rng is None:
+        return default_block_rng()
+    return rng if isinstance(rng, BlockRNG) else BlockRNG(rng)
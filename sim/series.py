@@ -0,0 +1,200 @@
+import numpy as np
+import pandas as pd
+
+from .game import P_BF, simulate_game
+from .matchup import compile_game
+from .rng import BlockRNG
+from .simulate import _chunk_plan, _iter_chunks
+from .team import Team
+
+# World Series 2-3-2 format: team1 (home field) hosts games 1, 2, 6 and 7,
+# with travel days after games 2 and 5.
+HOME_PATTERN = (1, 1, 0, 0, 0, 1, 1)  # 1 = team1 at home
+GAME_DAYS = (0, 1, 3, 4, 5, 7, 8)
+NEVER = -10**6  # "last pitched" day for arms that have not pitched yet
+
+
+class SeriesPlan:
+    """Read-only setup shared by every replicate of one series.
+
+    The rotations turn over in order, skipping an arm with fewer than
+    `starter_rest` days of rest since his last start (see pick_starter).
+    The rest of each team's bullpen (minus every rotation arm and the
+    Team's own starter) relieves, and reserves stay reserves. Per-game
+    Team views and compiled matchups are built once per (starters, home
+    team) combination.
+
+    Bullpen fatigue carries over by calendar day: a reliever who pitched
+    yesterday sits today if he faced `heavy_bf` or more batters, or if
+    that was his `max_consecutive`-th day in a row. Fatigue lives in
+    per-series arrays, not in the shared Pitcher objects
+    (Pitcher.batters_faced / fatigue() stay untouched), so replicates
+    never share state.
+    """
+
+    def __init__(self, team1, team2, hitter_probs, pitcher_probs, rotations=None,
+                 home_pattern=HOME_PATTERN, days=GAME_DAYS, heavy_bf=8, max_consecutive=2,
+                 starter_rest=4):
+        if len(days) != len(home_pattern):
+            raise ValueError("days and home_pattern must have one entry per game")
+        self.teams = (team1, team2)
+        self.hitter_probs = hitter_probs
+        self.pitcher_probs = pitcher_probs
+        rotations = rotations or ((team1.starter,), (team2.starter,))
+        self.rotations = tuple(tuple(r) for r in rotations)
+        if any(not r for r in self.rotations):
+            raise ValueError("each rotation needs at least one starter")
+        self.home_pattern = tuple(home_pattern)
+        self.days = tuple(days)
+        self.wins_needed = len(home_pattern) // 2 + 1
+        self.heavy_bf = heavy_bf
+        self.max_consecutive = max_consecutive
+        self.starter_rest = starter_rest
+
+        # Series staff per team: rotation, then relievers, then reserves
+        self.relievers, self.reserves, self.staffs = [], [], []
+        for team, rotation in zip(self.teams, self.rotations):
+            starters = set(map(id, rotation)) | {id(team.starter)}
+            relievers = tuple(p for p in team.bullpen if id(p) not in starters)
+            reserves = tuple(p for p in team.reserves if id(p) not in starters)
+            self.relievers.append(relievers)
+            self.reserves.append(reserves)
+            self.staffs.append(tuple(dict.fromkeys(rotation + relievers + reserves)))
+        self._games = {}
+
+    def pick_starter(self, t, next_up, last_start, day):
+        """Rotation index of team t's starter on `day`.
+
+        The first arm from `next_up` on (in rotation order) with more than
+        `starter_rest` days since his last start in `last_start`; if none is
+        rested, the one whose last start is longest ago.
+        """
+        n = len(self.rotations[t])
+        order = [(next_up + k) % n for k in range(n)]
+        for i in order:
+            if day - last_start[i] > self.starter_rest:
+                return i
+        return min(order, key=lambda i: last_start[i])
+
+    def game(self, g, starters=None):
+        """(away Team, home Team, matchups, away slot map, home slot map) for game index g.
+
+        `starters` holds each team's rotation index (default: game g of a
+        strict rotation). A slot map takes the game Team's staff slots to
+        series staff indexes.
+        """
+        if starters is None:
+            starters = tuple(g % len(r) for r in self.rotations)
+        key = tuple(starters) + (self.home_pattern[g],)
+        if key not in self._games:
+            views = []
+            for t, team in enumerate(self.teams):
+                starter = self.rotations[t][starters[t]]
+                view = Team(team.name, team.lineup, (starter,) + self.relievers[t], self.reserves[t])
+                index = {id(p): i for i, p in enumerate(self.staffs[t])}
+                views.append((view, np.array([index[id(p)] for p in view.staff])))
+            away, home = (views[1], views[0]) if self.home_pattern[g] else views
+            matchups = compile_game(away[0], home[0], self.hitter_probs, self.pitcher_probs)
+            self._games[key] = (away[0], home[0], matchups, away[1], home[1])
+        return self._games[key]
+
+
+def _run_series_chunk(plan, start, count, seed_seq, output=None, verbose=False):
+    """Play `count` series on the chunk's own stream; returns compact per-series arrays.
+
+    Per-series state is a few (2, series staff) arrays: last day pitched,
+    batters faced that day, and consecutive days pitched; plus each
+    rotation's last start days and next arm up.
+    """
+    rng = BlockRNG(np.random.default_rng(seed_seq))
+    n_games = len(plan.home_pattern)
+    n_staff = max(len(s) for s in plan.staffs)
+    n_rotation = max(len(r) for r in plan.rotations)
+    wins = np.zeros((count, 2), dtype=np.int16)
+    runs = np.full((count, n_games, 2), -1, dtype=np.int16)  # [series, game, team1/team2]
+
+    for s in range(count):
+        last_day = np.full((2, n_staff), NEVER)
+        last_bf = np.zeros((2, n_staff), dtype=np.int64)
+        streak = np.zeros((2, n_staff), dtype=np.int64)
+        last_start = np.full((2, n_rotation), NEVER)
+        next_up = [0, 0]
+        for g in range(n_games):
+            day = plan.days[g]
+            starters = tuple(plan.pick_starter(t, next_up[t], last_start[t], day) for t in (0, 1))
+            for t, i in enumerate(starters):
+                last_start[t, i] = day
+                next_up[t] = (i + 1) % len(plan.rotations[t])
+            away, home, matchups, away_map, home_map = plan.game(g, starters)
+            # team index (0 = team1) of the away / home side
+            sides = ((1, away, away_map), (0, home, home_map)) if plan.home_pattern[g] else \
+                ((0, away, away_map), (1, home, home_map))
+
+            tired = (last_day == day - 1) & ((last_bf >= plan.heavy_bf) | (streak >= plan.max_consecutive))
+            unavailable = {}
+            for t, team, slots in sides:
+                rest = np.flatnonzero(tired[t, slots])
+                unavailable[team.name] = sum(1 << int(i) for i in rest if i)
+
+            score, counters = simulate_game(
+                away, home, plan.hitter_probs, plan.pitcher_probs, verbose=verbose,
+                matchups=matchups, output="counters", rng=rng, unavailable=unavailable,
+            )
+
+            for side, (t, team, slots) in enumerate(sides):
+                bf = counters["pitching"][side, : len(slots), P_BF]
+                pitched = slots[bf > 0]
+                streak[t, pitched] = np.where(last_day[t, pitched] == day - 1, streak[t, pitched] + 1, 1)
+                last_day[t, pitched] = day
+                last_bf[t, pitched] = bf[bf > 0]
+                runs[s, g, t] = score[team.name]
+            wins[s, 0 if runs[s, g, 0] > runs[s, g, 1] else 1] += 1
+            if wins[s].max() >= plan.wins_needed:
+                break
+    return wins, runs
+
+
+def simulate_series(n_series, team1, team2, hitter_probs, pitcher_probs, rotations=None,
+                    workers=None, seed=None, chunk_size=100, verbose=False, **plan_options):
+    """Simulate `n_series` best-of-seven series (team1 has home field).
+
+    `rotations=(team1 starters, team2 starters)` sets the starting order;
+    by default each Team's starter pitches every game. Other keyword
+    options go to SeriesPlan (home_pattern, days, heavy_bf, max_consecutive,
+    starter_rest).
+    Replicates run in chunks seeded from SeedSequence(seed), optionally on
+    `workers` processes, with identical results for any worker count.
+
+    Returns one row per series: series_id, each team's wins, games, winner,
+    plus runs per game as g1_<team>, g1_<other team>, ... (-1 = not played).
+    """
+    plan = SeriesPlan(team1, team2, hitter_probs, pitcher_probs, rotations=rotations, **plan_options)
+    parts = list(_iter_chunks(plan, _chunk_plan(seed, chunk_size, n_series), workers, verbose,
+                              runner=_run_series_chunk))
+    wins = np.concatenate([w for w, _ in parts])
+    runs = np.concatenate([r for _, r in parts])
+
+    names = (team1.name, team2.name)
+    df = pd.DataFrame({
+        "series_id": [f"Series_{i + 1}" for i in range(len(wins))],
+        names[0]: wins[:, 0],
+        names[1]: wins[:, 1],
+        "games": wins.sum(axis=1),
+        "winner": np.where(wins[:, 0] > wins[:, 1], names[0], names[1]),
+    })
+    for g in range(runs.shape[1]):
+        for t, name in enumerate(names):
+            df[f"g{g + 1}_{name}"] = runs[:, g, t]
+    return df
+
+
+def series_summary(df, team1, team2):
+    """Series win probability and length distribution from simulate_series output."""
+    names = (team1.name, team2.name)
+    length = pd.crosstab(df["games"], df["winner"], normalize=False) / len(df)
+    length = length.reindex(columns=list(names), fill_value=0.0)
+    length["total"] = length.sum(axis=1)
+    return {
+        "win_prob": {n: float((df["winner"] == n).mean()) for n in names},
+        "length": length,
+    }
@@ -0,0 +1,410 @@
+"""Long-running simulation service: tables loaded once, compiled rosters kept warm.
+
+    python -m sim.service --hitters data/hitter_probs.csv --pitchers data/pitcher_probs.csv
+                          [--port 8765 | --unix /tmp/sim.sock] [--workers 4] [--cache-size 32]
+
+Requests and replies are newline-delimited JSON. A request is
+
+    {"id": 1, "kind": "win_prob" | "score_dist", "away": ROSTER, "home": ROSTER,
+     "n_games": 20000, "seed": 0, "policy": {<BullpenPolicy fields>}}
+
+with ROSTER = {"name": ..., "lineup": [hitter names], "bullpen": [starter,
+relievers ...], "reserves": [...]}. The reply is a stream of objects carrying
+the request's id: a partial result after every finished chunk ("done": false),
+then the final one ("done": true), or {"id": ..., "error": ...}.
+"""
+import argparse
+import asyncio
+import json
+import sys
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+
+import numpy as np
+
+from .batch import BatchState, BatchTables, run_batch
+from .load_data import load_registry
+from .policy import BullpenPolicy
+from .team import Team
+
+KINDS = ("win_prob", "score_dist")
+
+
+class _Rosters:
+    """Probability tables plus an LRU of compiled BatchTables keyed by roster key pair.
+
+    One lives in the service and one in each worker process, so a worker
+    compiles a roster pair once and chunks only carry its key.
+    """
+
+    def __init__(self, hitters_csv, pitchers_csv, cache_size=32):
+        hitter_reg = load_registry(hitters_csv, "hitter")
+        pitcher_reg = load_registry(pitchers_csv, "pitcher")
+        self.hitter_probs = hitter_reg.frame()
+        self.pitcher_probs = pitcher_reg.frame()
+        # First row per name, as simulate_game's lookups see it
+        self.hitters = {}
+        for p in hitter_reg.players():
+            self.hitters.setdefault(p.name, p)
+        self.pitchers = {}
+        for p in pitcher_reg.players():
+            self.pitchers.setdefault(p.name, p)
+        self.cache_size = cache_size
+        self._compiled = OrderedDict()
+        self._lock = threading.Lock()  # the single-thread pool shares the service's instance
+
+    def team(self, key):
+        """Team from a roster key: (name, lineup, bullpen, reserves) player names."""
+        name, lineup, bullpen, reserves = key
+
+        def look(table, names, role):
+            missing = [n for n in names if n not in table]
+            if missing:
+                raise ValueError(f"{name}: unknown {role} {', '.join(missing)}")
+            return [table[n] for n in names]
+
+        return Team(name, look(self.hitters, lineup, "hitter"), look(self.pitchers, bullpen, "pitcher"),
+                    look(self.pitchers, reserves, "pitcher"))
+
+    def tables(self, key):
+        """(BatchTables, cache hit) for an (away, home) pair of roster keys."""
+        with self._lock:
+            tables = self._compiled.get(key)
+            if tables is not None:
+                self._compiled.move_to_end(key)
+                return tables, True
+        tables = BatchTables(self.team(key[0]), self.team(key[1]), self.hitter_probs, self.pitcher_probs)
+        with self._lock:
+            self._compiled[key] = tables
+            if len(self._compiled) > self.cache_size:
+                self._compiled.popitem(last=False)
+        return tables, False
+
+
+_WORKER_ROSTERS = None
+
+
+def _init_service_worker(hitters_csv, pitchers_csv, cache_size):
+    """Process-pool initializer: load the probability tables once per worker."""
+    global _WORKER_ROSTERS
+    _WORKER_ROSTERS = _Rosters(hitters_csv, pitchers_csv, cache_size)
+
+
+def _play_chunk(rosters, key, policy, count, seed_seq):
+    """Final (away, home) scores of `count` batch games of roster pair `key`."""
+    tables, _ = rosters.tables(key)
+    state = run_batch(BatchState(count, tables), tables, np.random.default_rng(seed_seq),
+                      policy=policy)
+    return state.score
+
+
+def _run_service_chunk(key, policy, count, seed_seq):
+    """_play_chunk on this worker process's own roster cache."""
+    return _play_chunk(_WORKER_ROSTERS, key, policy, count, seed_seq)
+
+
+class _Run:
+    """Running tallies of one simulation, shared by every identical request."""
+
+    def __init__(self, names, n_games, max_runs):
+        self.names = names
+        self.n_games = n_games
+        self.games = 0
+        self.away_wins = 0
+        self.runs = np.zeros(2)
+        self.hist = np.zeros((2, max_runs + 1), dtype=np.int64)  # last bin = max_runs or more
+        self.done = False
+        self.error = None
+        self.listeners = []
+
+    def add(self, scores):
+        self.games += len(scores)
+        self.away_wins += int((scores[:, 0] > scores[:, 1]).sum())
+        self.runs += scores.sum(axis=0)
+        top = self.hist.shape[1] - 1
+        for t in (0, 1):
+            self.hist[t] += np.bincount(np.minimum(scores[:, t], top), minlength=top + 1)
+        self.publish()
+
+    def finish(self, error=None):
+        self.done, self.error = True, error
+        self.publish()
+
+    def publish(self):
+        for queue in self.listeners:
+            queue.put_nowait(self.done)
+
+    def payload(self, kind):
+        out = {"games": self.games, "n_games": self.n_games, "done": self.done}
+        if not self.games:
+            return out
+        if kind == "win_prob":
+            win = self.away_wins / self.games
+            out["win_prob"] = win
+            out["win_prob_se"] = float(np.sqrt(win * (1 - win) / self.games))
+            out["runs"] = dict(zip(self.names, (self.runs / self.games).tolist()))
+        else:
+            out["runs"] = dict(zip(self.names, (self.hist / self.games).tolist()))
+        return out
+
+
+class SimService:
+    """Simulation server state: probability tables, compiled-roster LRU and in-flight runs.
+
+    Rosters are compiled into BatchTables once per (away, home) roster pair
+    and kept in an LRU of `cache_size` entries; a cold pair compiles on a
+    thread, shared by every request waiting for it. With `workers` > 1 each
+    worker process loads the tables once at startup and keeps its own
+    LRU, so chunks carry only the roster key. Identical requests (same
+    rosters, n_games, seed and policy) share one run: a request arriving
+    mid-run sees the tallies so far and then every later update, and
+    finished results stay in a second LRU. Chunk k of a run plays on the
+    k-th child of SeedSequence(seed) on the worker pool, so results do not
+    depend on `workers` or on who asked first.
+    """
+
+    def __init__(self, hitters_csv, pitchers_csv, workers=None, cache_size=32,
+                 result_cache_size=256, chunk_size=5000, max_runs=15):
+        self.rosters = _Rosters(hitters_csv, pitchers_csv, cache_size)
+        self.hitters, self.pitchers = self.rosters.hitters, self.rosters.pitchers
+
+        self.workers = workers or 1
+        if self.workers > 1:
+            # Each worker loads the tables once and keeps its own compiled-roster LRU
+            self.pool = ProcessPoolExecutor(self.workers, initializer=_init_service_worker,
+                                            initargs=(hitters_csv, pitchers_csv, cache_size))
+            self._chunk = _run_service_chunk
+        else:
+            self.pool = ThreadPoolExecutor(1)
+            self._chunk = partial(_play_chunk, self.rosters)
+        # Cold rosters compile off the event loop; in-flight compiles are shared by key
+        self._compiler = ThreadPoolExecutor(1)
+        self._compiling = {}
+        self.cache_size = cache_size
+        self.result_cache_size = result_cache_size
+        self.chunk_size = chunk_size
+        self.max_runs = max_runs
+        self._results = OrderedDict()
+        self._runs = {}
+        self.stats = {"requests": 0, "compiled": 0, "compile_hits": 0, "coalesced": 0,
+                      "result_hits": 0}
+
+    # -------------------------
+    # Rosters
+    # -------------------------
+
+    def team(self, spec):
+        """Team from a ROSTER dict of player names."""
+        return self.rosters.team(_roster_key(spec))
+
+    def compiled(self, away, home):
+        """(roster key pair, BatchTables) for an (away, home) ROSTER pair, from the LRU when warm.
+
+        Compiling here also checks every player name before a run starts.
+        """
+        key = _roster_key(away), _roster_key(home)
+        tables, hit = self.rosters.tables(key)
+        self.stats["compile_hits" if hit else "compiled"] += 1
+        return key, tables
+
+    async def compiled_async(self, away, home):
+        """compiled() without blocking the event loop.
+
+        The compile runs on a thread; concurrent requests for the same
+        cold roster pair await one shared future instead of each compiling.
+        """
+        key = _roster_key(away), _roster_key(home)
+        future = self._compiling.get(key)
+        if future is None:
+            future = asyncio.get_running_loop().run_in_executor(self._compiler, self.rosters.tables, key)
+            self._compiling[key] = future
+
+            def settle(done):
+                del self._compiling[key]
+                if not done.cancelled() and done.exception() is None:
+                    self.stats["compile_hits" if done.result()[1] else "compiled"] += 1
+
+            future.add_done_callback(settle)
+        else:
+            self.stats["compile_hits"] += 1
+        # shield: one cancelled request must not cancel the compile others are awaiting
+        tables, _ = await asyncio.shield(future)
+        return key, tables
+
+    # -------------------------
+    # Queries
+    # -------------------------
+
+    async def query(self, request):
+        """Async generator of result payloads for one request, the last with done=True."""
+        kind = request.get("kind", "win_prob")
+        if kind not in KINDS:
+            raise ValueError(f"kind must be one of {KINDS}, got {kind!r}")
+        n_games = int(request.get("n_games", 20_000))
+        seed = int(request.get("seed", 0))
+        policy = BullpenPolicy(**request.get("policy", {}))
+        roster_key, tables = await self.compiled_async(request["away"], request["home"])
+        key = (roster_key, n_games, seed, policy)
+        self.stats["requests"] += 1
+
+        run = self._results.get(key)
+        if run is not None:
+            self._results.move_to_end(key)
+            self.stats["result_hits"] += 1
+            yield run.payload(kind)
+            return
+        run = self._runs.get(key)
+        if run is None:
+            run = self._runs[key] = _Run(tables.names, n_games, self.max_runs)
+            asyncio.get_running_loop().create_task(self._produce(key, run, policy, seed))
+        else:
+            self.stats["coalesced"] += 1
+
+        queue = asyncio.Queue()
+        run.listeners.append(queue)
+        try:
+            if run.games:
+                yield run.payload(kind)
+            while True:
+                done = await queue.get()
+                if done and run.error is not None:
+                    raise run.error
+                if done or queue.empty():  # skip updates already superseded
+                    yield run.payload(kind)
+                if done:
+                    return
+        finally:
+            run.listeners.remove(queue)
+
+    async def _produce(self, key, run, policy, seed):
+        loop = asyncio.get_running_loop()
+        n_chunks = -(-run.n_games // self.chunk_size)
+        streams = np.random.SeedSequence(seed).spawn(n_chunks)
+        pending = deque()
+        try:
+            for k, ss in enumerate(streams):
+                count = min(self.chunk_size, run.n_games - k * self.chunk_size)
+                pending.append(loop.run_in_executor(self.pool, self._chunk,
+                                                    key[0], policy, count, ss))
+                if len(pending) >= 2 * self.workers:
+                    run.add(await pending.popleft())
+            while pending:
+                run.add(await pending.popleft())
+        except Exception as exc:
+            for fut in pending:
+                fut.cancel()
+            run.finish(exc)
+        else:
+            run.finish()
+            self._results[key] = run
+            if len(self._results) > self.result_cache_size:
+                self._results.popitem(last=False)
+        finally:
+            del self._runs[key]
+
+    # -------------------------
+    # Server
+    # -------------------------
+
+    async def handle(self, reader, writer):
+        """Serve one connection; its requests run concurrently, replies interleave by id."""
+        tasks = set()
+
+        async def answer(request):
+            rid = request.get("id")
+            try:
+                async for payload in self.query(request):
+                    writer.write(_line({"id": rid, **payload}))
+                    await writer.drain()
+            except Exception as exc:
+                writer.write(_line({"id": rid, "error": f"{type(exc).__name__}: {exc}"}))
+                await writer.drain()
+
+        try:
+            while line := await reader.readline():
+                try:
+                    request = json.loads(line)
+                except json.JSONDecodeError as exc:
+                    writer.write(_line({"id": None, "error": f"bad JSON: {exc}"}))
+                    continue
+                task = asyncio.create_task(answer(request))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        except (ConnectionError, asyncio.CancelledError):
+            pass  # client went away, or the server is shutting down
+        finally:
+            writer.close()
+
+    async def serve(self, host="127.0.0.1", port=8765, path=None):
+        """Listen on a Unix socket at `path`, or on TCP host:port, until cancelled."""
+        if path is not None:
+            server = await asyncio.start_unix_server(self.handle, path=path)
+        else:
+            server = await asyncio.start_server(self.handle, host, port)
+        async with server:
+            await server.serve_forever()
+
+    def close(self):
+        self.pool.shutdown(cancel_futures=True)
+        self._compiler.shutdown(cancel_futures=True)
+
+
+def _roster_key(spec):
+    return (spec["name"], tuple(spec["lineup"]), tuple(spec["bullpen"]),
+            tuple(spec.get("reserves", ())))
+
+
+def _line(obj):
+    return (json.dumps(obj) + "\n").encode()
+
+
+async def request(message, host="127.0.0.1", port=8765, path=None):
+    """Client: send one request and yield each reply until the final one (or an error)."""
+    if path is not None:
+        reader, writer = await asyncio.open_unix_connection(path)
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+    try:
+        writer.write(_line(message))
+        await writer.drain()
+        while line := await reader.readline():
+            reply = json.loads(line)
+            yield reply
+            if reply.get("done") or "error" in reply:
+                return
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m sim.service", description=__doc__.splitlines()[0])
+    parser.add_argument("--hitters", required=True)
+    parser.add_argument("--pitchers", required=True)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", default=None, help="serve on this Unix socket instead of TCP")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--cache-size", type=int, default=32)
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    args = parser.parse_args(argv)
+
+    service = SimService(args.hitters, args.pitchers, workers=args.workers,
+                         cache_size=args.cache_size, chunk_size=args.chunk_size)
+    where = args.unix or f"{args.host}:{args.port}"
+    print(f"🛰️ serving on {where} ({len(service.hitters)} hitters, {len(service.pitchers)} pitchers)")
+    try:
+        asyncio.run(service.serve(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
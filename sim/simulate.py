@@ -1,33 +1,213 @@
 import pandas as pd
-import copy
+import numpy as np
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from .batch import BatchTables, simulate_games_batch
+from .boxscore import BoxscoreCollector
 from .game import simulate_game
+from .matchup import compile_game
+from .policy import DEFAULT_POLICY
+from .rng import BlockRNG
+from .store import ResultStore
+from .summary import RunningSummary
 from .team import Team
 
-def run_simulations(n_sims, team1, team2, hitter_probs, pitcher_probs, verbose=False):
-    """Run n_sims games and return results as a DataFrame."""
+# -------------------------
+# Chunk workers
+# -------------------------
+
+_WORKER_CTX = None
+
+
+def _init_worker(ctx):
+    """Process-pool initializer: receive the compiled inputs once per worker."""
+    global _WORKER_CTX
+    _WORKER_CTX = ctx
+
+
+def _run_chunk(ctx, start, count, seed_seq, output="score", verbose=False):
+    """Simulate games start..start+count on the chunk's own seeded stream."""
+    team1, team2, hitter_probs, pitcher_probs, matchups, policy, backend = ctx
+    rng = BlockRNG(np.random.default_rng(seed_seq))
+    if verbose:
+        backend = "python"  # play-by-play only exists on the reference loop; same games either way
+
+    if backend == "kernel":
+        # The whole chunk in one kernel call: the same games simulate_game would play
+        from .kernel import kernel_tables, play_games
+
+        score, counters = play_games(team1, team2, kernel_tables(team1, team2, matchups), rng,
+                                     policy, count)
+        if output == "counters":
+            box = BoxscoreCollector(count, team1, team2, start=start)
+            box.add_games(score, counters)
+            return box
+        return [{"game_id": f"Game_{start + i + 1}", team1.name: int(a), team2.name: int(h)}
+                for i, (a, h) in enumerate(score.tolist())]
+
+    if output == "counters":
+        box = BoxscoreCollector(count, team1, team2, start=start)
+        for _ in range(count):
+            box.add(*simulate_game(team1, team2, hitter_probs, pitcher_probs, verbose=verbose,
+                                   matchups=matchups, output="counters", rng=rng, policy=policy,
+                                   backend=backend))
+        return box
+
     results = []
+    for i in range(start, start + count):
+        # Teams are read-only roster definitions; per-game state is rebuilt inside
+        score = simulate_game(team1, team2, hitter_probs, pitcher_probs, verbose=verbose,
+                              matchups=matchups, output="score", rng=rng, policy=policy,
+                              backend=backend)
+        results.append({"game_id": f"Game_{i + 1}", **score})
+    return results
+
+
+def _worker_chunk(args):
+    runner, chunk = args
+    return runner(_WORKER_CTX, *chunk)
+
+
+def _chunk_plan(seed, chunk_size, n_sims=None, output="score"):
+    """Chunk arguments (start, count, stream, output), generated lazily.
+
+    Chunk k always gets the k-th child of SeedSequence(seed), so any run
+    with the same seed and chunk_size sees the same games.
+    """
+    root = np.random.SeedSequence(seed)
+    start = 0
+    while n_sims is None or start < n_sims:
+        count = chunk_size if n_sims is None else min(chunk_size, n_sims - start)
+        yield start, count, root.spawn(1)[0], output
+        start += count
+
+
+def _iter_chunks(ctx, chunks, workers, verbose=False, runner=_run_chunk):
+    """Yield finished chunks in game order, serially or on a process pool.
+
+    `runner(ctx, *chunk)` does the work (a module-level function, so it
+    pickles). The pool keeps at most 2 * workers chunks in flight, so a
+    consumer that stops early (or an endless chunk plan) never queues
+    unbounded work.
+    """
+    if workers is None or workers <= 1:
+        for chunk in chunks:
+            yield runner(ctx, *chunk, verbose=verbose)
+        return
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(ctx,))
+    try:
+        pending = deque()
+        chunks = iter(chunks)
+        for chunk in chunks:
+            pending.append(pool.submit(_worker_chunk, (runner, chunk)))
+            if len(pending) >= 2 * workers:
+                break
+        while pending:
+            part = pending.popleft().result()
+            for chunk in chunks:
+                pending.append(pool.submit(_worker_chunk, (runner, chunk)))
+                break
+            yield part
+    finally:
+        pool.shutdown(cancel_futures=True)
 
-    for i in range(n_sims):
-        # Make deep copies so lineups, bullpen, and stats reset
-        t1 = copy.deepcopy(team1)
-        t2 = copy.deepcopy(team2)
-
-        # Reset the bullpen index and lineup
-        t1.lineup_idx = 0
-        t2.lineup_idx = 0
-        t1.runs = 0
-        t2.runs = 0
-
-        # Explicitly reset bullpen stamina (if added later)
-        for p in t1.bullpen:
-            p.batters_faced = 0
-        for p in t2.bullpen:
-            p.batters_faced = 0
-
-        # Run a fresh game
-        score = simulate_game(t1, t2, hitter_probs, pitcher_probs, verbose=verbose)
-        results.append(score)
-
-    df = pd.DataFrame(results)
-    df["winner"] = df.apply(lambda x: team1.name if x[team1.name] > x[team2.name] else team2.name, axis=1)
+
+def run_simulations(n_sims, team1, team2, hitter_probs, pitcher_probs, verbose=False,
+                    workers=None, seed=None, chunk_size=250, output="score", store=None,
+                    policy=DEFAULT_POLICY, backend="python"):
+    """Run n_sims games and return results as a DataFrame.
+
+    Games are split into fixed chunks of `chunk_size`, each with its own
+    stream spawned from one `numpy.random.SeedSequence(seed)`, so a given
+    seed gives identical results for any `workers` count. With
+    `workers > 1` chunks run on a process pool that receives the compiled
+    inputs once per worker; results are merged back in game order.
+
+    With output="counters" every game's per-slot counters go into
+    preallocated arrays and the return value is a dict of DataFrames
+    ("results", "hitting", "pitching", "innings") built once at the end.
+
+    With `store` (a path or ResultStore), counters are appended to the
+    on-disk columnar store chunk by chunk as games finish, nothing is
+    kept in memory, and the ResultStore is returned.
+
+    `policy` (a sim.policy.BullpenPolicy) sets the pitcher hook thresholds.
+    `backend="kernel"` plays the same games on sim.kernel, a whole chunk
+    per call (about 30x faster with numba; see sim.kernel.HAVE_NUMBA).
+    Verbose runs play on the python backend whatever `backend` says.
+    """
+    if output not in ("score", "counters"):
+        raise ValueError(f"output must be 'score' or 'counters', got {output!r}")
+    if store is not None:
+        output = "counters"
+        if not isinstance(store, ResultStore):
+            store = ResultStore(store)
+    matchups = compile_game(team1, team2, hitter_probs, pitcher_probs)
+    ctx = (team1, team2, hitter_probs, pitcher_probs, matchups, policy, backend)
+
+    parts = []
+    for part in _iter_chunks(ctx, _chunk_plan(seed, chunk_size, n_sims, output), workers, verbose):
+        if store is not None:
+            store.append_collector(part)
+        else:
+            parts.append(part)
+
+    if store is not None:
+        return store
+
+    if output == "counters":
+        return BoxscoreCollector.concat(parts).to_frames()
+
+    results = [row for part in parts for row in part]
+
+    df = pd.DataFrame(results, columns=["game_id", team1.name, team2.name])
+    df["winner"] = np.where(df[team1.name] > df[team2.name], team1.name, team2.name)
     return df
+
+
+def iter_simulations(team1, team2, hitter_probs, pitcher_probs, max_sims=None, chunk_size=250,
+                     seed=None, workers=None, engine="scalar", target_half_width=None,
+                     min_sims=1000, z=1.96, policy=DEFAULT_POLICY, backend="python"):
+    """Simulate chunk by chunk, yielding a RunningSummary after each chunk.
+
+    Memory stays constant however many games run: only online aggregates
+    (win probability + Wilson CI, run histograms, per-slot mean lines) are
+    kept. The stream ends at `max_sims`, or once at least `min_sims` games
+    have run and the win-probability CI half-width is <= `target_half_width`.
+    With neither set it runs until the consumer stops iterating.
+
+    engine="scalar" runs simulate_game (optionally on `workers` processes)
+    and tracks player lines; engine="batch" runs each chunk through
+    simulate_games_batch in-process and tracks scores only. `policy` sets
+    the pitcher hook thresholds for either engine; `backend` picks
+    simulate_game's backend for the scalar engine.
+    """
+    if engine not in ("scalar", "batch"):
+        raise ValueError(f"engine must be 'scalar' or 'batch', got {engine!r}")
+    summary = RunningSummary(team1, team2, z=z)
+    plan = _chunk_plan(seed, chunk_size, max_sims, "counters")
+
+    if engine == "batch":
+        tables = BatchTables(team1, team2, hitter_probs, pitcher_probs)
+        chunks = (
+            simulate_games_batch(count, team1, team2, hitter_probs, pitcher_probs,
+                                 rng=np.random.default_rng(ss), tables=tables, policy=policy)
+            for _, count, ss, _ in plan
+        )
+    else:
+        matchups = compile_game(team1, team2, hitter_probs, pitcher_probs)
+        ctx = (team1, team2, hitter_probs, pitcher_probs, matchups, policy, backend)
+        chunks = _iter_chunks(ctx, plan, workers)
+
+    try:
+        for part in chunks:
+            if engine == "batch":
+                summary.add_scores(part[team1.name], part[team2.name])
+            else:
+                summary.add_collector(part)
+            yield summary
+            if (target_half_width is not None and summary.n >= min_sims
+                    and summary.half_width <= target_half_width):
+                return
+    finally:
+        chunks.close()
@@ -0,0 +1,65 @@
+from collections import namedtuple
+
+# A mid-game state to resume from. Per-team pairs are (away, home).
+#   half          0 = top (away bats), 1 = bottom
+#   bases         occupancy bitmask (1B = 1, 2B = 2, 3B = 4), or a (1B, 2B, 3B)
+#                 tuple of runners' lineup slots with None for empty bases
+#   batter        each team's next lineup slot to bat
+#   pitcher       each team's Team.staff slot on the mound
+#   bf, runs_allowed
+#                 batters faced / runs allowed by those pitchers so far
+#   cap           reliever BF caps (None = draw one as on entry; ignored for starters)
+#   available     staff bitmask of arms still available (None = everyone except
+#                 the starter and the pitcher on the mound)
+#   emergency     whether each bullpen is already exhausted
+GameSituation = namedtuple(
+    "GameSituation",
+    "inning half outs bases score batter pitcher bf runs_allowed cap available emergency",
+    defaults=(1, 0, 0, 0, (0, 0), (0, 0), (0, 0), (0, 0), (0, 0), (None, None), (None, None),
+              (False, False)),
+)
+
+
+def validate(situation, away, home):
+    """Raise ValueError if `situation` does not fit the two teams."""
+    s = situation
+    if s.inning < 1 or s.half not in (0, 1) or not 0 <= s.outs <= 2:
+        raise ValueError(f"invalid inning/half/outs: {s.inning}, {s.half}, {s.outs}")
+    if not isinstance(s.bases, tuple) and not 0 <= s.bases <= 7:
+        raise ValueError(f"bases must be a 0-7 bitmask or a (1B, 2B, 3B) tuple, got {s.bases!r}")
+    for t, team in enumerate((away, home)):
+        if not 0 <= s.batter[t] < len(team.lineup):
+            raise ValueError(f"{team.name} batter slot {s.batter[t]} is not in the lineup")
+        if not 0 <= s.pitcher[t] < len(team.staff):
+            raise ValueError(f"{team.name} pitcher slot {s.pitcher[t]} is not on the staff")
+
+
+def base_mask(bases):
+    """Occupancy bitmask of a situation's `bases`."""
+    if isinstance(bases, tuple):
+        return sum(1 << i for i, b in enumerate(bases) if b is not None)
+    return bases
+
+
+def runner_slots(bases, batter, n_lineup):
+    """[1B, 2B, 3B] runner lineup slots (None = empty).
+
+    A bitmask is filled with the hitters just before `batter`: the most
+    recent one on the lowest occupied base.
+    """
+    if isinstance(bases, tuple):
+        return list(bases)
+    runners, back = [None, None, None], 1
+    for i in range(3):
+        if bases >> i & 1:
+            runners[i] = (batter - back) % n_lineup
+            back += 1
+    return runners
+
+
+def available_mask(situation, t, n_staff):
+    """Staff bitmask still available to team t (0 = away), never including the pitcher on the mound."""
+    mask = situation.available[t]
+    if mask is None:
+        mask = ((1 << n_staff) - 1) & ~1
+    return mask & ~(1 << situation.pitcher[t])
@@ -0,0 +1,169 @@
+import json
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+TABLES = ("games", "batting", "pitching", "innings")
+
+
+class ResultStore:
+    """Append-only columnar store for simulated games, on disk.
+
+    Layout: <path>/<table>/<chunk>/<column>.npy plus a meta.json written
+    last, so a chunk is only visible once it is complete. Chunks added by
+    append_collector also carry the name of their `games` chunk and stay
+    hidden until that one is written, so a crash mid-append never leaves
+    batting or pitching rows without their games. Columns are read back
+    memory-mapped, one chunk at a time, and only the columns a query
+    mentions are loaded.
+
+    Tables (all keyed by an integer `game`):
+      games     away, home, away_runs, home_runs, innings, {away,home}_hits,
+                {away,home}_errors (committed by that defense)
+      batting   team, player, slot, PA, AB, H, 2B, 3B, HR, BB, RBI, R
+      pitching  team, pitcher, slot, G, BF, OUTS, R, ER, K, BB, HR, IP
+      innings   team, inning, runs
+    """
+
+    def __init__(self, path):
+        self.path = path
+        for table in TABLES:
+            os.makedirs(os.path.join(path, table), exist_ok=True)
+
+    # -------------
+    # Writing
+    # -------------
+    def _chunks(self, table):
+        root = os.path.join(self.path, table)
+        chunks = sorted(
+            os.path.join(root, d) for d in os.listdir(root)
+            if os.path.exists(os.path.join(root, d, "meta.json"))
+        )
+        if table == "games":
+            return chunks
+        # Chunks from append_collector wait for their games chunk
+        committed = {os.path.basename(c) for c in self._chunks("games")}
+        visible = []
+        for c in chunks:
+            batch = self._meta(c).get("batch")
+            if batch is None or batch in committed:
+                visible.append(c)
+        return visible
+
+    @property
+    def n_games(self):
+        return sum(self._meta(c)["rows"] for c in self._chunks("games"))
+
+    def append(self, table, columns):
+        """Write one chunk of equal-length column arrays to `table`."""
+        self._commit(*self._write(table, columns))
+
+    def _write(self, table, columns):
+        """Save a chunk's column files; returns (chunk dir, meta), not yet visible."""
+        if table not in TABLES:
+            raise ValueError(f"unknown table {table!r}; expected one of {TABLES}")
+        root = os.path.join(self.path, table)
+        chunk = os.path.join(root, f"{len(os.listdir(root)):06d}")
+        os.makedirs(chunk)
+        rows = None
+        for name, values in columns.items():
+            values = np.asarray(values)
+            if values.dtype == object:
+                values = values.astype(str)
+            rows = len(values) if rows is None else rows
+            if len(values) != rows:
+                raise ValueError(f"column {name!r} has {len(values)} rows, expected {rows}")
+            np.save(os.path.join(chunk, f"{_file_name(name)}.npy"), values)
+        return chunk, {"rows": rows or 0, "columns": list(columns)}
+
+    @staticmethod
+    def _commit(chunk, meta):
+        """Make a written chunk visible (meta.json is replaced in one step)."""
+        tmp = os.path.join(chunk, "meta.json.tmp")
+        with open(tmp, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp, os.path.join(chunk, "meta.json"))
+
+    def append_collector(self, box):
+        """Append every table from a BoxscoreCollector, numbering games after those stored.
+
+        All column files are written first; the other tables' chunks are
+        tagged with the new games chunk and the games meta.json goes last,
+        so the whole collector becomes visible at once.
+        """
+        offset = self.n_games - box.start
+        written = {}
+        for table, cols in box.tables().items():
+            cols = dict(cols)
+            cols["game"] = cols["game"] + offset
+            if table == "pitching":
+                cols["IP"] = cols["OUTS"] / 3.0
+            written[table] = self._write(table, cols)
+        batch = os.path.basename(written["games"][0])
+        for table, (chunk, meta) in written.items():
+            if table != "games":
+                self._commit(chunk, dict(meta, batch=batch))
+        self._commit(*written["games"])
+
+    # -------------
+    # Reading
+    # -------------
+    @staticmethod
+    def _meta(chunk):
+        with open(os.path.join(chunk, "meta.json")) as f:
+            return json.load(f)
+
+    def columns(self, table):
+        chunks = self._chunks(table)
+        return self._meta(chunks[0])["columns"] if chunks else []
+
+    def scan(self, table, columns=None):
+        """Yield one DataFrame per chunk, loading only `columns` (memory-mapped)."""
+        for chunk in self._chunks(table):
+            names = self._meta(chunk)["columns"]
+            names = [c for c in names if columns is None or c in columns]
+            yield pd.DataFrame({
+                c: np.load(os.path.join(chunk, f"{_file_name(c)}.npy"), mmap_mode="r") for c in names
+            })
+
+    def _needed(self, table, expr, columns):
+        if columns is None:
+            return None
+        used = [c for c in self.columns(table) if re.search(rf"(?<!\w){re.escape(c)}(?!\w)", expr)]
+        return list(dict.fromkeys(list(columns) + used))
+
+    def query(self, table, expr=None, columns=None, params=None):
+        """Rows of `table` matching a pandas query string, e.g. "HR >= 3".
+
+        `params` supplies @-variables for the expression
+        (e.g. expr="game in @games", params={"games": ids}).
+        """
+        parts = []
+        for df in self.scan(table, self._needed(table, expr or "", columns)):
+            if expr is not None:
+                df = df.query(expr, local_dict=params or {})
+            parts.append(df if columns is None else df[list(columns)])
+        return pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=columns)
+
+    def top_n(self, table, key, n=10, columns=None, params=None):
+        """Top-n rows by an expression such as "away_runs + home_runs", scanning lazily."""
+        best = None
+        for df in self.scan(table, self._needed(table, key, columns)):
+            top = df.assign(_key=df.eval(key, local_dict=params or {})).nlargest(n, "_key")
+            best = top if best is None else pd.concat([best, top]).nlargest(n, "_key")
+        if best is None:
+            return pd.DataFrame(columns=columns)
+        best = best.rename(columns={"_key": key}).reset_index(drop=True)
+        return best if columns is None else best[list(columns) + [key]]
+
+    def to_csv(self, table, path):
+        """Stream a table to CSV one chunk at a time."""
+        for i, df in enumerate(self.scan(table)):
+            df.to_csv(path, mode="w" if i == 0 else "a", header=(i == 0), index=False)
+
+
+def _file_name(column):
+    """Column names like '2B' are fine on disk, but keep them path-safe."""
+    return re.sub(r"[^\w.-]", "_", column)
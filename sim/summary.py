@@ -0,0 +1,108 @@
+from collections import Counter
+import math
+
+import numpy as np
+import pandas as pd
+
+from .game import HIT_STATS, PIT_STATS
+
+
+class RunningSummary:
+    """Constant-memory aggregates over a stream of games of one matchup.
+
+    Tracks the away team's win probability (Wilson interval), run
+    differential and total-runs histograms, and per-slot mean batting and
+    pitching lines when counters are available.
+    """
+
+    def __init__(self, team1, team2, z=1.96):
+        self.names = (team1.name, team2.name)
+        self.lineups = tuple(tuple(p.name for p in t.lineup) for t in (team1, team2))
+        self.staffs = tuple(tuple(p.name for p in t.staff) for t in (team1, team2))
+        self.z = z
+        self.n = 0
+        self.wins = 0  # away wins
+        self.run_diff = Counter()    # away - home
+        self.total_runs = Counter()
+        self.n_lines = 0
+        self.hitting = None
+        self.pitching = None
+
+    # -------------
+    # Updates
+    # -------------
+    def add_scores(self, away, home):
+        away, home = np.asarray(away), np.asarray(home)
+        self.n += len(away)
+        self.wins += int((away > home).sum())
+        self.run_diff.update((away - home).tolist())
+        self.total_runs.update((away + home).tolist())
+
+    def add_collector(self, box):
+        """Fold in a BoxscoreCollector chunk (scores plus per-slot counters)."""
+        n = box.count
+        self.add_scores(box.score[:n, 0], box.score[:n, 1])
+        hitting = box.hitting[:n].sum(axis=0, dtype=np.int64)
+        pitching = box.pitching[:n].sum(axis=0, dtype=np.int64)
+        if self.hitting is None:
+            self.hitting, self.pitching = hitting, pitching
+        else:
+            self.hitting += hitting
+            self.pitching += pitching
+        self.n_lines += n
+
+    # -------------
+    # Estimates
+    # -------------
+    @property
+    def win_prob(self):
+        return self.wins / self.n if self.n else float("nan")
+
+    def win_prob_ci(self):
+        """Wilson score interval for the away team's win probability."""
+        if not self.n:
+            return float("nan"), float("nan")
+        p, n, z = self.win_prob, self.n, self.z
+        center = (p + z * z / (2 * n)) / (1 + z * z / n)
+        half = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / (1 + z * z / n)
+        return center - half, center + half
+
+    @property
+    def half_width(self):
+        lo, hi = self.win_prob_ci()
+        return (hi - lo) / 2
+
+    def histograms(self):
+        """Run-differential and total-runs frequency tables."""
+        def table(counts, label):
+            keys = sorted(counts)
+            return pd.DataFrame({label: keys, "games": [counts[k] for k in keys]})
+        return table(self.run_diff, "run_diff"), table(self.total_runs, "total_runs")
+
+    def _means(self, counts, names, label, stats):
+        rows = []
+        for t, team in enumerate(self.names):
+            for s, name in enumerate(names[t]):
+                rows.append({"Team": team, label: name, **dict(zip(stats, counts[t, s] / self.n_lines))})
+        return pd.DataFrame(rows)
+
+    def hitting_means(self):
+        """Mean batting line per game for every lineup slot."""
+        if self.hitting is None:
+            return pd.DataFrame()
+        return self._means(self.hitting, self.lineups, "Player", HIT_STATS)
+
+    def pitching_means(self):
+        """Mean pitching line per game for every staff slot (IP from outs)."""
+        if self.pitching is None:
+            return pd.DataFrame()
+        df = self._means(self.pitching, self.staffs, "Pitcher", PIT_STATS)
+        df.insert(2, "IP", df["OUTS"] / 3.0)
+        return df
+
+    def __repr__(self):
+        lo, hi = self.win_prob_ci()
+        return (
+            f"RunningSummary({self.names[0]} @ {self.names[1]}, n={self.n}, "
+            f"{self.names[0]} win={self.win_prob:.3f} [{lo:.3f}, {hi:.3f}])"
+        )
@@ -0,0 +1,130 @@
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+
+from .batch import BatchState, BatchTables, run_batch
+from .game import simulate_game
+from .instrument import Instrumentation
+from .load_data import CACHE_DIR
+from .matchup import compile_game
+from .policy import BullpenPolicy, policy_hash
+from .rng import BlockRNG
+from .simulate import _iter_chunks
+
+ENGINES = ("batch", "scalar")
+# Per-chunk sums stored in the cache, one row per chunk
+CHUNK_STATS = ("games", "away_wins", "away_runs", "home_runs", "extra_inning_games")
+
+
+def roster_hash(tables):
+    """Short hash of a compiled matchup (BatchTables): names, PA tables, reliever ranking and staff masks."""
+    h = hashlib.sha1("|".join(tables.names).encode())
+    for arr in (tables.cdf, tables.next3, tables.lineup_len, tables.bullpen_mask, tables.reserve_mask):
+        h.update(np.ascontiguousarray(arr).tobytes())
+    return h.hexdigest()[:16]
+
+
+def _run_policy_chunk(ctx, policy, engine, count, seed_seq, verbose=False):
+    """Play one chunk under `policy`; returns its CHUNK_STATS sums."""
+    team1, team2, hitter_probs, pitcher_probs, matchups, tables = ctx
+    if engine == "batch":
+        state = run_batch(BatchState(count, tables), tables, np.random.default_rng(seed_seq),
+                          policy=policy)
+        away, home = state.score[:, 0], state.score[:, 1]
+        extra = int((state.inning > 9).sum())
+    else:
+        rng = BlockRNG(np.random.default_rng(seed_seq))
+        inst = Instrumentation(timers=False)
+        scores = [
+            simulate_game(team1, team2, hitter_probs, pitcher_probs, verbose=verbose,
+                          matchups=matchups, output="score", rng=rng, instrument=inst, policy=policy)
+            for _ in range(count)
+        ]
+        away = np.array([s[team1.name] for s in scores])
+        home = np.array([s[team2.name] for s in scores])
+        extra = inst.counts["extra_inning_games"]
+    return np.array([count, (away > home).sum(), away.sum(), home.sum(), extra], dtype=np.int64)
+
+
+def _cache_file(cache_dir, roster, policy, engine, seed, chunk_size):
+    return os.path.join(cache_dir, roster, f"{policy_hash(policy)}.{engine}.s{seed}.c{chunk_size}.npz")
+
+
+def _load_chunks(path):
+    if not os.path.exists(path):
+        return np.zeros((0, len(CHUNK_STATS)), dtype=np.int64)
+    with np.load(path, allow_pickle=False) as f:
+        return f["chunks"]
+
+
+def _save_chunks(path, chunks, policy):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp.npz"
+    np.savez(tmp, chunks=chunks, fields=np.array(policy._fields),
+             values=np.array([repr(v) for v in policy]))
+    os.replace(tmp, path)
+
+
+def sweep_policies(policies, team1, team2, hitter_probs, pitcher_probs, n_games=10_000, seed=0,
+                   engine="batch", chunk_size=1000, workers=None, cache_dir=None, verbose=False):
+    """Evaluate each BullpenPolicy in `policies` over n_games games of team1 (away) at team2.
+
+    Every policy plays chunk k on the k-th child of SeedSequence(seed), so
+    policies are compared on common random numbers. n_games is rounded up
+    to whole chunks. Rosters are compiled once and shared by every
+    (policy, chunk) work unit, which run on `workers` processes.
+
+    Per-chunk sums are cached on disk under `cache_dir` (default
+    .sim_cache/sweeps), keyed by roster hash, policy hash, engine, seed and
+    chunk size: rerunning with more policies or more games only plays
+    what is missing.
+
+    Returns one row per policy: its hash, the fields that vary across the
+    grid, games, team1 win probability (with standard error), mean runs
+    per team and the share of extra-inning games.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"engine must be one of {ENGINES}, got {engine!r}")
+    policies = [p if isinstance(p, BullpenPolicy) else BullpenPolicy(**p) for p in policies]
+    cache_dir = cache_dir or os.path.join(CACHE_DIR, "sweeps")
+    matchups = compile_game(team1, team2, hitter_probs, pitcher_probs)
+    tables = BatchTables(team1, team2, hitter_probs, pitcher_probs, matchups=matchups)
+    roster = roster_hash(tables)
+    n_chunks = -(-n_games // chunk_size)
+    streams = np.random.SeedSequence(seed).spawn(n_chunks)
+
+    paths = [_cache_file(cache_dir, roster, p, engine, seed, chunk_size) for p in policies]
+    done = [_load_chunks(path) for path in paths]
+    work = [
+        (i, k) for i, chunks in enumerate(done) if paths.index(paths[i]) == i
+        for k in range(len(chunks), n_chunks)
+    ]
+    if verbose:
+        cached = sum(min(len(c), n_chunks) for c in done)
+        print(f"🗂️ {len(policies)} policies x {n_chunks} chunks: {cached} cached, {len(work)} to run")
+
+    # Chunks finish in order, so saving after each one keeps every cache file a
+    # prefix of its policy's chunks: an interrupted sweep loses at most the
+    # chunks still in flight
+    ctx = (team1, team2, hitter_probs, pitcher_probs, matchups, tables)
+    plan = ((policies[i], engine, chunk_size, streams[k]) for i, k in work)
+    for (i, k), sums in zip(work, _iter_chunks(ctx, plan, workers, runner=_run_policy_chunk)):
+        done[i] = np.concatenate([done[i], sums[None]])
+        _save_chunks(paths[i], done[i], policies[i])
+    totals = np.array([done[paths.index(path)][:n_chunks].sum(axis=0) for path in paths])
+
+    varying = [f for f in BullpenPolicy._fields if len({getattr(p, f) for p in policies}) > 1]
+    games = totals[:, 0]
+    win = totals[:, 1] / games
+    df = pd.DataFrame({"policy": [policy_hash(p) for p in policies]})
+    for f in varying:
+        df[f] = [getattr(p, f) for p in policies]
+    df["games"] = games
+    df["win_prob"] = win
+    df["win_prob_se"] = np.sqrt(win * (1 - win) / games)
+    df[f"{team1.name}_runs"] = totals[:, 2] / games
+    df[f"{team2.name}_runs"] = totals[:, 3] / games
+    df["extra_innings"] = totals[:, 4] / games
+    return df
@@ -1,37 +1,107 @@
 class Team:
-    def __init__(self, name, lineup, bullpen):
+    """Roster definition: lineup, bullpen and reserves.
+
+    simulate_game never mutates a Team; everything that changes during a
+    game lives in a GameState, so one Team can back any number of games.
+    """
+
+    __slots__ = ("name", "lineup", "bullpen", "starter", "_reserves", "_staff")
+
+    def __init__(self, name, lineup, bullpen, reserves=()):
         self.name = name
-        self.lineup = lineup
-        self.bullpen = bullpen
-        self.lineup_index = 0
+        self.lineup = tuple(lineup)
+        self.bullpen = tuple(bullpen)
 
         # starter = first pitcher in bullpen list
-        self.starter = bullpen[0] if bullpen else None
-        self._pitcher = self.starter  # active pitcher slot
+        self.starter = self.bullpen[0] if self.bullpen else None
+        self.reserves = reserves
+
+    # -------------
+    # Roster views
+    # -------------
+    @property
+    def reserves(self):
+        return self._reserves
+
+    @reserves.setter
+    def reserves(self, pitchers):
+        self._reserves = tuple(pitchers)
+        self._staff = None
 
-        # empty reserves by default
-        self.reserves = []
+    @property
+    def staff(self):
+        """Pitcher slots: starter, then bullpen (minus the starter), then reserves."""
+        if self._staff is None:
+            staff = [self.starter] if self.starter is not None else []
+            staff += [p for p in self.bullpen if p is not self.starter]
+            staff += [p for p in self._reserves if p not in staff]
+            self._staff = tuple(staff)
+        return self._staff
+
+    @property
+    def n_bullpen(self):
+        """Number of relievers (staff slots 1..n_bullpen)."""
+        return len([p for p in self.bullpen if p is not self.starter])
+
+    def get_pitcher(self):
+        """Return the starting pitcher (in-game changes live on GameState)."""
+        return self.starter
+
+    @property
+    def starting_pitcher(self):
+        """Alias for compatibility."""
+        return self.starter
+
+
+class GameState:
+    """Per-game state for one Team: lineup cursor, available bullpen, active pitcher.
+
+    Pitchers are referenced by slot in `team.staff`; `available` is a
+    bitmask over those slots. A fresh game is just `reset()`.
+    """
+
+    __slots__ = ("team", "staff", "lineup_index", "available", "pitcher_slot", "_bullpen_mask")
+
+    def __init__(self, team):
+        self.team = team
+        self.staff = team.staff
+        self._bullpen_mask = ((1 << team.n_bullpen) - 1) << 1
+        self.reset()
+
+    def reset(self):
+        self.lineup_index = 0
+        self.pitcher_slot = 0
+        self.available = ((1 << len(self.staff)) - 1) & ~1
 
     # -------------
     # Lineup control
     # -------------
     def next_batter(self):
-        batter = self.lineup[self.lineup_index]
-        self.lineup_index = (self.lineup_index + 1) % len(self.lineup)
-        return batter
+        """Return (lineup slot, batter) and advance the cursor."""
+        slot = self.lineup_index
+        self.lineup_index = (slot + 1) % len(self.team.lineup)
+        return slot, self.team.lineup[slot]
 
     # -------------
     # Pitcher control
     # -------------
-    def get_pitcher(self):
-        """Return the active pitcher (starter or current reliever)."""
-        return getattr(self, "_pitcher", self.starter)
+    @property
+    def pitcher(self):
+        return self.staff[self.pitcher_slot]
 
-    def set_pitcher(self, pitcher):
-        """Set a new active pitcher on the mound."""
-        self._pitcher = pitcher
+    def set_pitcher(self, slot):
+        """Put staff slot `slot` on the mound and mark it used."""
+        self.pitcher_slot = slot
+        self.available &= ~(1 << slot)
 
-    @property
-    def starting_pitcher(self):
-        """Alias for compatibility."""
-        return self.starter
+    def rest(self, mask):
+        """Take the staff slots in bitmask `mask` out of this game (e.g. tired relievers)."""
+        self.available &= ~mask
+
+    def bullpen_available(self):
+        """Bitmask of available relievers."""
+        return self.available & self._bullpen_mask
+
+    def reserves_available(self):
+        """Bitmask of available emergency reserves."""
+        return self.available & ~self._bullpen_mask
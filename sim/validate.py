@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+
+from .game import BACKENDS, simulate_game
+from .matchup import compile_game
+from .policy import DEFAULT_POLICY
+from .rng import BlockRNG
+from .simulate import run_simulations
+
+
+def _summary_columns(df, away, home):
+    """Per-game series compared between engines."""
+    cols = {
+        f"{away} win": (df[away] > df[home]).astype(float),
+        f"{away} runs": df[away].astype(float),
+        f"{home} runs": df[home].astype(float),
+        "total runs": (df[away] + df[home]).astype(float),
+        "run diff": (df[away] - df[home]).astype(float),
+    }
+    if "innings" in df.columns:
+        cols["extra innings"] = (df["innings"] > 9).astype(float)
+    return cols
+
+
+def compare_results(ref, other, away, home):
+    """Two-sample z-scores for summary stats of two result frames.
+
+    Both frames need one score column per team (as returned by
+    run_simulations / simulate_games_batch). Engines that follow the same
+    rules should give |z| well under 4 for every row.
+    """
+    a, b = _summary_columns(ref, away, home), _summary_columns(other, away, home)
+    rows = []
+    for stat in a:
+        if stat not in b:
+            continue
+        x, y = a[stat].to_numpy(), b[stat].to_numpy()
+        se = np.sqrt(x.var(ddof=1) / len(x) + y.var(ddof=1) / len(y))
+        diff = x.mean() - y.mean()
+        rows.append({
+            "stat": stat,
+            "ref": x.mean(),
+            "other": y.mean(),
+            "z": diff / se if se > 0 else 0.0,
+        })
+    return pd.DataFrame(rows)
+
+
+def engines_agree(ref, other, away, home, z_max=4.0):
+    """True if every summary stat differs by less than z_max standard errors."""
+    return bool((compare_results(ref, other, away, home)["z"].abs() < z_max).all())
+
+
+def backend_mismatches(team1, team2, hitter_probs, pitcher_probs, n_games=1000, seed=0,
+                       policy=DEFAULT_POLICY, start=None, unavailable=None, matchups=None):
+    """Fixed-seed check of simulate_game(backend="kernel") against the reference.
+
+    Both backends play `n_games` from their own BlockRNG(seed). They draw
+    the same uniforms in the same order, so every game's score and
+    counters should match; returns the numbers of the games that do not
+    (an empty list when the kernel is exact).
+    """
+    if matchups is None:
+        matchups = compile_game(team1, team2, hitter_probs, pitcher_probs)
+    rngs = {b: BlockRNG(seed) for b in BACKENDS}
+    bad = []
+    for g in range(n_games):
+        ref, kern = (simulate_game(team1, team2, hitter_probs, pitcher_probs, matchups=matchups,
+                                   output="counters", rng=rngs[b], policy=policy, start=start,
+                                   unavailable=unavailable, backend=b) for b in BACKENDS)
+        if ref[0] != kern[0] or any(not np.array_equal(ref[1][k], kern[1][k]) for k in ref[1]):
+            bad.append(g)
+    return bad
+
+
+def compare_backends(team1, team2, hitter_probs, pitcher_probs, n_games=20_000, seed=0,
+                     policy=DEFAULT_POLICY):
+    """Statistical check: compare_results for both backends run on independent seeds."""
+    ref, kern = (run_simulations(n_games, team1, team2, hitter_probs, pitcher_probs,
+                                 seed=seed + i, policy=policy, backend=b)
+                 for i, b in enumerate(BACKENDS))
+    return compare_results(ref, kern, team1.name, team2.name)
@@ -0,0 +1,13 @@
+import pytest
+
+from sim.bench import synthetic_tables, synthetic_teams
+from sim.load_data import load_registry
+
+
+@pytest.fixture(scope="session")
+def matchup(tmp_path_factory):
+    """(away, home, hitter_probs, pitcher_probs) on the synthetic bench rosters."""
+    hitters, pitchers = synthetic_tables(str(tmp_path_factory.mktemp("probs")))
+    hitter_reg, pitcher_reg = load_registry(hitters, "hitter"), load_registry(pitchers, "pitcher")
+    away, home = synthetic_teams(hitter_reg, pitcher_reg)
+    return away, home, hitter_reg.frame(), pitcher_reg.frame()
@@ -0,0 +1,32 @@
+import pandas as pd
+
+from sim.batch import simulate_games_batch
+from sim.game import simulate_game
+from sim.matchup import compile_game
+from sim.rng import BlockRNG
+from sim.validate import compare_results, engines_agree
+
+N_GAMES = 20_000
+
+
+def scalar_results(away, home, hitter_probs, pitcher_probs, n, seed):
+    """simulate_game scores plus innings played, in simulate_games_batch's layout."""
+    matchups = compile_game(away, home, hitter_probs, pitcher_probs)
+    rng = BlockRNG(seed)
+    rows = []
+    for _ in range(n):
+        score, counters = simulate_game(away, home, hitter_probs, pitcher_probs, matchups=matchups,
+                                        output="counters", rng=rng)
+        rows.append((score[away.name], score[home.name], counters["linescore"].shape[1]))
+    return pd.DataFrame(rows, columns=[away.name, home.name, "innings"])
+
+
+def test_batch_matches_scalar_engine(matchup):
+    away, home, hitter_probs, pitcher_probs = matchup
+    ref = scalar_results(away, home, hitter_probs, pitcher_probs, N_GAMES, seed=1)
+    batch = simulate_games_batch(N_GAMES, away, home, hitter_probs, pitcher_probs, rng=2)
+
+    stats = compare_results(ref, batch, away.name, home.name)
+    assert {f"{away.name} win", f"{away.name} runs", f"{home.name} runs",
+            "extra innings"} <= set(stats["stat"])
+    assert engines_agree(ref, batch, away.name, home.name), stats.to_string()
@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from sim.boxscore import BoxscoreCollector
+from sim.events import EventLog, EventWriter
+from sim.game import simulate_game
+from sim.matchup import compile_game
+from sim.policy import BullpenPolicy
+from sim.rng import BlockRNG
+
+N_GAMES = 300
+
+
+@pytest.mark.parametrize("policy", [
+    BullpenPolicy(),
+    # Short leashes: bullpens run dry, so reserves and late entries get logged too
+    BullpenPolicy(reliever_cap_min=1, reliever_cap_max=2, entry_cap_min=1, entry_cap_max=2,
+                  stamina_min=5, stamina_max=8),
+])
+def test_event_log_rebuilds_live_counters(matchup, tmp_path, policy):
+    away, home, hitter_probs, pitcher_probs = matchup
+    matchups = compile_game(away, home, hitter_probs, pitcher_probs)
+    rng = BlockRNG(11)
+    live = BoxscoreCollector(N_GAMES, away, home)
+    path = str(tmp_path / "games.ev")
+    with EventWriter(path, away, home) as writer:
+        for _ in range(N_GAMES):
+            live.add(*simulate_game(away, home, hitter_probs, pitcher_probs, matchups=matchups,
+                                    output="counters", rng=rng, policy=policy, events=writer))
+
+    rebuilt = EventLog(path).collector()
+    assert rebuilt.count == N_GAMES
+    for attr in ("score", "errors", "hitting", "pitching"):
+        assert np.array_equal(getattr(rebuilt, attr), getattr(live, attr)), attr
+    width = rebuilt.linescore.shape[2]
+    assert np.array_equal(rebuilt.linescore, live.linescore[:, :, :width])
+    assert (live.linescore[:, :, width:] == -1).all()
@@ -0,0 +1,52 @@
+from sim.policy import BullpenPolicy
+from sim.simulate import run_simulations
+from sim.situation import GameSituation
+from sim.validate import backend_mismatches, compare_backends
+
+# Short reliever leashes, so bullpens (and reserves) get used up
+TIGHT = BullpenPolicy(reliever_cap_min=1, reliever_cap_max=2, entry_cap_min=1, entry_cap_max=2,
+                      stamina_min=5, stamina_max=8)
+
+
+def test_kernel_replays_fresh_games(matchup):
+    assert backend_mismatches(*matchup, n_games=1000, seed=3) == []
+    away = matchup[0]
+    assert backend_mismatches(*matchup, n_games=500, seed=4, policy=TIGHT,
+                              unavailable={away.name: 0b1110}) == []
+
+
+def test_kernel_replays_resumed_games(matchup):
+    # Bottom 7th, runners on the corners, home reliever without a cap yet
+    start = GameSituation(inning=7, half=1, outs=1, bases=0b101, score=(4, 3),
+                          batter=(0, 5), pitcher=(3, 0), bf=(2, 21), runs_allowed=(0, 3),
+                          cap=(None, None), emergency=(False, False))
+    assert backend_mismatches(*matchup, n_games=500, seed=5, start=start) == []
+    # Extra innings with an emergency arm on the mound
+    start = GameSituation(inning=12, half=0, outs=2, bases=(1, None, 3), score=(3, 3),
+                          batter=(4, 6), pitcher=(2, 3), bf=(5, 2), runs_allowed=(1, 0),
+                          cap=(None, 4), emergency=(True, False))
+    assert backend_mismatches(*matchup, n_games=500, seed=6, policy=TIGHT, start=start) == []
+
+
+def test_kernel_agrees_on_independent_seeds(matchup):
+    stats = compare_backends(*matchup, n_games=10_000, seed=7)
+    assert (stats["z"].abs() < 4).all(), stats.to_string()
+
+
+def test_run_simulations_same_games_on_either_backend(matchup):
+    kwargs = dict(seed=8, chunk_size=300)
+    ref = run_simulations(1000, *matchup, **kwargs)
+    assert ref.equals(run_simulations(1000, *matchup, backend="kernel", **kwargs))
+    assert ref.equals(run_simulations(1000, *matchup, backend="kernel", workers=2, **kwargs))
+
+    ref = run_simulations(1000, *matchup, output="counters", **kwargs)
+    kern = run_simulations(1000, *matchup, output="counters", backend="kernel", **kwargs)
+    assert ref.keys() == kern.keys()
+    for name in ref:
+        assert ref[name].equals(kern[name]), name
+
+
+def test_verbose_kernel_run_falls_back_to_reference_loop(matchup, capsys):
+    verbose = run_simulations(5, *matchup, seed=9, verbose=True, backend="kernel")
+    assert capsys.readouterr().out
+    assert verbose.equals(run_simulations(5, *matchup, seed=9, backend="kernel"))
@@ -0,0 +1,46 @@
+import copy
+
+import pytest
+
+from sim.bench import synthetic_tables
+from sim.league import league_teams, round_robin
+from sim.load_data import load_registry
+from sim.team import Team
+
+# The bench hitters split into two nine-man clubs
+ROSTERS = {"AAA": [f"Hitter {i}" for i in range(9)], "BBB": [f"Hitter {i}" for i in range(9, 18)]}
+
+
+@pytest.fixture(scope="module")
+def registries(tmp_path_factory):
+    """Bench tables: hitters without a team column (like the stub), pitchers split AAA / BBB."""
+    hitters, pitchers = synthetic_tables(str(tmp_path_factory.mktemp("league")))
+    return load_registry(hitters, "hitter"), load_registry(pitchers, "pitcher")
+
+
+def test_league_from_explicit_rosters(registries):
+    hitter_reg, pitcher_reg = registries
+    assert not hitter_reg.has_team
+    with pytest.raises(ValueError, match="rosters="):
+        league_teams(hitter_reg, pitcher_reg)
+
+    clubs = league_teams(hitter_reg, pitcher_reg, rosters=ROSTERS)
+    assert sorted(clubs) == ["AAA", "BBB"]
+    assert {p.name for p in clubs["AAA"].lineup} == set(ROSTERS["AAA"])
+    assert all(p.team == "BBB" for p in clubs["BBB"].staff)
+
+    cells = round_robin(clubs, hitter_reg.frame(), pitcher_reg.frame(), min_games=200,
+                        max_games=200, seed=1)
+    assert len(cells) == 2 and (cells["games"] == 200).all()
+
+
+def test_bad_hand_names_the_player(registries):
+    hitter_reg, pitcher_reg = registries
+    clubs = league_teams(hitter_reg, pitcher_reg, rosters=ROSTERS)
+    lineup = list(clubs["AAA"].lineup)
+    lineup[4] = copy.copy(lineup[4])
+    lineup[4].hand = float("nan")  # blank `bats` cell
+    team = clubs["AAA"]
+    clubs["AAA"] = Team(team.name, lineup, team.bullpen, team.reserves)
+    with pytest.raises(ValueError, match=lineup[4].name):
+        round_robin(clubs, hitter_reg.frame(), pitcher_reg.frame(), min_games=10, max_games=10)
@@ -0,0 +1,52 @@
+import pandas as pd
+
+from sim.lineup import optimize_lineup
+from sim.player import Pitcher, Player
+from sim.team import Team
+
+RATES = ("single", "double", "triple", "hr", "walk", "hbp", "so", "out", "roe")
+
+
+def rates(single, hr, out):
+    return dict(zip(RATES, (single, 0.05, 0.0, hr, 0.05, 0.0, 0.1, out, 0.0)))
+
+
+def constructed_matchup():
+    """Lefty hitters mash right-handed pitching; righties barely reach base."""
+    hitter_probs = pd.DataFrame([
+        {"full_name": "lefty", "bats": "L", "pit_hand": "R", **rates(0.30, 0.20, 0.30)},
+        {"full_name": "righty", "bats": "R", "pit_hand": "R", **rates(0.02, 0.0, 0.78)},
+    ])
+    pitcher_probs = pd.DataFrame([
+        {"full_name": "arm", "bats": b, "pit_hand": "R", "dra_minus": 100, **rates(0.15, 0.03, 0.62)}
+        for b in ("L", "R")
+    ])
+    lineup = [Player(f"Slugger {i}", "L") for i in range(3)] + [Player(f"Weak {i}", "R") for i in range(6)]
+    team = Team("Sluggers", lineup, [Pitcher(f"S{i}", "R") for i in range(4)])
+    opponent = Team("Opponent", [Player(f"Opp {i}", "R") for i in range(9)],
+                    [Pitcher(f"O{i}", "R") for i in range(4)])
+    return team, opponent, hitter_probs, pitcher_probs
+
+
+def test_race_picks_the_clearly_better_order():
+    team, opponent, hitter_probs, pitcher_probs = constructed_matchup()
+    sluggers = [f"Slugger {i}" for i in range(3)]
+    weak = [f"Weak {i}" for i in range(6)]
+    best = sluggers + weak
+    candidates = [
+        weak + sluggers,                  # sluggers last: fewest PAs
+        weak[:3] + sluggers + weak[3:],
+        [sluggers[0]] + weak[:3] + [sluggers[1]] + weak[3:] + [sluggers[2]],
+        best,                             # sluggers first and back to back
+        sluggers[::-1] + weak,            # the same order as far as the model can tell
+    ]
+    kwargs = dict(candidates=candidates, games=64, max_games=1024, n_best=2, seed=0)
+    ranked = optimize_lineup(team, opponent, hitter_probs, pitcher_probs, objective="runs", **kwargs)
+    # Every other order fell clearly behind on runs, so n_best=2 still leaves one survivor
+    assert ranked["order"].tolist() == [tuple(best)]
+    assert ranked["games"][0] == 1024
+    assert ranked["equivalent_orders"][0] == 2
+
+    # Both orders win most games, so wins separate them less sharply, but the pick is the same
+    ranked = optimize_lineup(team, opponent, hitter_probs, pitcher_probs, objective="win", **kwargs)
+    assert ranked["order"][0] == tuple(best)
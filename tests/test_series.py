@@ -0,0 +1,71 @@
+import numpy as np
+
+import sim.series
+from sim.game import P_BF
+from sim.series import GAME_DAYS, NEVER, SeriesPlan, _run_series_chunk
+
+
+def record_games(monkeypatch):
+    """Patch the series' simulate_game to log each game's starters, rested arms and batters faced."""
+    games = []
+    play = sim.series.simulate_game
+
+    def logged(away, home, *args, unavailable=None, **kw):
+        score, counters = play(away, home, *args, unavailable=unavailable, **kw)
+        rested, bf = set(), {}
+        for side, team in enumerate((away, home)):
+            for slot, p in enumerate(team.staff):
+                if unavailable.get(team.name, 0) >> slot & 1:
+                    rested.add(p.name)
+                if counters["pitching"][side, slot, P_BF]:
+                    bf[p.name] = int(counters["pitching"][side, slot, P_BF])
+        games.append({"starters": {away.name: away.starter.name, home.name: home.starter.name},
+                      "rested": rested, "bf": bf})
+        return score, counters
+
+    monkeypatch.setattr(sim.series, "simulate_game", logged)
+    return games
+
+
+def test_rotation_respects_starter_rest(matchup, monkeypatch):
+    away, home, hitter_probs, pitcher_probs = matchup
+    rotations = (away.bullpen[:4], home.bullpen[:4])
+    plan = SeriesPlan(away, home, hitter_probs, pitcher_probs, rotations=rotations, starter_rest=4)
+    for seed in range(5):
+        games = record_games(monkeypatch)
+        _run_series_chunk(plan, 0, 1, np.random.SeedSequence(seed))
+        assert len(games) >= 4
+        for team in (away, home):
+            last = {}
+            for g, game in enumerate(games):
+                arm = game["starters"][team.name]
+                assert GAME_DAYS[g] - last.get(arm, NEVER) > 4, (team.name, g, arm)
+                last[arm] = GAME_DAYS[g]
+        monkeypatch.undo()
+
+    # Three arms cannot all get four days off on this schedule: the longest-rested one goes
+    short = SeriesPlan(away, home, hitter_probs, pitcher_probs,
+                       rotations=(away.bullpen[:3], home.bullpen[:3]), starter_rest=4)
+    assert short.pick_starter(0, 0, np.array([0, 1, 3]), 4) == 0
+    assert short.pick_starter(0, 1, np.array([5, 1, 3]), 6) == 1
+
+
+def test_bullpen_fatigue_carries_between_games(matchup, monkeypatch):
+    away, home, hitter_probs, pitcher_probs = matchup
+    starters = {p.name for p in (away.starter, home.starter)}
+    # heavy_bf=1: anyone who relieved yesterday sits today
+    plan = SeriesPlan(away, home, hitter_probs, pitcher_probs, heavy_bf=1)
+    checked = 0
+    for seed in range(5):
+        games = record_games(monkeypatch)
+        _run_series_chunk(plan, 0, 1, np.random.SeedSequence(seed))
+        monkeypatch.undo()
+        for g in range(1, len(games)):
+            if GAME_DAYS[g] - GAME_DAYS[g - 1] != 1:
+                assert not games[g]["rested"]  # an off day resets everyone
+                continue
+            yesterday = set(games[g - 1]["bf"]) - starters
+            assert games[g]["rested"] == yesterday
+            assert not yesterday & set(games[g]["bf"])
+            checked += len(yesterday)
+    assert checked
@@ -0,0 +1,36 @@
+import asyncio
+
+from sim.bench import synthetic_tables
+from sim.service import SimService
+
+
+def _roster(name, hitters, pitchers):
+    return {"name": name, "lineup": hitters, "bullpen": pitchers[:8], "reserves": pitchers[8:]}
+
+
+def test_concurrent_cold_requests_share_one_compile(tmp_path):
+    hitters, pitchers = synthetic_tables(str(tmp_path))
+    service = SimService(hitters, pitchers, chunk_size=500)
+    request = {
+        "kind": "win_prob", "n_games": 1000, "seed": 3,
+        "away": _roster("Away", [f"Hitter {i}" for i in range(9)], [f"Pitcher {i}" for i in range(12)]),
+        "home": _roster("Home", [f"Hitter {i}" for i in range(9, 18)],
+                        [f"Pitcher {i}" for i in range(12, 24)]),
+    }
+
+    async def final(req):
+        async for payload in service.query(req):
+            last = payload
+        return last
+
+    async def main():
+        return await asyncio.gather(final(request), final(request), final(dict(request, seed=4)))
+
+    try:
+        same, again, other = asyncio.run(main())
+    finally:
+        service.close()
+    assert same == again and same["done"] and same["games"] == 1000
+    assert other["win_prob"] != same["win_prob"]
+    assert service.stats["compiled"] == 1
+    assert service.stats["compile_hits"] == 2
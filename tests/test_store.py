@@ -0,0 +1,72 @@
+import os
+
+import pytest
+from pandas.testing import assert_series_equal
+
+from sim.boxscore import BoxscoreCollector
+from sim.game import simulate_game
+from sim.matchup import compile_game
+from sim.rng import BlockRNG
+from sim.simulate import run_simulations
+from sim.store import ResultStore
+
+
+def collector(away, home, hitter_probs, pitcher_probs, n, seed):
+    matchups = compile_game(away, home, hitter_probs, pitcher_probs)
+    rng = BlockRNG(seed)
+    box = BoxscoreCollector(n, away, home)
+    for _ in range(n):
+        box.add(*simulate_game(away, home, hitter_probs, pitcher_probs, matchups=matchups,
+                               output="counters", rng=rng))
+    return box
+
+
+def assert_joins(store):
+    """Every batting / pitching / innings row joins to a game, and the totals agree."""
+    games = store.query("games")
+    assert games["game"].is_unique
+    assert len(games) == store.n_games
+    for table in ("batting", "pitching", "innings"):
+        rows = store.query(table)
+        assert rows["game"].isin(games["game"]).all(), table
+    hits = store.query("batting").groupby("game")["H"].sum()
+    totals = games.set_index("game")[["away_hits", "home_hits"]].sum(axis=1)
+    assert_series_equal(hits.reindex(totals.index, fill_value=0), totals, check_dtype=False,
+                        check_names=False)
+    runs = store.query("innings").groupby("game")["runs"].sum()
+    assert_series_equal(runs, games.set_index("game")[["away_runs", "home_runs"]].sum(axis=1),
+                        check_dtype=False, check_names=False)
+
+
+def test_reload_and_join_after_append(matchup, tmp_path):
+    path = str(tmp_path / "store")
+    run_simulations(300, *matchup, seed=1, chunk_size=100, store=path)
+    store = ResultStore(path)  # reopened from disk
+    assert store.n_games == 300
+    assert_joins(store)
+
+
+def test_interrupted_append_stays_invisible(matchup, tmp_path, monkeypatch):
+    store = ResultStore(str(tmp_path / "store"))
+    store.append_collector(collector(*matchup, 40, seed=2))
+
+    # Crash just before the games chunk is committed: the other tables are already on disk
+    commit = ResultStore._commit
+
+    def crash(chunk, meta):
+        if os.path.basename(os.path.dirname(chunk)) == "games":
+            raise OSError("disk full")
+        commit(chunk, meta)
+
+    monkeypatch.setattr(ResultStore, "_commit", staticmethod(crash))
+    with pytest.raises(OSError):
+        store.append_collector(collector(*matchup, 30, seed=3))
+    monkeypatch.undo()
+
+    store = ResultStore(store.path)
+    assert store.n_games == 40
+    assert_joins(store)
+
+    store.append_collector(collector(*matchup, 25, seed=4))
+    assert store.n_games == 65
+    assert_joins(store)
@@ -0,0 +1,43 @@
+import pytest
+
+import sim.sweep
+from sim.policy import policy_grid
+from sim.sweep import sweep_policies
+
+POLICIES = policy_grid(stamina_max=[19, 23], reliever_runs=[1, 2])
+
+
+class Interrupted(Exception):
+    pass
+
+
+def test_interrupted_sweep_resumes_from_cache(matchup, tmp_path, monkeypatch):
+    kwargs = dict(n_games=2000, chunk_size=250, seed=5)
+    whole = sweep_policies(POLICIES, *matchup, cache_dir=str(tmp_path / "whole"), **kwargs)
+
+    # Stop after 11 of the 4 x 8 chunks, as a crash or Ctrl-C would
+    run_chunk = sim.sweep._run_policy_chunk
+    calls = []
+
+    def flaky(*args, **kw):
+        if len(calls) == 11:
+            raise Interrupted
+        calls.append(args)
+        return run_chunk(*args, **kw)
+
+    cache_dir = str(tmp_path / "resumed")
+    monkeypatch.setattr(sim.sweep, "_run_policy_chunk", flaky)
+    with pytest.raises(Interrupted):
+        sweep_policies(POLICIES, *matchup, cache_dir=cache_dir, **kwargs)
+
+    # The rerun plays only what the cache is missing and lands on the same numbers
+    calls.clear()
+
+    def counted(*args, **kw):
+        calls.append(args)
+        return run_chunk(*args, **kw)
+
+    monkeypatch.setattr(sim.sweep, "_run_policy_chunk", counted)
+    resumed = sweep_policies(POLICIES, *matchup, cache_dir=cache_dir, **kwargs)
+    assert len(calls) == 4 * 8 - 11
+    assert resumed.equals(whole)